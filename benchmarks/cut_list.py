@@ -0,0 +1,65 @@
+"""
+Cut-list optimizer benchmark.
+
+Packs residential and commercial-size decks with the best-fit heuristic and
+the exact solver, and reports packing time, boards bought and real waste
+next to the flat 10% WASTE_FACTOR.
+
+    python -m benchmarks.cut_list [--repeat N]
+"""
+
+import argparse
+import time
+
+from domain.code_engine import generate_structure
+from domain.models import SiteInput
+from services.cut_list import optimize_cut_list
+
+
+DECK_SIZES = [(12, 10), (16, 12), (24, 9.5), (40, 12), (100, 12), (400, 12), (1000, 12)]
+
+
+def _time_ms(structure, exact: bool, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        cut_list = optimize_cut_list(structure, exact=exact)
+    return (time.perf_counter() - start) / repeat * 1000, cut_list
+
+
+def run(repeat: int = 20) -> list[dict]:
+    rows = []
+    for width, depth in DECK_SIZES:
+        # Lazy members: the optimizer reads the layout, not member objects
+        structure = generate_structure(SiteInput(width_ft=width, depth_ft=depth, height_ft=6), lazy=True)
+        row = {"deck": f"{width}x{depth:g}", "joists": len(structure.joists)}
+        for mode, exact in (("heuristic", False), ("exact", True)):
+            ms, cut_list = _time_ms(structure, exact, repeat)
+            row[mode] = {
+                "ms": ms,
+                "boards": sum(size.board_count for size in cut_list.sizes.values()),
+                "waste_pct": cut_list.waste_lf / cut_list.piece_lf * 100,
+                "optimal": all(size.optimal for size in cut_list.sizes.values()),
+            }
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    header = (f"{'deck':>8} {'joists':>7} {'bfd ms':>8} {'boards':>7} {'waste %':>8} "
+              f"{'exact ms':>9} {'boards':>7} {'waste %':>8}  exact")
+    print(header)
+    print("-" * len(header))
+    for row in run(args.repeat):
+        h, e = row["heuristic"], row["exact"]
+        print(
+            f"{row['deck']:>8} {row['joists']:>7} {h['ms']:>8.2f} {h['boards']:>7} {h['waste_pct']:>8.2f} "
+            f"{e['ms']:>9.2f} {e['boards']:>7} {e['waste_pct']:>8.2f}  {'yes' if e['optimal'] else 'fallback'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
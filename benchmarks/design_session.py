@@ -0,0 +1,64 @@
+"""
+Incremental design session benchmark.
+
+Toggles one field at a time on a DesignSession and reports the update
+latency next to a full generate_structure + calculate_quote rerun.
+
+    python -m benchmarks.design_session [--repeat N]
+"""
+
+import argparse
+import time
+
+from domain.code_engine import generate_structure
+from domain.models import RailingType, SiteInput
+from services.design_session import DesignSession
+from services.pricing import calculate_quote
+
+
+SITE = SiteInput(width_ft=16, depth_ft=12, height_ft=6, railing_type=RailingType.CABLE, railing_lf=40)
+
+# Field -> two values to alternate between
+TOGGLES = [
+    ("railing_lf", 40.0, 44.0),
+    ("railing_type", "cable", "glass"),
+    ("stair_count", 0, 4),
+    ("decking_type", "trex", "cedar"),
+    ("customer_name", "A", "B"),
+    ("depth_ft", 12, 13),
+]
+
+
+def run(repeat: int = 2000) -> list[dict]:
+    rows = []
+    for name, a, b in TOGGLES:
+        session = DesignSession(SITE)
+        start = time.perf_counter()
+        for i in range(repeat):
+            stages = session.update(**{name: b if i % 2 == 0 else a})
+        rows.append({
+            "field": name,
+            "us": (time.perf_counter() - start) / repeat * 1e6,
+            "stages": len(stages),
+        })
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        calculate_quote(generate_structure(SITE))
+    rows.append({"field": "full rerun", "us": (time.perf_counter() - start) / repeat * 1e6, "stages": None})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'field':>14} {'us/update':>10} {'stages':>7}")
+    for row in run(args.repeat):
+        stages = "" if row["stages"] is None else row["stages"]
+        print(f"{row['field']:>14} {row['us']:>10.1f} {stages:>7}")
+
+
+if __name__ == "__main__":
+    main()
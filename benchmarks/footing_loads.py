@@ -0,0 +1,70 @@
+"""
+Per-footing tributary sizing benchmark.
+
+Designs decks with uniform and tributary footing sizing and reports the
+extra engine time, the footing size range and the concrete each quote buys.
+
+    python -m benchmarks.footing_loads [--repeat N]
+"""
+
+import argparse
+import time
+
+from domain.code_engine import generate_structure
+from domain.models import LedgerAttachment, SiteInput
+from services.pricing import _concrete_bags
+
+
+DECKS = [
+    (16, 12, LedgerAttachment.DIRECT),
+    (40, 12, LedgerAttachment.FREESTANDING),
+    (100, 12, LedgerAttachment.DIRECT),
+    (400, 12, LedgerAttachment.FREESTANDING),
+    (4000, 12, LedgerAttachment.DIRECT),
+]
+
+
+def _design_us(site: SiteInput, footing_sizing: str, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        structure = generate_structure(site, lazy=True, footing_sizing=footing_sizing)
+    return (time.perf_counter() - start) / repeat * 1e6, structure
+
+
+def run(repeat: int = 50) -> list[dict]:
+    rows = []
+    generate_structure(SiteInput(width_ft=16, depth_ft=12, height_ft=6), footing_sizing="tributary")  # Import NumPy untimed
+    for width, depth, ledger in DECKS:
+        site = SiteInput(width_ft=width, depth_ft=depth, height_ft=6, ledger_attachment=ledger)
+        uniform_us, uniform = _design_us(site, "uniform", repeat)
+        tributary_us, tributary = _design_us(site, "tributary", repeat)
+        diameters = tributary.layout.footing_diameters_in
+        rows.append({
+            "deck": f"{width}x{depth} {ledger.value}",
+            "posts": len(tributary.footings),
+            "uniform_us": uniform_us,
+            "tributary_us": tributary_us,
+            "uniform_dia": uniform.footing_diameter_in,
+            "tributary_dia": f"{min(diameters)}-{max(diameters)}",
+            "uniform_bags": _concrete_bags(uniform),
+            "tributary_bags": _concrete_bags(tributary),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    header = (f"{'deck':>22} {'posts':>6} {'uniform us':>11} {'trib us':>8} "
+              f"{'uniform dia':>12} {'trib dia':>9} {'uniform bags':>13} {'trib bags':>10}")
+    print(header)
+    print("-" * len(header))
+    for row in run(args.repeat):
+        print(f"{row['deck']:>22} {row['posts']:>6} {row['uniform_us']:>11.1f} {row['tributary_us']:>8.1f} "
+              f"{row['uniform_dia']:>12} {row['tributary_dia']:>9} {row['uniform_bags']:>13} {row['tributary_bags']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Framing plan content-stream benchmark.
+
+Renders the framing plan sheet for a range of deck sizes and reports the
+uncompressed content-stream size, the number of stroke operations, render
+time for the full package, and the final PDF size.
+
+    python -m benchmarks.framing_plan [--repeat N]
+"""
+
+import argparse
+import re
+import time
+
+from reportlab.pdfgen import canvas
+
+from domain.code_engine import generate_structure
+from domain.models import SiteInput
+from services.permit_pdf import PAGE_SIZE, PermitPDFGenerator
+
+
+DECK_SIZES = [(16, 10), (24, 12), (40, 12), (48, 12), (60, 12), (72, 12)]
+
+STROKE_OPS = re.compile(r"(?<![\w/])[Ss](?![\w/])")
+
+
+def framing_plan_stream(structure) -> str:
+    """Uncompressed content stream of sheet 1"""
+    c = canvas.Canvas(None, pagesize=PAGE_SIZE, pageCompression=0)
+    generator = PermitPDFGenerator(structure)
+    generator.c = c
+    generator._draw_framing_plan()
+    return "\n".join(c._code)
+
+
+def run(repeat: int = 20) -> list[dict]:
+    rows = []
+    for width, depth in DECK_SIZES:
+        structure = generate_structure(SiteInput(width_ft=width, depth_ft=depth, height_ft=6))
+        stream = framing_plan_stream(structure)
+
+        generator = PermitPDFGenerator(structure, invariant=True)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            pdf = generator.to_bytes()
+        elapsed = (time.perf_counter() - start) / repeat
+
+        rows.append({
+            "deck": f"{width}x{depth}",
+            "joists": len(structure.joists),
+            "footings": len(structure.footings),
+            "stream_bytes": len(stream),
+            "strokes": len(STROKE_OPS.findall(stream)),
+            "render_ms": elapsed * 1000,
+            "pdf_bytes": len(pdf),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    header = f"{'deck':>8} {'joists':>7} {'footings':>9} {'stream B':>10} {'strokes':>8} {'render ms':>10} {'pdf B':>8}"
+    print(header)
+    print("-" * len(header))
+    for row in run(args.repeat):
+        print(
+            f"{row['deck']:>8} {row['joists']:>7} {row['footings']:>9} {row['stream_bytes']:>10,} "
+            f"{row['strokes']:>8} {row['render_ms']:>10.2f} {row['pdf_bytes']:>8,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Cold-start import report.
+
+Imports each service-layer module in a fresh interpreter with -X importtime
+and reports its cumulative import time and which heavy dependencies it pulled
+in. A pricing-only worker should load neither ReportLab nor NumPy.
+
+    python -m benchmarks.import_time [--runs N] [module ...]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MODULES = [
+    "domain.models",
+    "domain.code_engine",
+    "services.pricing",
+    "services.design_cache",
+    "services.permit_pdf",
+    "services.permit_batch",
+    "services.batch_pricing",
+]
+
+HEAVY_DEPENDENCIES = ("reportlab", "numpy")
+
+_PROBE = (
+    "import sys, {module}; "
+    "print(','.join(m for m in {heavy!r} if m in sys.modules))"
+)
+
+
+def measure_import(module: str) -> tuple[float, list[str]]:
+    """(cumulative import ms, heavy dependencies loaded) for one cold import"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, heavy=HEAVY_DEPENDENCIES)],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative_us = None
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            cumulative_us = int(cumulative)
+    if cumulative_us is None:
+        raise RuntimeError(f"No importtime entry for {module}:\n{proc.stderr[-2000:]}")
+    heavy = [m for m in proc.stdout.strip().split(",") if m]
+    return cumulative_us / 1000, heavy
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Cold-start import report")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module")
+    args = parser.parse_args(argv)
+
+    header = f"{'module':<28} {'median ms':>10} {'min ms':>8}  heavy deps loaded"
+    print(header)
+    print("-" * len(header))
+    for module in args.modules:
+        samples = []
+        for _ in range(args.runs):
+            ms, heavy = measure_import(module)
+            samples.append(ms)
+        print(f"{module:<28} {statistics.median(samples):>10.1f} {min(samples):>8.1f}  "
+              f"{', '.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Member streaming scaling benchmark.
+
+Designs, prices and makes one drawing-style pass over every member of
+increasingly wide decks, once with eager member lists and once with lazy
+members streamed through iter_members(). Reports time per member (flat when
+time is linear in width) and peak traced memory (flat when streaming).
+
+    python -m benchmarks.scaling [--max-width FT]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from domain.code_engine import generate_structure
+from domain.models import SiteInput, iter_members
+from services.pricing import calculate_quote
+
+
+WIDTHS_FT = [100, 1_000, 10_000, 100_000, 1_000_000]
+
+
+def pipeline(width_ft: float, lazy: bool) -> int:
+    """Design, quote and consume each member once; returns members visited"""
+    structure = generate_structure(SiteInput(width_ft=width_ft, depth_ft=12, height_ft=6), lazy=lazy)
+    calculate_quote(structure)
+    visited = 0
+    for members in (structure.joists, structure.beams, structure.posts, structure.footings):
+        for _ in iter_members(members):  # Stand-in for a drawing sink that keeps nothing
+            visited += 1
+    return visited
+
+
+def measure(width_ft: float, lazy: bool) -> dict:
+    seconds = float("inf")
+    for _ in range(3):  # Best of three
+        start = time.perf_counter()
+        members = pipeline(width_ft, lazy)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    tracemalloc.start()
+    pipeline(width_ft, lazy)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"members": members, "us_per_member": seconds / members * 1e6, "peak_kb": peak / 1024}
+
+
+def run(max_width_ft: float = WIDTHS_FT[-1]) -> list[dict]:
+    rows = []
+    for width in (w for w in WIDTHS_FT if w <= max_width_ft):
+        rows.append({
+            "width": width,
+            "eager": measure(width, lazy=False),
+            "streamed": measure(width, lazy=True),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max-width", type=float, default=WIDTHS_FT[-1])
+    args = parser.parse_args()
+
+    header = (f"{'width ft':>10} {'members':>9} {'eager us/m':>11} {'eager peak KB':>14} "
+              f"{'stream us/m':>12} {'stream peak KB':>15}")
+    print(header)
+    print("-" * len(header))
+    for row in run(args.max_width):
+        e, s = row["eager"], row["streamed"]
+        print(f"{row['width']:>10} {e['members']:>9} {e['us_per_member']:>11.2f} {e['peak_kb']:>14.0f} "
+              f"{s['us_per_member']:>12.2f} {s['peak_kb']:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Binary encoding vs pickle for DeckStructure and Quote.
+
+Reports encoded size and encode/decode time per object for each deck in the
+benchmark corpus, checking that both formats round-trip.
+
+    python -m benchmarks.serialization [--repeat N]
+"""
+
+import argparse
+import pickle
+import time
+
+from benchmarks.suite import CORPUS
+from domain.code_engine import generate_structure
+from services.pricing import calculate_quote
+from services.serialization import encode_structure, decode_structure, encode_quote, decode_quote
+
+
+def _per_call_us(fn, arg, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def compare(obj, encode, decode, repeat: int) -> dict:
+    def pickle_dumps(o):
+        return pickle.dumps(o, protocol=pickle.HIGHEST_PROTOCOL)
+
+    binary = encode(obj)
+    pickled = pickle_dumps(obj)
+    if decode(binary) != obj or pickle.loads(pickled) != obj:
+        raise AssertionError("round-trip mismatch")
+    return {
+        "binary_bytes": len(binary),
+        "pickle_bytes": len(pickled),
+        "binary_encode_us": _per_call_us(encode, obj, repeat),
+        "pickle_encode_us": _per_call_us(pickle_dumps, obj, repeat),
+        "binary_decode_us": _per_call_us(decode, binary, repeat),
+        "pickle_decode_us": _per_call_us(pickle.loads, pickled, repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Binary encoding vs pickle")
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    header = (f"{'case':<22} {'bin B':>7} {'pkl B':>7} {'bin enc us':>11} {'pkl enc us':>11} "
+              f"{'bin dec us':>11} {'pkl dec us':>11}")
+    print(header)
+    print("-" * len(header))
+    for name, site in CORPUS.items():
+        structure = generate_structure(site)
+        quote = calculate_quote(structure)
+        for label, obj, encode, decode in (
+            (f"{name}/structure", structure, encode_structure, decode_structure),
+            (f"{name}/quote", quote, encode_quote, decode_quote),
+        ):
+            r = compare(obj, encode, decode, args.repeat)
+            print(f"{label:<22} {r['binary_bytes']:>7,} {r['pickle_bytes']:>7,} "
+                  f"{r['binary_encode_us']:>11.1f} {r['pickle_encode_us']:>11.1f} "
+                  f"{r['binary_decode_us']:>11.1f} {r['pickle_decode_us']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
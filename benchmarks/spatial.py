@@ -0,0 +1,71 @@
+"""
+Spatial index benchmark.
+
+Builds a SpatialIndex for increasingly wide decks and times nearest, box and
+segment queries against a linear scan over every member footprint.
+
+    python -m benchmarks.spatial [--queries N]
+"""
+
+import argparse
+import random
+import time
+
+from domain.code_engine import generate_structure
+from domain.models import SiteInput
+from domain.spatial import SpatialIndex, box_distance, member_footprints
+
+
+DECK_SIZES = [(16, 12), (40, 12), (100, 12), (400, 12), (1000, 12)]
+
+
+def _us_per_query(fn, queries) -> float:
+    start = time.perf_counter()
+    fn(queries)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def run(queries: int = 2000, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    rows = []
+    for width, depth in DECK_SIZES:
+        structure = generate_structure(SiteInput(width_ft=width, depth_ft=depth, height_ft=6), lazy=True)
+        start = time.perf_counter()
+        index = SpatialIndex(structure)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        points = [(rng.uniform(-width / 2, width / 2), rng.uniform(0, depth)) for _ in range(queries)]
+        boxes = [(x, y, x + 2, y + 1) for x, y in points]        # Window/downspout-sized obstacles
+        segments = [((x, y), (x + 10, y + 3)) for x, y in points]  # Utility runs
+        footprints = [box for _, box in member_footprints(structure)]
+
+        rows.append({
+            "deck": f"{width}x{depth}",
+            "members": len(index),
+            "build_ms": build_ms,
+            "nearest_us": _us_per_query(index.nearest_many, points),
+            "scan_us": _us_per_query(
+                lambda pts: [min(box_distance(b, x, y) for b in footprints) for x, y in pts], points[:200]
+            ),
+            "box_us": _us_per_query(index.in_boxes, boxes),
+            "segment_us": _us_per_query(index.crossings, segments),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    header = (f"{'deck':>8} {'members':>8} {'build ms':>9} {'nearest us':>11} "
+              f"{'scan us':>9} {'box us':>8} {'segment us':>11}")
+    print(header)
+    print("-" * len(header))
+    for row in run(args.queries):
+        print(f"{row['deck']:>8} {row['members']:>8} {row['build_ms']:>9.2f} {row['nearest_us']:>11.1f} "
+              f"{row['scan_us']:>9.1f} {row['box_us']:>8.1f} {row['segment_us']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Engine, pricing and PDF benchmark suite.
+
+Runs a fixed corpus of SiteInputs through each stage of the pipeline and
+reports latency percentiles, peak traced allocation and PDF size. Results
+can be saved as a baseline JSON and later runs compared against it.
+
+    python -m benchmarks.suite                              # report
+    python -m benchmarks.suite --save baseline.json         # report + save
+    python -m benchmarks.suite --baseline baseline.json     # flag regressions (exit 1)
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable
+
+from domain.code_engine import generate_structure
+from domain.models import SiteInput, DeckingType, RailingType, LedgerAttachment
+from services.permit_pdf import PermitPDFGenerator
+from services.pricing import calculate_quote
+
+
+SUITE_VERSION = 1
+
+DEFAULT_REPEAT = 50
+DEFAULT_THRESHOLD = 0.15    # Fractional slowdown/growth that counts as a regression
+MIN_DELTA_MS = 0.05         # Ignore latency changes smaller than this (timer noise)
+
+CORPUS: dict[str, SiteInput] = {
+    "small": SiteInput(
+        width_ft=8, depth_ft=6, height_ft=2,
+        decking_type=DeckingType.PRESSURE_TREATED,
+    ),
+    "typical": SiteInput(
+        width_ft=16, depth_ft=12, height_ft=4,
+        railing_type=RailingType.ALUMINUM, railing_lf=40, stair_count=4,
+        site_address="1234 Example Ave N, Seattle WA 98103",
+    ),
+    "wide": SiteInput(
+        width_ft=72, depth_ft=12, height_ft=8,
+        decking_type=DeckingType.COMPOSITE_TIMBERTECH,
+        railing_type=RailingType.CABLE, railing_lf=96,
+    ),
+    "freestanding": SiteInput(
+        width_ft=20, depth_ft=12, height_ft=6,
+        ledger_attachment=LedgerAttachment.FREESTANDING,
+        decking_type=DeckingType.CEDAR,
+        railing_type=RailingType.WOOD, railing_lf=64,
+    ),
+    "non_compliant": SiteInput(width_ft=24, depth_ft=20, height_ft=10),
+}
+
+STAGES = ("structure", "quote", "pdf")
+
+
+@dataclass
+class StageResult:
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    mean_ms: float
+    peak_kb: float
+
+    def as_dict(self) -> dict:
+        return {
+            "p50_ms": round(self.p50_ms, 4),
+            "p90_ms": round(self.p90_ms, 4),
+            "p99_ms": round(self.p99_ms, 4),
+            "mean_ms": round(self.mean_ms, 4),
+            "peak_kb": round(self.peak_kb, 1),
+        }
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure(fn: Callable[[], object], repeat: int) -> StageResult:
+    """Time fn repeat times, then run it once more under tracemalloc for peak allocation"""
+    fn()  # Warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return StageResult(
+        p50_ms=_percentile(samples, 0.50),
+        p90_ms=_percentile(samples, 0.90),
+        p99_ms=_percentile(samples, 0.99),
+        mean_ms=sum(samples) / len(samples),
+        peak_kb=peak / 1024,
+    )
+
+
+def run_suite(repeat: int = DEFAULT_REPEAT, cases: list[str] | None = None) -> dict:
+    """Benchmark every corpus case; returns the JSON-serializable report"""
+    results = {}
+    for name in cases or CORPUS:
+        site = CORPUS[name]
+        structure = generate_structure(site)
+        quote = calculate_quote(structure)
+        pdf = PermitPDFGenerator(structure, invariant=True).to_bytes()
+
+        # PDFs are rendered in memory so disk speed does not skew the numbers
+        stages = {
+            "structure": measure(lambda: generate_structure(site), repeat),
+            "quote": measure(lambda: calculate_quote(structure), repeat),
+            "pdf": measure(lambda: PermitPDFGenerator(structure, invariant=True).to_bytes(), repeat),
+        }
+        results[name] = {
+            "compliant": structure.compliant,
+            "members": len(structure.footings) + len(structure.posts)
+                       + len(structure.beams) + len(structure.joists),
+            "line_items": len(quote.line_items),
+            "pdf_bytes": len(pdf),
+            "stages": {stage: result.as_dict() for stage, result in stages.items()},
+        }
+
+    return {
+        "suite_version": SUITE_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(
+    current: dict,
+    baseline: dict,
+    threshold: float = DEFAULT_THRESHOLD
+) -> list[str]:
+    """Human-readable regressions of current against baseline (empty if none)"""
+    if baseline.get("suite_version") != current["suite_version"]:
+        return [f"baseline is suite v{baseline.get('suite_version')}, current is v{current['suite_version']}"]
+
+    regressions = []
+    for name, case in current["results"].items():
+        base_case = baseline["results"].get(name)
+        if base_case is None:
+            continue
+        for stage, result in case["stages"].items():
+            base = base_case["stages"].get(stage)
+            if base is None:
+                continue
+            for metric in ("p50_ms", "p90_ms"):
+                delta = result[metric] - base[metric]
+                if delta > MIN_DELTA_MS and result[metric] > base[metric] * (1 + threshold):
+                    regressions.append(
+                        f"{name}/{stage} {metric}: {base[metric]:.3f} -> {result[metric]:.3f} "
+                        f"(+{delta / base[metric]:.0%})"
+                    )
+            if result["peak_kb"] > base["peak_kb"] * (1 + threshold):
+                regressions.append(
+                    f"{name}/{stage} peak_kb: {base['peak_kb']:.1f} -> {result['peak_kb']:.1f}"
+                )
+        if case["pdf_bytes"] > base_case["pdf_bytes"] * (1 + threshold):
+            regressions.append(
+                f"{name} pdf_bytes: {base_case['pdf_bytes']:,} -> {case['pdf_bytes']:,}"
+            )
+    return regressions
+
+
+def print_report(report: dict):
+    header = (f"{'case':<14} {'stage':<10} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} "
+              f"{'peak KB':>9} {'pdf B':>8}")
+    print(header)
+    print("-" * len(header))
+    for name, case in report["results"].items():
+        for stage, r in case["stages"].items():
+            pdf_bytes = f"{case['pdf_bytes']:,}" if stage == "pdf" else ""
+            print(f"{name:<14} {stage:<10} {r['p50_ms']:>9.3f} {r['p90_ms']:>9.3f} "
+                  f"{r['p99_ms']:>9.3f} {r['peak_kb']:>9.1f} {pdf_bytes:>8}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Engine, pricing and PDF benchmark suite")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--case", action="append", choices=list(CORPUS),
+                        help="Run only this corpus case (repeatable)")
+    parser.add_argument("--save", metavar="PATH", help="Write results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Fractional increase flagged as a regression (default %(default)s)")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.repeat, args.case)
+    print_report(report)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) vs {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions vs {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Vectorized Tip 312 Code Engine
+
+Array counterpart of generate_structure() for pricing many candidate decks at once.
+Every row is sized with exactly the same rules as the scalar engine, but no member
+objects are built - only sizes, counts and compliance flags.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from .models import LedgerAttachment, LUMBER_SPECS
+from .code_engine import (
+    TOTAL_LOAD_PSF, MAX_CANTILEVER_RATIO, FOOTING_SIZES,
+    TARGET_BEAM_SPAN_FT, DECKING_THICKNESS_FT,
+    DEFAULT_JOIST_SPACING_IN as JOIST_SPACING_IN,
+)
+from .tables import CodeTables, code_tables
+
+# Failure stage codes (generate_structure returns early at these points)
+STAGE_OK = 0
+STAGE_JOIST = 1
+STAGE_BEAM = 2
+
+
+@dataclass
+class StructureBatch:
+    """Columnar output of generate_structures_batch - one entry per input row"""
+    # Inputs
+    width_ft: np.ndarray
+    depth_ft: np.ndarray
+    height_ft: np.ndarray
+    freestanding: np.ndarray
+    soil_bearing_psf: np.ndarray
+    frost_depth_in: np.ndarray
+
+    # Geometry
+    cantilever_ft: np.ndarray
+    joist_span_ft: np.ndarray
+    beam_span_ft: np.ndarray
+    post_height_ft: np.ndarray
+    tributary_area_sqft: np.ndarray
+
+    # Selected sizes
+    joist_size: np.ndarray
+    joist_spacing_in: np.ndarray
+    beam_size: np.ndarray
+    beam_ply: np.ndarray
+    post_size: np.ndarray
+    footing_diameter_in: np.ndarray
+
+    # Member counts
+    posts_per_beam: np.ndarray
+    beam_count: np.ndarray
+    footing_count: np.ndarray
+    post_count: np.ndarray
+    joist_count: np.ndarray
+    has_ledger: np.ndarray
+
+    # Compliance status
+    compliant: np.ndarray
+    failed_stage: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.width_ft)
+
+
+def _as_column(values, dtype, n: int) -> np.ndarray:
+    """Broadcast a scalar or sequence to a 1-D column of length n"""
+    return np.broadcast_to(np.asarray(values, dtype=dtype), (n,)).copy()
+
+
+def _freestanding_column(ledger_attachment, n: int) -> np.ndarray:
+    """Map LedgerAttachment values (enum or string) to a freestanding mask"""
+    if isinstance(ledger_attachment, (LedgerAttachment, str)):
+        ledger_attachment = [ledger_attachment]
+    codes = np.array([LedgerAttachment(a).value for a in ledger_attachment])
+    return _as_column(codes == LedgerAttachment.FREESTANDING.value, bool, n)
+
+
+def _lumber_heights(sizes: np.ndarray) -> np.ndarray:
+    """Actual depth in feet per nominal size ("" -> 0)"""
+    heights = {"": 0.0, **{k: v.height_ft for k, v in LUMBER_SPECS.items()}}
+    return np.array([heights[s] for s in sizes.tolist()])
+
+
+def _select_beam_array(index, beam_span: np.ndarray, joist_span: np.ndarray):
+    """Array form of _select_beam_size: (size, ply) per row, "" where no config fits"""
+    categories = index.joist_span_category_array(joist_span)
+    size = np.full(len(beam_span), "", dtype=object)
+    ply = np.full(len(beam_span), 2)
+    for cat in index.category_keys:
+        rows = np.flatnonzero(categories == cat)
+        for beam_ply in index.beam_plies:
+            if not len(rows):
+                break
+            chosen = index.beam_ladder(beam_ply, cat).select_array(beam_span[rows])
+            fits = chosen != ""
+            size[rows[fits]] = chosen[fits]
+            ply[rows[fits]] = beam_ply
+            rows = rows[~fits]
+    return size.astype(str), ply
+
+
+def generate_structures_batch(
+    width_ft: Sequence[float],
+    depth_ft: Sequence[float],
+    height_ft: Sequence[float],
+    ledger_attachment=LedgerAttachment.DIRECT,
+    soil_bearing_psf=1500,
+    frost_depth_in=18,
+    tables: CodeTables | None = None,
+) -> StructureBatch:
+    """
+    Size many decks at once. Scalar arguments broadcast across all rows.
+
+    Row i matches generate_structure() for the equivalent SiteInput: same sizes,
+    member counts and compliance. Rows that fail keep the scalar engine's defaults
+    for the stages it never reached (empty size strings, 2 ply, 12" footings).
+    tables pins the code tables version (default: the current snapshot).
+    """
+    width = np.asarray(width_ft, dtype=float).ravel()
+    n = len(width)
+    depth = _as_column(depth_ft, float, n)
+    height = _as_column(height_ft, float, n)
+    freestanding = _freestanding_column(ledger_attachment, n)
+    soil = _as_column(soil_bearing_psf, float, n)
+    frost = _as_column(frost_depth_in, float, n)
+
+    # Cantilever and joist span
+    cantilever = np.where(freestanding, 0.0, np.minimum(2.0, depth * MAX_CANTILEVER_RATIO))
+    joist_span = np.where(freestanding, depth / 2, depth - cantilever)
+    beam_count = np.where(freestanding, 2, 1)
+
+    failed_stage = np.full(n, STAGE_OK)
+    index = (tables or code_tables()).span_index
+
+    # Joist size
+    joist_size = index.joist_ladder(JOIST_SPACING_IN).select_array(joist_span)
+    failed_stage[joist_size == ""] = STAGE_JOIST
+
+    joist_top = height - DECKING_THICKNESS_FT
+    joist_bottom = joist_top - _lumber_heights(joist_size)
+
+    # Post count and beam span
+    posts_per_beam = np.maximum(2, np.ceil(width / TARGET_BEAM_SPAN_FT).astype(np.int64) + 1)
+    beam_span = width / (posts_per_beam - 1)
+
+    # Beam size
+    beam_size, beam_ply = _select_beam_array(index, beam_span, joist_span)
+    failed_stage[(failed_stage == STAGE_OK) & (beam_size == "")] = STAGE_BEAM
+
+    # Posts (largest size when taller than every limit)
+    post_height = joist_bottom - _lumber_heights(beam_size)
+    post_size = index.post_ladder.select_array(post_height, missing=index.post_ladder.sizes[-1])
+
+    # Footings
+    tributary_area = beam_span * joist_span
+    required_area_sqin = (tributary_area * TOTAL_LOAD_PSF) / soil * 144
+    required_diameter = 2 * np.sqrt(required_area_sqin / math.pi)
+    footing_sizes = np.array(FOOTING_SIZES)
+    footing_idx = np.minimum(
+        np.searchsorted(footing_sizes, required_diameter, side="left"), len(FOOTING_SIZES) - 1
+    )
+
+    # Joist count
+    joist_spacing_ft = JOIST_SPACING_IN / 12
+    joist_count = np.floor(width / joist_spacing_ft).astype(np.int64) + 1
+
+    # Apply the scalar engine's early returns
+    ok = failed_stage == STAGE_OK
+
+    return StructureBatch(
+        width_ft=width,
+        depth_ft=depth,
+        height_ft=height,
+        freestanding=freestanding,
+        soil_bearing_psf=soil,
+        frost_depth_in=frost,
+        cantilever_ft=cantilever,
+        joist_span_ft=joist_span,
+        beam_span_ft=beam_span,
+        post_height_ft=post_height,
+        tributary_area_sqft=tributary_area,
+        joist_size=joist_size,
+        joist_spacing_in=np.full(n, JOIST_SPACING_IN),
+        beam_size=np.where(ok, beam_size, ""),
+        beam_ply=np.where(ok, beam_ply, 2),
+        post_size=np.where(ok, post_size, ""),
+        footing_diameter_in=np.where(ok, footing_sizes[footing_idx], 12),
+        posts_per_beam=np.where(ok, posts_per_beam, 0),
+        beam_count=np.where(ok, beam_count, 0),
+        footing_count=np.where(ok, posts_per_beam * beam_count, 0),
+        post_count=np.where(ok, posts_per_beam * beam_count, 0),
+        joist_count=np.where(ok, joist_count, 0),
+        has_ledger=ok & ~freestanding,
+        compliant=ok,
+        failed_stage=failed_stage,
+    )
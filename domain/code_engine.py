@@ -6,48 +6,19 @@ Reference: https://www.seattle.gov/sdci/codes/common-code-questions/decks
 """
 
 import math
+from bisect import bisect_left
+from functools import partial
 from .models import (
     SiteInput, DeckStructure, LedgerAttachment,
-    Footing, Post, Beam, Joist,
-    LumberSpec, LUMBER_SPECS
+    FramingLayout, LazyMembers, LumberSpec, LUMBER_SPECS
 )
+from .span_index import SpanIndex, beam_config_name
+from .instrumentation import phase
+from .tables import CodeTables, code_tables
 
 
-# Joist span table: (nominal_size, spacing_in) -> max_span_ft
-JOIST_SPANS: dict[tuple[str, int], float] = {
-    ("2x6", 12): 10.5,
-    ("2x6", 16): 9.5,
-    ("2x6", 24): 8.0,
-    ("2x8", 12): 13.83,
-    ("2x8", 16): 12.5,
-    ("2x8", 24): 10.5,
-    ("2x10", 12): 17.67,
-    ("2x10", 16): 16.0,
-    ("2x10", 24): 13.5,
-    ("2x12", 12): 21.5,
-    ("2x12", 16): 19.5,
-    ("2x12", 24): 16.5,
-}
-
-# Beam span table: (beam_config, joist_span_category) -> max_beam_span_ft
-# joist_span_category is ceiling of joist span in 2' increments: "6", "8", "10", "12"
-BEAM_SPANS: dict[tuple[str, str], float] = {
-    ("2-2x6", "6"): 5.5,   ("2-2x6", "8"): 4.5,   ("2-2x6", "10"): 4.0,   ("2-2x6", "12"): 3.5,
-    ("2-2x8", "6"): 7.0,   ("2-2x8", "8"): 6.0,   ("2-2x8", "10"): 5.5,   ("2-2x8", "12"): 5.0,
-    ("2-2x10", "6"): 9.0,  ("2-2x10", "8"): 8.0,  ("2-2x10", "10"): 7.0,  ("2-2x10", "12"): 6.5,
-    ("2-2x12", "6"): 11.0, ("2-2x12", "8"): 9.5,  ("2-2x12", "10"): 8.5,  ("2-2x12", "12"): 7.5,
-    ("4x6", "6"): 5.5,     ("4x6", "8"): 4.5,     ("4x6", "10"): 4.0,     ("4x6", "12"): 3.5,
-    ("4x8", "6"): 7.0,     ("4x8", "8"): 6.0,     ("4x8", "10"): 5.5,     ("4x8", "12"): 5.0,
-    ("4x10", "6"): 9.0,    ("4x10", "8"): 8.0,    ("4x10", "10"): 7.0,    ("4x10", "12"): 6.5,
-    ("4x12", "6"): 11.0,   ("4x12", "8"): 9.5,    ("4x12", "10"): 8.5,    ("4x12", "12"): 7.5,
-}
-
-# Post height limits
-POST_HEIGHT_LIMITS: dict[str, float] = {
-    "4x4": 8.0,
-    "4x6": 14.0,
-    "6x6": 20.0,  # Practical limit
-}
+# Standard footing diameters (inches)
+FOOTING_SIZES: list[int] = [12, 14, 16, 18, 20, 24]
 
 # Design loads
 DEAD_LOAD_PSF = 15.0   # Framing + decking
@@ -57,44 +28,88 @@ TOTAL_LOAD_PSF = DEAD_LOAD_PSF + LIVE_LOAD_PSF
 # Cantilever limit
 MAX_CANTILEVER_RATIO = 0.25
 
+# Layout defaults
+DEFAULT_JOIST_SPACING_IN = 16
+TARGET_BEAM_SPAN_FT = 8.0
+DECKING_THICKNESS_FT = 1.0 / 12  # ~1" composite decking
+
+# Footing sizing: "uniform" gives every footing an interior post's load
+# (prescriptive); "tributary" sizes each footing from its own post's load
+# (domain.loads)
+FOOTING_SIZING_MODES = ("uniform", "tributary")
+
+
+# Span tables come from versioned data files (domain.tables); these module
+# attributes read the current snapshot
+def __getattr__(name: str):
+    """JOIST_SPANS, BEAM_SPANS, POST_HEIGHT_LIMITS and SPAN_INDEX from the current code tables"""
+    attr = _TABLE_ATTRS.get(name)
+    if attr is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(code_tables(), attr)
+
+
+_TABLE_ATTRS = {
+    "JOIST_SPANS": "joist_spans",
+    "BEAM_SPANS": "beam_spans",
+    "POST_HEIGHT_LIMITS": "post_height_limits",
+    "SPAN_INDEX": "span_index",
+}
 
-def _get_joist_span_category(joist_span_ft: float) -> str:
+
+def joist_span_category(joist_span_ft: float, index: SpanIndex | None = None) -> str:
     """Round joist span up to nearest category for beam lookup"""
-    if joist_span_ft <= 6:
-        return "6"
-    elif joist_span_ft <= 8:
-        return "8"
-    elif joist_span_ft <= 10:
-        return "10"
-    else:
-        return "12"
+    index = index or code_tables().span_index
+    return index.joist_span_category(joist_span_ft)
+
+
+def joist_span(site_input: SiteInput) -> tuple[float, float]:
+    """
+    (cantilever_ft, joist_span_ft) of the standard layout: freestanding decks
+    have no cantilever and a beam at mid-depth; ledger-attached decks
+    cantilever min(2', depth/4) past a single beam.
+    """
+    depth = site_input.depth_ft
+    if site_input.ledger_attachment == LedgerAttachment.FREESTANDING:
+        return 0.0, depth / 2
+    cantilever_ft = min(2.0, depth * MAX_CANTILEVER_RATIO)
+    return cantilever_ft, depth - cantilever_ft
 
 
-def _select_joist_size(span_ft: float, spacing_in: int = 16) -> str:
+def select_joist_size(span_ft: float, spacing_in: int = 16, index: SpanIndex | None = None) -> str:
     """Select minimum joist size for given span and spacing"""
-    for size in ["2x6", "2x8", "2x10", "2x12"]:
-        max_span = JOIST_SPANS.get((size, spacing_in), 0)
-        if max_span >= span_ft:
-            return size
+    index = index or code_tables().span_index
+    ladder = index.joist_ladder(spacing_in)
+    size = ladder.select(span_ft)
+    if size is not None:
+        return size
     raise ValueError(
         f"Joist span {span_ft:.1f}' exceeds maximum for any size at {spacing_in}\" O.C. "
-        f"(max is {JOIST_SPANS.get(('2x12', spacing_in), 0):.1f}')"
+        f"(max is {ladder.max_capacity:.1f}')"
     )
 
 
-def _select_beam_size(beam_span_ft: float, joist_span_ft: float) -> tuple[str, int]:
+def _select_beam_size(
+    beam_span_ft: float,
+    joist_span_ft: float,
+    ply: int | None = None,
+    index: SpanIndex | None = None
+) -> tuple[str, int]:
     """
     Select minimum beam size for given spans.
     Returns (lumber_size, ply_count).
+    
+    Doubled beams are tried first (more common in residential), then solid 4x
+    beams. Pass ply to restrict the search to one family.
     """
-    joist_cat = _get_joist_span_category(joist_span_ft)
+    index = index or code_tables().span_index
+    joist_cat = joist_span_category(joist_span_ft, index)
     
-    # Try doubled beams first (more common in residential)
-    for size in ["2x6", "2x8", "2x10", "2x12"]:
-        config = f"2-{size}"
-        max_span = BEAM_SPANS.get((config, joist_cat), 0)
-        if max_span >= beam_span_ft:
-            return size, 2
+    plies = index.beam_plies if ply is None else (ply,)
+    for beam_ply in plies:
+        size = index.beam_ladder(beam_ply, joist_cat).select(beam_span_ft)
+        if size is not None:
+            return size, beam_ply
     
     raise ValueError(
         f"Beam span {beam_span_ft:.1f}' exceeds maximum for joist span category {joist_cat}'. "
@@ -102,12 +117,10 @@ def _select_beam_size(beam_span_ft: float, joist_span_ft: float) -> tuple[str, i
     )
 
 
-def _select_post_size(height_ft: float) -> str:
+def _select_post_size(height_ft: float, index: SpanIndex | None = None) -> str:
     """Select minimum post size for given height"""
-    for size in ["4x4", "4x6", "6x6"]:
-        if POST_HEIGHT_LIMITS[size] >= height_ft:
-            return size
-    return "6x6"  # Default to largest
+    ladder = (index or code_tables().span_index).post_ladder
+    return ladder.select(height_ft) or ladder.sizes[-1]  # Default to largest
 
 
 def _calculate_footing_diameter(
@@ -122,18 +135,44 @@ def _calculate_footing_diameter(
     required_diameter = 2 * math.sqrt(required_area_sqin / math.pi)
     
     # Round up to standard sizes: 12", 14", 16", 18", 20", 24"
-    standard_sizes = [12, 14, 16, 18, 20, 24]
-    for size in standard_sizes:
-        if size >= required_diameter:
-            return size
-    
-    return 24  # Maximum standard size
+    idx = bisect_left(FOOTING_SIZES, required_diameter)
+    return FOOTING_SIZES[min(idx, len(FOOTING_SIZES) - 1)]  # Cap at maximum standard size
 
 
-def generate_structure(site_input: SiteInput) -> DeckStructure:
+def generate_structure(
+    site_input: SiteInput,
+    *,
+    joist_spacing_in: int = DEFAULT_JOIST_SPACING_IN,
+    num_posts: int | None = None,
+    beam_ply: int | None = None,
+    compact: bool = False,
+    lazy: bool = False,
+    tables: CodeTables | None = None,
+    footing_sizing: str = "uniform"
+) -> DeckStructure:
     """
     Generate a code-compliant deck structure from site measurements.
     
+    Layout overrides (defaults give the standard prescriptive design):
+    - joist_spacing_in: joist spacing, must be a spacing in the joist span table
+    - num_posts: posts per beam line (default: enough for ~8' beam spans)
+    - beam_ply: restrict beam selection to doubled (2) or solid 4x (1) beams
+    
+    compact=True stores members in NumPy-backed arrays (domain.members)
+    instead of per-member dataclass lists. lazy=True defers building members
+    until they are iterated; counts and total lengths (all calculate_quote()
+    needs) are available immediately, so quote-only requests are O(1) in deck size.
+    Lazy members can also be streamed with domain.models.iter_members(), which
+    is how the permit drawings consume them: memory stays flat as width grows.
+    
+    tables pins the code tables version (default: the current snapshot, taken
+    once at the start so a concurrent reload cannot change tables mid-design).
+    
+    footing_sizing="tributary" sizes each footing from its post's own
+    tributary area (domain.loads) instead of one interior-post size for all;
+    end posts get smaller footings. structure.footing_diameter_in is then the
+    largest size and layout.footing_diameters_in holds each footing's.
+    
     Coordinate system:
     - Origin (0, 0) at center of ledger (house wall)
     - +X runs along house (width direction)
@@ -142,28 +181,21 @@ def generate_structure(site_input: SiteInput) -> DeckStructure:
     
     Returns DeckStructure with all members positioned and sized.
     """
-    structure = DeckStructure(input=site_input)
+    if footing_sizing not in FOOTING_SIZING_MODES:
+        raise ValueError(f"footing_sizing must be one of {FOOTING_SIZING_MODES}, got {footing_sizing!r}")
+    tables = tables or code_tables()
+    index = tables.span_index
+    structure = DeckStructure(input=site_input, code_tables_version=tables.version)
     
     width = site_input.width_ft
     depth = site_input.depth_ft
     height = site_input.height_ft
     
-    # Determine joist spacing (default 16" O.C.)
-    joist_spacing_in = 16
+    # Joist spacing (default 16" O.C.)
     structure.joist_spacing_in = joist_spacing_in
     
     # Calculate cantilever (default 2', but validate)
-    # For freestanding decks, no cantilever
-    if site_input.ledger_attachment == LedgerAttachment.FREESTANDING:
-        cantilever_ft = 0.0
-        joist_span_ft = depth / 2  # Beam at center
-        beam_count = 2
-    else:
-        # Standard ledger-attached: cantilever = min(2', depth/4)
-        max_cantilever = depth * MAX_CANTILEVER_RATIO
-        cantilever_ft = min(2.0, max_cantilever)
-        joist_span_ft = depth - cantilever_ft
-        beam_count = 1
+    cantilever_ft, joist_span_ft = joist_span(site_input)
     
     # Validate cantilever
     if cantilever_ft > depth * MAX_CANTILEVER_RATIO:
@@ -176,7 +208,8 @@ def generate_structure(site_input: SiteInput) -> DeckStructure:
     
     # Select joist size
     try:
-        joist_size = _select_joist_size(joist_span_ft, joist_spacing_in)
+        with phase("engine.joist_selection"):
+            joist_size = select_joist_size(joist_span_ft, joist_spacing_in, index)
         structure.joist_size = joist_size
         structure.notes.append(f"Joists: {joist_size} at {joist_spacing_in}\" O.C. (span {joist_span_ft:.1f}')")
     except ValueError as e:
@@ -187,22 +220,24 @@ def generate_structure(site_input: SiteInput) -> DeckStructure:
     joist_lumber = LUMBER_SPECS[joist_size]
     
     # Calculate elevations
-    decking_thickness_ft = 1.0 / 12  # ~1" composite decking
-    joist_top_z = height - decking_thickness_ft
+    joist_top_z = height - DECKING_THICKNESS_FT
     joist_bottom_z = joist_top_z - joist_lumber.height_ft
     beam_top_z = joist_bottom_z
     
     # Determine post spacing (beam span) and beam size
     # Start with max 8' post spacing, adjust beam size
-    target_beam_span = 8.0
-    num_posts = max(2, math.ceil(width / target_beam_span) + 1)
+    if num_posts is None:
+        num_posts = max(2, math.ceil(width / TARGET_BEAM_SPAN_FT) + 1)
+    elif num_posts < 2:
+        raise ValueError(f"num_posts must be at least 2 per beam line, got {num_posts}")
     actual_beam_span = width / (num_posts - 1)
     
     try:
-        beam_lumber_size, beam_ply = _select_beam_size(actual_beam_span, joist_span_ft)
+        with phase("engine.beam_selection"):
+            beam_lumber_size, beam_ply = _select_beam_size(actual_beam_span, joist_span_ft, beam_ply, index)
         structure.beam_size = beam_lumber_size
         structure.beam_ply = beam_ply
-        beam_config = f"{beam_ply}-{beam_lumber_size}"
+        beam_config = beam_config_name(beam_lumber_size, beam_ply)
         structure.notes.append(
             f"Beam: {beam_config} (span {actual_beam_span:.1f}', {num_posts} posts)"
         )
@@ -218,76 +253,104 @@ def generate_structure(site_input: SiteInput) -> DeckStructure:
     post_height_ft = beam_bottom_z
     
     # Select post size
-    post_size = _select_post_size(post_height_ft)
+    with phase("engine.post_selection"):
+        post_size = _select_post_size(post_height_ft, index)
     structure.post_size = post_size
     post_lumber = LUMBER_SPECS[post_size]
     
-    if post_height_ft > POST_HEIGHT_LIMITS.get(post_size, 8.0):
+    if post_height_ft > tables.post_height_limits.get(post_size, 8.0):
         structure.notes.append(f"Posts: {post_size} at {post_height_ft:.1f}' height (verify with engineer)")
     else:
         structure.notes.append(f"Posts: {post_size} at {post_height_ft:.1f}' height")
     
-    # Calculate footing size
-    tributary_area = actual_beam_span * joist_span_ft
-    footing_diameter = _calculate_footing_diameter(tributary_area, site_input.soil_bearing_psf)
-    structure.footing_diameter_in = footing_diameter
-    structure.notes.append(
-        f"Footings: {footing_diameter}\" diameter x {site_input.frost_depth_in}\" deep "
-        f"(tributary area {tributary_area:.0f} SF)"
-    )
-    
     # Generate beam Y position(s)
     if site_input.ledger_attachment == LedgerAttachment.FREESTANDING:
         beam_y_positions = [depth / 3, 2 * depth / 3]
     else:
         beam_y_positions = [depth - cantilever_ft]
     
-    # Generate footings and posts
-    for beam_y in beam_y_positions:
-        for i in range(num_posts):
-            x = -(width / 2) + (i * actual_beam_span)
-            
-            structure.footings.append(Footing(
-                x_ft=x,
-                y_ft=beam_y,
-                diameter_in=footing_diameter,
-                depth_in=site_input.frost_depth_in
-            ))
-            
-            structure.posts.append(Post(
-                x_ft=x,
-                y_ft=beam_y,
-                height_ft=post_height_ft,
-                lumber=post_lumber
-            ))
-    
-    # Generate beams
-    for beam_y in beam_y_positions:
-        structure.beams.append(Beam(
-            x_start_ft=-width / 2,
-            x_end_ft=width / 2,
-            y_ft=beam_y,
-            z_ft=beam_bottom_z,
-            lumber=beam_lumber,
-            ply=beam_ply
-        ))
-    
-    # Generate joists
+    # Calculate footing size
+    footing_diameters = None
+    with phase("engine.footing_sizing") as sizing:
+        if footing_sizing == "tributary":
+            from .loads import grid_post_loads
+            loads = grid_post_loads(
+                width, depth, beam_y_positions, num_posts, actual_beam_span,
+                ledger=site_input.ledger_attachment != LedgerAttachment.FREESTANDING,
+                soil_bearing_psf=site_input.soil_bearing_psf,
+            )
+            footing_diameters = tuple(loads.footing_diameter_in.tolist())
+            footing_diameter = max(footing_diameters)
+            sizing.count("footings", len(footing_diameters))
+        else:
+            tributary_area = actual_beam_span * joist_span_ft
+            footing_diameter = _calculate_footing_diameter(tributary_area, site_input.soil_bearing_psf)
+    structure.footing_diameter_in = footing_diameter
+    if footing_diameters is None:
+        structure.notes.append(
+            f"Footings: {footing_diameter}\" diameter x {site_input.frost_depth_in}\" deep "
+            f"(tributary area {tributary_area:.0f} SF)"
+        )
+    else:
+        areas = loads.tributary_sqft
+        structure.notes.append(
+            f"Footings: {min(footing_diameters)}-{footing_diameter}\" diameter x {site_input.frost_depth_in}\" deep "
+            f"(per-post tributary area {areas.min():.0f}-{areas.max():.0f} SF)"
+        )
+    
+    # Joist layout
     joist_spacing_ft = joist_spacing_in / 12
     num_joists = math.floor(width / joist_spacing_ft) + 1
     total_joist_width = (num_joists - 1) * joist_spacing_ft
     joist_start_x = -total_joist_width / 2
     
-    for i in range(num_joists):
-        x = joist_start_x + (i * joist_spacing_ft)
+    layout = FramingLayout(
+        width_ft=width,
+        depth_ft=depth,
+        beam_y_positions=tuple(beam_y_positions),
+        posts_per_beam=num_posts,
+        beam_span_ft=actual_beam_span,
+        post_height_ft=post_height_ft,
+        beam_z_ft=beam_bottom_z,
+        joist_z_ft=joist_bottom_z,
+        joist_count=num_joists,
+        joist_start_x_ft=joist_start_x,
+        joist_spacing_ft=joist_spacing_ft,
+        footing_diameter_in=footing_diameter,
+        footing_depth_in=site_input.frost_depth_in,
+        joist_lumber=joist_lumber,
+        beam_lumber=beam_lumber,
+        beam_ply=beam_ply,
+        post_lumber=post_lumber,
+        footing_diameters_in=footing_diameters,
+    )
+    structure.layout = layout
+    
+    # Generate footings, posts, beams and joists
+    with phase("engine.member_emission") as emission:
+        if compact:
+            from . import members
+            builders = tuple(
+                partial(build, layout) for build in
+                (members.footing_array, members.post_array, members.beam_array, members.joist_array)
+            )
+        else:
+            builders = (layout.footings, layout.posts, layout.beams, layout.joists)
         
-        structure.joists.append(Joist(
-            x_ft=x,
-            y_start_ft=0 if site_input.ledger_attachment != LedgerAttachment.FREESTANDING else 0,
-            y_end_ft=depth,
-            z_ft=joist_bottom_z,
-            lumber=joist_lumber
-        ))
+        if lazy:
+            # Counts and lengths in closed form; members built on first iteration,
+            # or streamed one at a time from the layout by iter_members()
+            supports = layout.support_count
+            structure.footings = LazyMembers(builders[0], supports, 0.0, layout.footing)
+            structure.posts = LazyMembers(builders[1], supports, layout.post_lf, layout.post)
+            structure.beams = LazyMembers(builders[2], len(beam_y_positions), layout.beam_lf, layout.beam)
+            structure.joists = LazyMembers(builders[3], num_joists, layout.joist_lf, layout.joist)
+        else:
+            structure.footings, structure.posts, structure.beams, structure.joists = (
+                build() for build in builders
+            )
+            # Only counted when built here; lazy members are built later, outside this phase
+            emission.count("members", 2 * layout.support_count + len(beam_y_positions) + num_joists)
     
     structure.notes.append(f"Joists: {num_joists} total")
     
@@ -0,0 +1,140 @@
+"""
+Per-phase timing and counter hooks.
+
+The engine, pricing and PDF code wrap their phases in `with phase(name) as p:`
+and report counts with `p.count(...)`. Each finished phase is delivered as a
+PhaseEvent to every registered sink. With no sink registered, phase() returns
+a shared no-op object, so instrumented code pays one function call and an
+empty with-block per phase.
+
+    recorder = PhaseRecorder()
+    register_sink(recorder)
+    calculate_quote(generate_structure(site))
+    unregister_sink(recorder)
+    recorder.summary()   # {"engine.joist_selection": PhaseTotals(...), ...}
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+@dataclass(slots=True)
+class PhaseEvent:
+    """One completed phase"""
+    name: str
+    seconds: float
+    counts: dict[str, int]
+
+
+Sink = Callable[[PhaseEvent], None]
+
+# Replaced (never mutated) on register/unregister, so emitting needs no lock
+_sinks: tuple[Sink, ...] = ()
+_sinks_lock = threading.Lock()
+
+
+def register_sink(sink: Sink) -> Sink:
+    """Start delivering PhaseEvents to sink; returns sink"""
+    global _sinks
+    with _sinks_lock:
+        _sinks = _sinks + (sink,)
+    return sink
+
+
+def unregister_sink(sink: Sink):
+    global _sinks
+    with _sinks_lock:
+        _sinks = tuple(s for s in _sinks if s is not sink)
+
+
+def active() -> bool:
+    """True if any sink is registered"""
+    return bool(_sinks)
+
+
+class _NullPhase:
+    """Shared no-op phase used while no sink is registered"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def count(self, key: str, n: int = 1):
+        pass
+
+
+class _Phase:
+    __slots__ = ("name", "counts", "_start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counts: dict[str, int] = {}
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        event = PhaseEvent(self.name, time.perf_counter() - self._start, self.counts)
+        for sink in _sinks:
+            sink(event)
+        return False
+
+    def count(self, key: str, n: int = 1):
+        self.counts[key] = self.counts.get(key, 0) + n
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def phase(name: str):
+    """Context manager timing one phase; use .count(key, n) inside it"""
+    if not _sinks:
+        return _NULL_PHASE
+    return _Phase(name)
+
+
+@dataclass
+class PhaseTotals:
+    """Aggregate of every event for one phase name"""
+    calls: int = 0
+    seconds: float = 0.0
+    counts: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.seconds / self.calls * 1000 if self.calls else 0.0
+
+
+class PhaseRecorder:
+    """Sink that aggregates events by phase name"""
+
+    def __init__(self):
+        self._totals: dict[str, PhaseTotals] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: PhaseEvent):
+        with self._lock:
+            totals = self._totals.get(event.name)
+            if totals is None:
+                totals = self._totals[event.name] = PhaseTotals()
+            totals.calls += 1
+            totals.seconds += event.seconds
+            for key, n in event.counts.items():
+                totals.counts[key] = totals.counts.get(key, 0) + n
+
+    def summary(self) -> dict[str, PhaseTotals]:
+        with self._lock:
+            return {
+                name: PhaseTotals(t.calls, t.seconds, dict(t.counts))
+                for name, t in self._totals.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
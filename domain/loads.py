@@ -0,0 +1,147 @@
+"""
+Per-post tributary load analysis
+
+The prescriptive engine gives every footing the load of one interior post
+(beam span x joist span). This module follows the load path instead:
+
+1. Joists carry the deck load to their supports (the ledger, if attached,
+   and each beam line). With two supports, the reactions follow from
+   statics, including the joist overhang past the beam. With more, each
+   support takes the depth halfway to its neighbours.
+2. Each beam line carries its share to its posts. Each post takes the beam
+   length halfway to its neighbours on that line, out to the beam ends, so
+   end posts carry about half of an interior post.
+
+Every post's tributary area, reaction and footing diameter is computed in one
+vectorized pass. Posts may sit anywhere along their beam lines, so the
+analysis works for irregular layouts as well.
+"""
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from .code_engine import FOOTING_SIZES, TOTAL_LOAD_PSF
+
+
+@dataclass
+class PostLoads:
+    """Loads for each post, in input order"""
+    tributary_sqft: np.ndarray
+    reaction_lb: np.ndarray
+    footing_diameter_in: np.ndarray    # Standard sizes, capped at the largest
+
+    @property
+    def total_reaction_lb(self) -> float:
+        return float(self.reaction_lb.sum())
+
+
+def joist_support_depths(support_y: Sequence[float], depth_ft: float) -> np.ndarray:
+    """
+    Deck depth (ft) each joist support carries, for joists running y = 0 to
+    depth_ft under uniform load. The depths sum to depth_ft.
+    """
+    ys = np.asarray(support_y, dtype=float)
+    if len(ys) == 1:
+        return np.array([float(depth_ft)])
+    order = np.argsort(ys)
+    sorted_y = ys[order]
+    if len(ys) == 2:
+        # Statics for a simple span with overhangs: moments about the first support
+        a, b = sorted_y
+        far = depth_ft * (depth_ft / 2 - a) / (b - a)
+        shares = np.array([depth_ft - far, far])
+    else:
+        edges = np.concatenate(([0.0], (sorted_y[1:] + sorted_y[:-1]) / 2, [depth_ft]))
+        shares = np.diff(edges)
+    depths = np.empty_like(shares)
+    depths[order] = shares
+    return depths
+
+
+def footing_diameters(
+    reaction_lb: np.ndarray,
+    soil_bearing_psf: float,
+    sizes: Sequence[int] = FOOTING_SIZES
+) -> np.ndarray:
+    """Smallest standard footing diameter (in) for each reaction (array form of the engine's sizing)"""
+    required_area_sqin = np.asarray(reaction_lb, dtype=float) / soil_bearing_psf * 144
+    required_diameter = 2 * np.sqrt(required_area_sqin / np.pi)
+    sizes = np.asarray(sizes)
+    return sizes[np.minimum(np.searchsorted(sizes, required_diameter, side="left"), len(sizes) - 1)]
+
+
+def analyze_post_loads(
+    post_x: Sequence[float],
+    post_y: Sequence[float],
+    beam_y: Sequence[float],
+    beam_x_start: Sequence[float],
+    beam_x_end: Sequence[float],
+    depth_ft: float,
+    *,
+    ledger: bool,
+    soil_bearing_psf: float,
+    load_psf: float = TOTAL_LOAD_PSF
+) -> PostLoads:
+    """
+    Tributary area, reaction and footing size of every post.
+
+    Posts belong to the beam line nearest their y. A ledger, when attached,
+    is a joist support at y = 0 that carries its share straight to the house.
+    """
+    post_x = np.asarray(post_x, dtype=float)
+    post_y = np.asarray(post_y, dtype=float)
+    beam_y = np.asarray(beam_y, dtype=float)
+    beam_x_start = np.asarray(beam_x_start, dtype=float)
+    beam_x_end = np.asarray(beam_x_end, dtype=float)
+
+    if ledger:
+        line_depth = joist_support_depths(np.concatenate(([0.0], beam_y)), depth_ft)[1:]
+    else:
+        line_depth = joist_support_depths(beam_y, depth_ft)
+
+    line = np.abs(post_y[:, None] - beam_y[None, :]).argmin(axis=1)
+    order = np.lexsort((post_x, line))
+    xs, lines = post_x[order], line[order]
+
+    # Each post's share of its beam line: halfway to its neighbours, out to the beam ends
+    first = np.ones(len(xs), dtype=bool)
+    first[1:] = lines[1:] != lines[:-1]
+    last = np.ones(len(xs), dtype=bool)
+    last[:-1] = first[1:]
+    midpoints = (xs[1:] + xs[:-1]) / 2
+    left = np.where(first, beam_x_start[lines], np.concatenate(([0.0], midpoints)))
+    right = np.where(last, beam_x_end[lines], np.concatenate((midpoints, [0.0])))
+
+    tributary = np.empty(len(xs))
+    tributary[order] = np.maximum(right - left, 0.0) * line_depth[lines]
+    reaction = tributary * load_psf
+    return PostLoads(
+        tributary_sqft=tributary,
+        reaction_lb=reaction,
+        footing_diameter_in=footing_diameters(reaction, soil_bearing_psf),
+    )
+
+
+def grid_post_loads(
+    width_ft: float,
+    depth_ft: float,
+    beam_y_positions: Sequence[float],
+    posts_per_beam: int,
+    beam_span_ft: float,
+    *,
+    ledger: bool,
+    soil_bearing_psf: float
+) -> PostLoads:
+    """
+    analyze_post_loads() for the engine's regular layout: full-width beam
+    lines with evenly spaced posts, in FramingLayout support order.
+    """
+    beam_y = np.asarray(beam_y_positions, dtype=float)
+    post_x = -(width_ft / 2) + np.arange(posts_per_beam) * beam_span_ft
+    return analyze_post_loads(
+        np.tile(post_x, len(beam_y)), np.repeat(beam_y, posts_per_beam),
+        beam_y, np.full(len(beam_y), -width_ft / 2), np.full(len(beam_y), width_ft / 2),
+        depth_ft, ledger=ledger, soil_bearing_psf=soil_bearing_psf,
+    )
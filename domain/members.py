@@ -0,0 +1,259 @@
+"""
+Array-backed member stores
+
+Struct-of-arrays alternative to the per-member dataclass lists on DeckStructure:
+one NumPy array per coordinate, with values every member shares (lumber spec,
+ply) held once. Stores behave as read-only sequences whose items are light
+views, so calculate_quote() and PermitPDFGenerator iterate them unchanged.
+"""
+
+from typing import Iterator, Sequence
+
+import numpy as np
+
+from .models import Footing, Post, Beam, Joist, FramingLayout
+
+
+class MemberView:
+    """One member of a MemberArray, read through to the backing arrays"""
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: "MemberArray", index: int):
+        self._store = store
+        self._index = index
+
+    def __getattr__(self, name: str):
+        store = self._store
+        column = store._columns.get(name)
+        if column is not None:
+            return column[self._index].item()
+        if name in store._shared:
+            return store._shared[name]
+        raise AttributeError(f"{type(self).__name__} has no attribute {name!r}")
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (MemberView, self._store.member_type)):
+            return all(
+                getattr(self, name) == getattr(other, name)
+                for name in self._store.field_names
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{n}={getattr(self, n)!r}" for n in self._store.field_names)
+        return f"{type(self).__name__}({values})"
+
+    def materialize(self):
+        """Standalone member dataclass with this view's values"""
+        return self._store.member_type(**{n: getattr(self, n) for n in self._store.field_names})
+
+
+class MemberArray(Sequence):
+    """
+    Read-only sequence of one member type backed by per-field arrays.
+    Subclasses name the member type and which fields are shared by every member.
+    """
+    member_type: type
+    view_type: type = MemberView
+    field_names: tuple[str, ...] = ()
+    shared_fields: tuple[str, ...] = ()
+
+    __slots__ = ("_columns", "_shared", "_len")
+
+    def __init__(self, columns: dict[str, np.ndarray], **shared):
+        missing = set(self.field_names) - set(columns) - set(shared)
+        if missing:
+            raise ValueError(f"{type(self).__name__} missing fields: {sorted(missing)}")
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"{type(self).__name__} columns differ in length: {sorted(lengths)}")
+        self._columns = columns
+        self._shared = shared
+        self._len = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_members(cls, members: Sequence) -> "MemberArray":
+        """Pack a list of member dataclasses; shared fields must agree across members"""
+        members = list(members)
+        shared = {}
+        for name in cls.shared_fields:
+            values = {getattr(m, name) for m in members}
+            if len(values) > 1:
+                raise ValueError(f"{cls.__name__}: members differ in shared field {name!r}")
+            shared[name] = values.pop() if values else None
+        columns = {
+            name: np.array([getattr(m, name) for m in members], dtype=cls._dtype(name))
+            for name in cls.field_names if name not in cls.shared_fields
+        }
+        return cls(columns, **shared)
+
+    @classmethod
+    def _dtype(cls, name: str):
+        return np.float64
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # Slices share the backing arrays (NumPy views, no copy)
+            return type(self)({n: c[index] for n, c in self._columns.items()}, **self._shared)
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError(f"{type(self).__name__} index out of range")
+        return self.view_type(self, index)
+
+    def __iter__(self) -> Iterator:
+        view_type = self.view_type
+        for i in range(self._len):
+            yield view_type(self, i)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(<{self._len} members>)"
+
+    def column(self, name: str) -> np.ndarray:
+        """Backing array for a per-member field"""
+        return self._columns[name]
+
+    def to_members(self) -> list:
+        """Materialize standalone member dataclasses"""
+        return [view.materialize() for view in self]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self._columns.values())
+
+
+class FootingView(MemberView):
+    __slots__ = ()
+
+
+class PostView(MemberView):
+    __slots__ = ()
+    lumber_lf = Post.lumber_lf
+
+
+class BeamView(MemberView):
+    __slots__ = ()
+    lumber_lf = Beam.lumber_lf
+
+
+class JoistView(MemberView):
+    __slots__ = ()
+    lumber_lf = Joist.lumber_lf
+
+
+class FootingArray(MemberArray):
+    member_type = Footing
+    view_type = FootingView
+    field_names = ("x_ft", "y_ft", "diameter_in", "depth_in")
+    shared_fields = ("depth_in",)   # Every footing goes to frost depth
+    __slots__ = ()
+
+    @classmethod
+    def _dtype(cls, name: str):
+        return np.int64 if name == "diameter_in" else np.float64
+
+
+class PostArray(MemberArray):
+    member_type = Post
+    view_type = PostView
+    field_names = ("x_ft", "y_ft", "height_ft", "lumber")
+    shared_fields = ("lumber",)
+    __slots__ = ()
+
+    def total_lf(self) -> float:
+        return sum(self._columns["height_ft"].tolist())
+
+
+class BeamArray(MemberArray):
+    member_type = Beam
+    view_type = BeamView
+    field_names = ("x_start_ft", "x_end_ft", "y_ft", "z_ft", "lumber", "ply")
+    shared_fields = ("lumber", "ply")
+    __slots__ = ()
+
+    def total_lf(self) -> float:
+        lengths = (self._columns["x_end_ft"] - self._columns["x_start_ft"]) * self._shared["ply"]
+        return sum(lengths.tolist())
+
+
+class JoistArray(MemberArray):
+    member_type = Joist
+    view_type = JoistView
+    field_names = ("x_ft", "y_start_ft", "y_end_ft", "z_ft", "lumber")
+    shared_fields = ("lumber",)
+    __slots__ = ()
+
+    def total_lf(self) -> float:
+        return sum((self._columns["y_end_ft"] - self._columns["y_start_ft"]).tolist())
+
+
+def _support_grid(layout: FramingLayout) -> tuple[np.ndarray, np.ndarray]:
+    """(x, y) of every post/footing, beam line by beam line"""
+    beam_ys = np.asarray(layout.beam_y_positions, dtype=float)
+    post_x = -(layout.width_ft / 2) + (np.arange(layout.posts_per_beam) * layout.beam_span_ft)
+    return np.tile(post_x, len(beam_ys)), np.repeat(beam_ys, layout.posts_per_beam)
+
+
+def footing_array(layout: FramingLayout) -> FootingArray:
+    grid_x, grid_y = _support_grid(layout)
+    return FootingArray({
+        "x_ft": grid_x,
+        "y_ft": grid_y,
+        "diameter_in": (
+            np.full(len(grid_x), layout.footing_diameter_in, dtype=np.int64)
+            if layout.footing_diameters_in is None
+            else np.asarray(layout.footing_diameters_in, dtype=np.int64)
+        ),
+    }, depth_in=layout.footing_depth_in)
+
+
+def post_array(layout: FramingLayout) -> PostArray:
+    grid_x, grid_y = _support_grid(layout)
+    return PostArray({
+        "x_ft": grid_x,
+        "y_ft": grid_y,
+        "height_ft": np.full(len(grid_x), layout.post_height_ft),
+    }, lumber=layout.post_lumber)
+
+
+def beam_array(layout: FramingLayout) -> BeamArray:
+    n_beams = len(layout.beam_y_positions)
+    return BeamArray({
+        "x_start_ft": np.full(n_beams, -layout.width_ft / 2),
+        "x_end_ft": np.full(n_beams, layout.width_ft / 2),
+        "y_ft": np.asarray(layout.beam_y_positions, dtype=float),
+        "z_ft": np.full(n_beams, layout.beam_z_ft),
+    }, lumber=layout.beam_lumber, ply=layout.beam_ply)
+
+
+def joist_array(layout: FramingLayout) -> JoistArray:
+    n_joists = layout.joist_count
+    return JoistArray({
+        "x_ft": layout.joist_start_x_ft + (np.arange(n_joists) * layout.joist_spacing_ft),
+        "y_start_ft": np.zeros(n_joists),
+        "y_end_ft": np.full(n_joists, float(layout.depth_ft)),
+        "z_ft": np.full(n_joists, layout.joist_z_ft),
+    }, lumber=layout.joist_lumber)
+
+
+def arrays_from_layout(
+    layout: FramingLayout
+) -> tuple[FootingArray, PostArray, BeamArray, JoistArray]:
+    """Build compact member stores straight from a layout, without member objects"""
+    return footing_array(layout), post_array(layout), beam_array(layout), joist_array(layout)
+
+
+def compact_members(structure) -> None:
+    """Swap a structure's member lists for array-backed stores in place"""
+    structure.footings = FootingArray.from_members(structure.footings)
+    structure.posts = PostArray.from_members(structure.posts)
+    structure.beams = BeamArray.from_members(structure.beams)
+    structure.joists = JoistArray.from_members(structure.joists)
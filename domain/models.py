@@ -1,6 +1,7 @@
-from dataclasses import dataclass, field
+import math
+from dataclasses import MISSING, dataclass, field, fields, replace
 from enum import Enum
-from typing import Optional
+from typing import Any, Callable, Iterator, Mapping, Optional, Sequence
 
 
 class DeckingType(Enum):
@@ -24,7 +25,7 @@ class LedgerAttachment(Enum):
     FREESTANDING = "freestanding"  # No ledger, beam on both ends
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LumberSpec:
     """Lumber specification with actual dimensions"""
     nominal: str        # "2x10"
@@ -79,8 +80,85 @@ class SiteInput:
     customer_name: str = ""
     site_address: str = ""
     
+    def quantized(self, tolerance_ft: float) -> "SiteInput":
+        """Copy with dimensions (and railing LF) snapped to the nearest multiple of tolerance_ft"""
+        if tolerance_ft <= 0:
+            return replace(self)
+        return replace(self, **{
+            name: _quantize(getattr(self, name), tolerance_ft) for name in QUANTIZED_FIELDS
+        })
+    
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "SiteInput":
+        """
+        Build from a plain mapping such as parsed JSON; enum fields take their
+        string values. Numeric fields must be finite numbers, and
+        POSITIVE_FIELDS positive ones.
+        """
+        known = {f.name: f for f in fields(cls)}
+        unknown = set(data) - set(known)
+        if unknown:
+            raise ValueError(f"Unknown SiteInput fields: {sorted(unknown)}")
+        missing = [
+            name for name, f in known.items()
+            if f.default is MISSING and f.default_factory is MISSING and name not in data
+        ]
+        if missing:
+            raise ValueError(f"Missing SiteInput fields: {missing}")
+        
+        values = dict(data)
+        for name, value in values.items():
+            field_type = known[name].type
+            if isinstance(field_type, type) and issubclass(field_type, Enum):
+                values[name] = field_type(value)
+            elif field_type in (int, float):
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    raise ValueError(f"{name} must be a number, got {value!r}")
+                if name in POSITIVE_FIELDS and not (math.isfinite(value) and value > 0):
+                    raise ValueError(f"{name} must be a positive finite number, got {value!r}")
+                if not math.isfinite(value):
+                    raise ValueError(f"{name} must be a finite number, got {value!r}")
+        return cls(**values)
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Plain (JSON-ready) mapping; inverse of from_dict"""
+        values = {f.name: getattr(self, f.name) for f in fields(self)}
+        return {name: v.value if isinstance(v, Enum) else v for name, v in values.items()}
+    
+    def without_project_info(self) -> "SiteInput":
+        """Copy with PROJECT_FIELDS (customer name, address) cleared; the design is unchanged"""
+        if not any(getattr(self, name) for name in PROJECT_FIELDS):
+            return self
+        return replace(self, **{name: "" for name in PROJECT_FIELDS})
+    
+    def canonical_key(self, tolerance_ft: float = 0.0) -> tuple:
+        """
+        Hashable key identifying this input. Inputs whose dimensions round to
+        the same tolerance_ft grid point share a key.
+        """
+        site = self.quantized(tolerance_ft)
+        return tuple(
+            value.value if isinstance(value, Enum) else value
+            for value in (getattr(site, f.name) for f in fields(site))
+        )
 
-@dataclass
+
+# Length fields snapped by SiteInput.quantized()
+QUANTIZED_FIELDS = ("width_ft", "depth_ft", "height_ft", "railing_lf")
+
+# Fields the engine divides by or sizes from; SiteInput.from_dict rejects <= 0, inf and NaN
+POSITIVE_FIELDS = ("width_ft", "depth_ft", "height_ft", "soil_bearing_psf")
+
+# Project info that feeds no design or pricing stage
+PROJECT_FIELDS = ("customer_name", "site_address")
+
+
+def _quantize(value: float, step: float) -> float:
+    """Snap to the nearest multiple of step, dropping binary noise (0.1 * 3 -> 0.3)"""
+    return round(round(value / step) * step, 9)
+
+
+@dataclass(slots=True)
 class Footing:
     """Concrete pier footing"""
     x_ft: float
@@ -89,16 +167,20 @@ class Footing:
     depth_in: int
 
 
-@dataclass  
+@dataclass(slots=True)
 class Post:
     """Vertical support post"""
     x_ft: float
     y_ft: float
     height_ft: float
     lumber: LumberSpec
+    
+    @property
+    def lumber_lf(self) -> float:
+        return self.height_ft
 
 
-@dataclass
+@dataclass(slots=True)
 class Beam:
     """Horizontal beam supporting joists"""
     x_start_ft: float
@@ -107,9 +189,14 @@ class Beam:
     z_ft: float           # Bottom of beam elevation
     lumber: LumberSpec
     ply: int = 2          # 1 for solid, 2 for doubled
+    
+    @property
+    def lumber_lf(self) -> float:
+        """Linear feet of lumber, counting every ply"""
+        return (self.x_end_ft - self.x_start_ft) * self.ply
 
 
-@dataclass
+@dataclass(slots=True)
 class Joist:
     """Floor joist"""
     x_ft: float
@@ -117,6 +204,183 @@ class Joist:
     y_end_ft: float
     z_ft: float           # Bottom of joist elevation
     lumber: LumberSpec
+    
+    @property
+    def lumber_lf(self) -> float:
+        return self.y_end_ft - self.y_start_ft
+
+
+@dataclass(frozen=True, slots=True)
+class FramingLayout:
+    """
+    Closed-form member layout chosen by the code engine.
+    Every footing, post, beam and joist position follows from these values.
+    """
+    width_ft: float
+    depth_ft: float
+    beam_y_positions: tuple[float, ...]
+    posts_per_beam: int
+    beam_span_ft: float          # Post spacing along each beam
+    post_height_ft: float
+    beam_z_ft: float             # Bottom of beam elevation
+    joist_z_ft: float            # Bottom of joist elevation
+    joist_count: int
+    joist_start_x_ft: float
+    joist_spacing_ft: float
+    footing_diameter_in: int
+    footing_depth_in: int
+    joist_lumber: LumberSpec
+    beam_lumber: LumberSpec
+    beam_ply: int
+    post_lumber: LumberSpec
+    footing_diameters_in: Optional[tuple[int, ...]] = None   # Per footing (tributary sizing)
+    
+    def post_x(self, i: int) -> float:
+        return -(self.width_ft / 2) + (i * self.beam_span_ft)
+    
+    def joist_x(self, i: int) -> float:
+        return self.joist_start_x_ft + (i * self.joist_spacing_ft)
+    
+    # Member i of each kind, in the order of the lists below (footings and
+    # posts run along each beam line in turn)
+    def footing(self, i: int) -> Footing:
+        beam_y = self.beam_y_positions[i // self.posts_per_beam]
+        diameters = self.footing_diameters_in
+        return Footing(x_ft=self.post_x(i % self.posts_per_beam), y_ft=beam_y,
+                       diameter_in=self.footing_diameter_in if diameters is None else diameters[i],
+                       depth_in=self.footing_depth_in)
+    
+    def post(self, i: int) -> Post:
+        beam_y = self.beam_y_positions[i // self.posts_per_beam]
+        return Post(x_ft=self.post_x(i % self.posts_per_beam), y_ft=beam_y,
+                    height_ft=self.post_height_ft, lumber=self.post_lumber)
+    
+    def beam(self, i: int) -> Beam:
+        return Beam(x_start_ft=-self.width_ft / 2, x_end_ft=self.width_ft / 2, y_ft=self.beam_y_positions[i],
+                    z_ft=self.beam_z_ft, lumber=self.beam_lumber, ply=self.beam_ply)
+    
+    def joist(self, i: int) -> Joist:
+        return Joist(x_ft=self.joist_x(i), y_start_ft=0, y_end_ft=self.depth_ft,
+                     z_ft=self.joist_z_ft, lumber=self.joist_lumber)
+    
+    def footings(self) -> list[Footing]:
+        return [self.footing(i) for i in range(self.support_count)]
+    
+    def posts(self) -> list[Post]:
+        return [self.post(i) for i in range(self.support_count)]
+    
+    def beams(self) -> list[Beam]:
+        return [self.beam(i) for i in range(len(self.beam_y_positions))]
+    
+    def joists(self) -> list[Joist]:
+        return [self.joist(i) for i in range(self.joist_count)]
+    
+    # Closed-form counts and totals (no members needed)
+    @property
+    def support_count(self) -> int:
+        """Posts (and footings) across all beam lines"""
+        return len(self.beam_y_positions) * self.posts_per_beam
+    
+    @property
+    def post_lf(self) -> float:
+        return self.support_count * self.post_height_ft
+    
+    @property
+    def beam_lf(self) -> float:
+        return len(self.beam_y_positions) * self.width_ft * self.beam_ply
+    
+    @property
+    def joist_lf(self) -> float:
+        return self.joist_count * self.depth_ft
+
+
+class LazyMembers(Sequence):
+    """
+    Member sequence that is only built when iterated or indexed.
+    len() and total_lf() answer from closed-form values until then.
+    
+    With an item(i) constructor, single members and stream() are served
+    without building the list, so drawing a very large deck never holds
+    every member at once.
+    """
+    __slots__ = ("_factory", "_count", "_lf", "_item", "_members")
+    
+    def __init__(
+        self,
+        factory: Callable[[], Sequence],
+        count: int,
+        lf: float,
+        item: Optional[Callable[[int], Any]] = None
+    ):
+        self._factory = factory
+        self._count = count
+        self._lf = lf
+        self._item = item
+        self._members: Optional[Sequence] = None
+    
+    @property
+    def materialized(self) -> bool:
+        return self._members is not None
+    
+    def materialize(self) -> Sequence:
+        if self._members is None:
+            self._members = self._factory()
+        return self._members
+    
+    def stream(self) -> Iterator:
+        """Iterate members one at a time without materializing them"""
+        if self._members is not None or self._item is None:
+            return iter(self.materialize())
+        return map(self._item, range(self._count))
+    
+    def total_lf(self) -> float:
+        if self._members is None:
+            return self._lf
+        return _total_lf(self._members)
+    
+    def __len__(self) -> int:
+        return self._count if self._members is None else len(self._members)
+    
+    def __getitem__(self, index):
+        if self._members is None and self._item is not None and isinstance(index, int):
+            if index < 0:
+                index += self._count
+            if not 0 <= index < self._count:
+                raise IndexError("member index out of range")
+            return self._item(index)
+        return self.materialize()[index]
+    
+    def __iter__(self) -> Iterator:
+        return iter(self.materialize())
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(iter_members(self), iter_members(other)))
+    
+    def __repr__(self) -> str:
+        state = "materialized" if self.materialized else "lazy"
+        return f"LazyMembers(<{len(self)} members, {state}>)"
+
+
+def iter_members(members: Sequence) -> Iterator:
+    """
+    Iterate a member store, streaming lazy members instead of building them.
+    Consumers that make one pass (drawing, takeoffs) should use this rather
+    than plain iteration.
+    """
+    stream = getattr(members, "stream", None)
+    if stream is not None:
+        return stream()
+    return iter(members)
+
+
+def _total_lf(members: Sequence) -> float:
+    """Sum of lumber_lf, using the store's own fast path when it has one"""
+    total_lf = getattr(members, "total_lf", None)
+    if total_lf is not None:
+        return total_lf()
+    return sum(m.lumber_lf for m in members)
 
 
 @dataclass
@@ -124,13 +388,14 @@ class DeckStructure:
     """Output of code engine - complete structural model"""
     input: SiteInput
     
-    # Structural members
-    footings: list[Footing] = field(default_factory=list)
-    posts: list[Post] = field(default_factory=list)
-    beams: list[Beam] = field(default_factory=list)
-    joists: list[Joist] = field(default_factory=list)
+    # Structural members (lists, LazyMembers, or array-backed stores from domain.members)
+    footings: Sequence[Footing] = field(default_factory=list)
+    posts: Sequence[Post] = field(default_factory=list)
+    beams: Sequence[Beam] = field(default_factory=list)
+    joists: Sequence[Joist] = field(default_factory=list)
     ledger: Optional[dict] = None
     rim_joists: list[dict] = field(default_factory=list)
+    layout: Optional[FramingLayout] = None
     
     # Selected sizes (for easy reference)
     joist_size: str = ""
@@ -144,3 +409,18 @@ class DeckStructure:
     compliant: bool = True
     notes: list[str] = field(default_factory=list)
     errors: list[str] = field(default_factory=list)
+    
+    # Code tables version the design was checked against
+    code_tables_version: str = ""
+    
+    @property
+    def post_lf(self) -> float:
+        return _total_lf(self.posts)
+    
+    @property
+    def beam_lf(self) -> float:
+        return _total_lf(self.beams)
+    
+    @property
+    def joist_lf(self) -> float:
+        return _total_lf(self.joists)
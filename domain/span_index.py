@@ -0,0 +1,149 @@
+"""
+Compiled span-table index
+
+Turns the Tip 312 span tables into sorted per-spacing / per-category
+ladders so size selection is a bisect instead of a scan over candidate sizes.
+Every ladder also answers whole arrays of spans at once via NumPy.
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Optional
+
+from .models import LUMBER_SPECS
+
+
+def _lumber_order(nominal: str) -> tuple[float, float, str]:
+    """Sort key: smallest (shallowest, then narrowest) member first"""
+    spec = LUMBER_SPECS[nominal]
+    return (spec.height_in, spec.width_in, nominal)
+
+
+def parse_beam_config(config: str) -> tuple[str, int]:
+    """Split a beam config into (lumber_size, ply): "2-2x10" -> ("2x10", 2), "4x10" -> ("4x10", 1)"""
+    if "-" in config:
+        ply, size = config.split("-", 1)
+        return size, int(ply)
+    return config, 1
+
+
+def beam_config_name(size: str, ply: int) -> str:
+    """Inverse of parse_beam_config, e.g. ("2x10", 2) -> "2-2x10" and ("4x10", 1) -> "4x10" """
+    return f"{ply}-{size}" if ply > 1 else size
+
+
+@dataclass(frozen=True)
+class SizeLadder:
+    """
+    Candidate sizes in preference order with strictly increasing capacity.
+
+    A size is only kept if it carries more than every size preferred before it,
+    so the first size that fits a demand is simply bisect_left on capacities.
+    """
+    sizes: tuple[str, ...]
+    capacities: tuple[float, ...]
+
+    @classmethod
+    def build(cls, candidates: list[tuple[str, float]]) -> "SizeLadder":
+        """Build from (size, capacity) pairs already in preference order"""
+        sizes, capacities = [], []
+        for size, capacity in candidates:
+            if not capacities or capacity > capacities[-1]:
+                sizes.append(size)
+                capacities.append(capacity)
+        return cls(tuple(sizes), tuple(capacities))
+
+    @property
+    def max_capacity(self) -> float:
+        return self.capacities[-1] if self.capacities else 0
+
+    def select(self, demand: float) -> Optional[str]:
+        """Smallest preferred size with capacity >= demand, or None"""
+        idx = bisect_left(self.capacities, demand)
+        return self.sizes[idx] if idx < len(self.sizes) else None
+
+    def select_index(self, demand):
+        """Array form of select(): ladder index per demand, -1 where nothing fits"""
+        import numpy as np
+
+        idx = np.searchsorted(np.asarray(self.capacities, dtype=float), demand, side="left")
+        return np.where(idx < len(self.sizes), idx, -1)
+
+    def select_array(self, demand, missing: str = ""):
+        """Array form of select(): size name per demand, `missing` where nothing fits"""
+        import numpy as np
+
+        idx = self.select_index(demand)
+        sizes = np.array(self.sizes + (missing,))
+        return sizes[idx]
+
+
+@dataclass(frozen=True)
+class SpanIndex:
+    """Bisectable view of the joist span, beam span and post height tables"""
+    joist_ladders: dict[int, SizeLadder]               # spacing_in -> ladder
+    beam_ladders: dict[tuple[int, str], SizeLadder]    # (ply, joist_span_category) -> ladder
+    beam_plies: tuple[int, ...]                        # ply families, preferred first
+    category_keys: tuple[str, ...]                     # joist span categories, ascending
+    category_limits: tuple[float, ...]
+    post_ladder: SizeLadder
+
+    def joist_span_category(self, joist_span_ft: float) -> str:
+        """Round joist span up to the nearest category (largest category if above all)"""
+        idx = bisect_left(self.category_limits, joist_span_ft)
+        return self.category_keys[min(idx, len(self.category_keys) - 1)]
+
+    def joist_span_category_array(self, joist_span_ft):
+        """Array form of joist_span_category()"""
+        import numpy as np
+
+        idx = np.searchsorted(np.asarray(self.category_limits), joist_span_ft, side="left")
+        return np.array(self.category_keys)[np.minimum(idx, len(self.category_keys) - 1)]
+
+    def beam_ladder(self, ply: int, category: str) -> SizeLadder:
+        return self.beam_ladders.get((ply, category), SizeLadder((), ()))
+
+    def joist_ladder(self, spacing_in: int) -> SizeLadder:
+        return self.joist_ladders.get(spacing_in, SizeLadder((), ()))
+
+
+def compile_span_index(
+    joist_spans: dict[tuple[str, int], float],
+    beam_spans: dict[tuple[str, str], float],
+    post_height_limits: dict[str, float],
+) -> SpanIndex:
+    """Compile the span tables into a SpanIndex"""
+    # Joists: one ladder per spacing
+    by_spacing: dict[int, list[tuple[str, float]]] = {}
+    for (size, spacing), max_span in joist_spans.items():
+        by_spacing.setdefault(spacing, []).append((size, max_span))
+    joist_ladders = {
+        spacing: SizeLadder.build(sorted(entries, key=lambda e: _lumber_order(e[0])))
+        for spacing, entries in by_spacing.items()
+    }
+
+    # Beams: one ladder per (ply family, joist span category)
+    by_family: dict[tuple[int, str], list[tuple[str, float]]] = {}
+    for (config, category), max_span in beam_spans.items():
+        size, ply = parse_beam_config(config)
+        by_family.setdefault((ply, category), []).append((size, max_span))
+    beam_ladders = {
+        key: SizeLadder.build(sorted(entries, key=lambda e: _lumber_order(e[0])))
+        for key, entries in by_family.items()
+    }
+    beam_plies = tuple(sorted({ply for ply, _ in beam_ladders}, reverse=True))
+
+    categories = sorted({category for _, category in beam_spans}, key=float)
+
+    post_ladder = SizeLadder.build(
+        sorted(post_height_limits.items(), key=lambda e: _lumber_order(e[0]))
+    )
+
+    return SpanIndex(
+        joist_ladders=joist_ladders,
+        beam_ladders=beam_ladders,
+        beam_plies=beam_plies,
+        category_keys=tuple(categories),
+        category_limits=tuple(float(c) for c in categories),
+        post_ladder=post_ladder,
+    )
@@ -0,0 +1,300 @@
+"""
+Plan-view spatial index over structural members
+
+Answers "what is at or near (x, y)" for a DeckStructure: field-change
+lookups, clash checks against obstacles (windows, downspouts, utilities) and
+finding clear space for labels. Each member is indexed by its plan footprint
+(an axis-aligned box: joist/beam/ledger/rim width across, post section,
+footing diameter) in a uniform grid of square cells, so a query only visits
+the cells it covers instead of every member.
+
+    index = SpatialIndex(structure)
+    index.nearest(3.2, 5.0)                   # (MemberRef("joist", 12), 0.05)
+    index.in_box((-2, 4, 2, 6), kinds={"post", "footing"})
+    index.crossing((0, -1), (6, 13))          # members a pipe run passes over
+    index.in_boxes(obstacles)                 # one result list per obstacle
+
+Coordinates are the engine's (feet, origin at the ledger center). Built once
+per structure; rebuild it if the structure changes.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Collection, Iterable, Optional
+
+from .models import DeckStructure, iter_members
+
+
+# (x_min, y_min, x_max, y_max) in feet
+Box = tuple[float, float, float, float]
+
+MEMBER_KINDS = ("joist", "beam", "post", "footing", "ledger", "rim")
+
+MIN_CELL_FT = 0.5
+
+
+@dataclass(frozen=True, slots=True)
+class MemberRef:
+    """One indexed member: its kind and position in the structure's store"""
+    kind: str      # One of MEMBER_KINDS
+    index: int     # Into structure.joists / beams / posts / footings / rim_joists (0 for the ledger)
+
+
+def member_footprints(structure: DeckStructure) -> Iterable[tuple[MemberRef, Box]]:
+    """Plan footprint of every member (lazy members are streamed, not built)"""
+    for i, joist in enumerate(iter_members(structure.joists)):
+        half = joist.lumber.width_ft / 2
+        yield MemberRef("joist", i), (joist.x_ft - half, joist.y_start_ft, joist.x_ft + half, joist.y_end_ft)
+    for i, beam in enumerate(iter_members(structure.beams)):
+        half = beam.lumber.width_ft * beam.ply / 2
+        yield MemberRef("beam", i), (beam.x_start_ft, beam.y_ft - half, beam.x_end_ft, beam.y_ft + half)
+    for i, post in enumerate(iter_members(structure.posts)):
+        half = post.lumber.width_ft / 2
+        yield MemberRef("post", i), (post.x_ft - half, post.y_ft - half, post.x_ft + half, post.y_ft + half)
+    for i, footing in enumerate(iter_members(structure.footings)):
+        radius = footing.diameter_in / 24
+        yield MemberRef("footing", i), (footing.x_ft - radius, footing.y_ft - radius,
+                                        footing.x_ft + radius, footing.y_ft + radius)
+    if structure.ledger:
+        yield MemberRef("ledger", 0), _board_footprint(structure.ledger)
+    for i, rim in enumerate(structure.rim_joists):
+        yield MemberRef("rim", i), _board_footprint(rim)
+
+
+def _board_footprint(board: dict) -> Box:
+    """Ledger / rim joist dicts run along x (x_start_ft..) or along y (y_start_ft..)"""
+    half = board["lumber"].width_ft / 2
+    if "x_start_ft" in board:
+        return (board["x_start_ft"], board["y_ft"] - half, board["x_end_ft"], board["y_ft"] + half)
+    return (board["x_ft"] - half, board["y_start_ft"], board["x_ft"] + half, board["y_end_ft"])
+
+
+def box_distance(box: Box, x: float, y: float) -> float:
+    """Distance from (x, y) to the nearest point of box (0 inside)"""
+    dx = max(box[0] - x, 0.0, x - box[2])
+    dy = max(box[1] - y, 0.0, y - box[3])
+    return math.hypot(dx, dy)
+
+
+def segment_hits_box(x1: float, y1: float, x2: float, y2: float, box: Box) -> bool:
+    """Liang-Barsky clip: does the segment touch the box?"""
+    t0, t1 = 0.0, 1.0
+    dx, dy = x2 - x1, y2 - y1
+    for p, q in ((-dx, x1 - box[0]), (dx, box[2] - x1), (-dy, y1 - box[1]), (dy, box[3] - y1)):
+        if p == 0:
+            if q < 0:
+                return False
+        else:
+            t = q / p
+            if p < 0:
+                t0 = max(t0, t)
+            else:
+                t1 = min(t1, t)
+            if t0 > t1:
+                return False
+    return True
+
+
+class SpatialIndex:
+    """
+    Uniform-grid index of member footprints.
+
+    cell_ft defaults to the joist spacing, so a cell holds about one joist;
+    long members (beams, ledger, rims) are entered in every cell they cross.
+    Query kinds= restricts results to a subset of MEMBER_KINDS.
+    """
+
+    def __init__(self, structure: DeckStructure, cell_ft: Optional[float] = None):
+        self.structure = structure
+        self.cell_ft = max(cell_ft or structure.joist_spacing_in / 12, MIN_CELL_FT)
+        self.refs: list[MemberRef] = []
+        self.boxes: list[Box] = []
+        self._cells: dict[tuple[int, int], list[int]] = {}
+        self._bounds = (0, 0, -1, -1)   # Occupied cell range (i_min, j_min, i_max, j_max)
+
+        cells = self._cells
+        i_lo = j_lo = math.inf
+        i_hi = j_hi = -math.inf
+        for ref, box in member_footprints(structure):
+            entry = len(self.refs)
+            self.refs.append(ref)
+            self.boxes.append(box)
+            i0, j0, i1, j1 = self._cell_range(box)
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    cells.setdefault((i, j), []).append(entry)
+            i_lo, j_lo, i_hi, j_hi = min(i_lo, i0), min(j_lo, j0), max(i_hi, i1), max(j_hi, j1)
+        if self.refs:
+            self._bounds = (i_lo, j_lo, i_hi, j_hi)
+
+    def __len__(self) -> int:
+        return len(self.refs)
+
+    def member(self, ref: MemberRef) -> Any:
+        """The member a ref points to (a dict for the ledger and rim joists)"""
+        if ref.kind == "ledger":
+            return self.structure.ledger
+        if ref.kind == "rim":
+            return self.structure.rim_joists[ref.index]
+        return getattr(self.structure, ref.kind + "s")[ref.index]
+
+    # ===== QUERIES =====
+
+    def in_box(self, box: Box, kinds: Optional[Collection[str]] = None) -> list[MemberRef]:
+        """Members whose footprint overlaps box (touching counts)"""
+        x0, y0, x1, y1 = box
+        boxes = self.boxes
+        found = []
+        for entry in self._candidates(self._box_cells(box)):
+            b = boxes[entry]
+            if b[0] <= x1 and x0 <= b[2] and b[1] <= y1 and y0 <= b[3]:
+                found.append(entry)
+        return self._refs(found, kinds)
+
+    def in_boxes(self, boxes: Iterable[Box], kinds: Optional[Collection[str]] = None) -> list[list[MemberRef]]:
+        """in_box() for many obstacles at once; one result list per box, in order"""
+        kinds = frozenset(kinds) if kinds is not None else None
+        return [self.in_box(box, kinds) for box in boxes]
+
+    def crossing(
+        self,
+        start: tuple[float, float],
+        end: tuple[float, float],
+        kinds: Optional[Collection[str]] = None
+    ) -> list[MemberRef]:
+        """Members whose footprint the segment start-end passes over, nearest start first"""
+        x1, y1 = start
+        x2, y2 = end
+        boxes = self.boxes
+        hits = [
+            entry for entry in self._candidates(self._segment_cells(x1, y1, x2, y2))
+            if segment_hits_box(x1, y1, x2, y2, boxes[entry])
+        ]
+        hits.sort(key=lambda entry: box_distance(boxes[entry], x1, y1))
+        return self._refs(hits, kinds)
+
+    def crossings(
+        self,
+        segments: Iterable[tuple[tuple[float, float], tuple[float, float]]],
+        kinds: Optional[Collection[str]] = None
+    ) -> list[list[MemberRef]]:
+        """crossing() for many segments; one result list per segment, in order"""
+        kinds = frozenset(kinds) if kinds is not None else None
+        return [self.crossing(start, end, kinds) for start, end in segments]
+
+    def nearest(
+        self,
+        x: float,
+        y: float,
+        kinds: Optional[Collection[str]] = None,
+        max_distance: float = math.inf
+    ) -> Optional[tuple[MemberRef, float]]:
+        """
+        Closest member to (x, y) and its footprint distance (0 if the point is
+        on it), or None if nothing is within max_distance.
+        """
+        if not self.refs:
+            return None
+        kinds = frozenset(kinds) if kinds is not None else None
+        refs, boxes, cells = self.refs, self.boxes, self._cells
+        i_min, j_min, i_max, j_max = self._bounds
+        ci, cj = self._cell(x), self._cell(y)
+
+        best, best_d = None, max_distance
+        seen = set()
+        # Cells in ring r are at least (r - 1) * cell_ft away; start at the first ring touching the grid
+        r = max(i_min - ci, ci - i_max, j_min - cj, cj - j_max, 0)
+        r_last = max(ci - i_min, i_max - ci, cj - j_min, j_max - cj)
+        while r <= r_last and (r - 1) * self.cell_ft <= best_d:
+            for cell in self._ring(ci, cj, r):
+                for entry in cells.get(cell, ()):
+                    if entry in seen:
+                        continue
+                    seen.add(entry)
+                    if kinds is not None and refs[entry].kind not in kinds:
+                        continue
+                    d = box_distance(boxes[entry], x, y)
+                    if d < best_d or (d == best_d and (best is None or entry < best)):
+                        best, best_d = entry, d  # Ties go to the first-built member
+            r += 1
+        return (refs[best], best_d) if best is not None else None
+
+    def nearest_many(
+        self,
+        points: Iterable[tuple[float, float]],
+        kinds: Optional[Collection[str]] = None,
+        max_distance: float = math.inf
+    ) -> list[Optional[tuple[MemberRef, float]]]:
+        """nearest() for many points; one result per point, in order"""
+        kinds = frozenset(kinds) if kinds is not None else None
+        return [self.nearest(x, y, kinds, max_distance) for x, y in points]
+
+    def is_clear(self, box: Box, kinds: Optional[Collection[str]] = None) -> bool:
+        """True if no member footprint overlaps box (e.g. a candidate label position)"""
+        return not self.in_box(box, kinds)
+
+    # ===== GRID =====
+
+    def _cell(self, v: float) -> int:
+        return math.floor(v / self.cell_ft)
+
+    def _cell_range(self, box: Box) -> tuple[int, int, int, int]:
+        return self._cell(box[0]), self._cell(box[1]), self._cell(box[2]), self._cell(box[3])
+
+    def _candidates(self, cell_keys: Iterable[tuple[int, int]]) -> list[int]:
+        """Distinct entries in the given cells, in build order"""
+        cells = self._cells
+        found = set()
+        for key in cell_keys:
+            found.update(cells.get(key, ()))
+        return sorted(found)
+
+    def _box_cells(self, box: Box) -> Iterable[tuple[int, int]]:
+        """Cells the box covers, clipped to the grid"""
+        i_min, j_min, i_max, j_max = self._bounds
+        i0, j0, i1, j1 = self._cell_range(box)
+        for i in range(max(i0, i_min), min(i1, i_max) + 1):
+            for j in range(max(j0, j_min), min(j1, j_max) + 1):
+                yield i, j
+
+    def _segment_cells(self, x1: float, y1: float, x2: float, y2: float) -> Iterable[tuple[int, int]]:
+        """Every cell the segment passes through, column by column, clipped to the grid"""
+        i_min, j_min, i_max, j_max = self._bounds
+        if x1 > x2:
+            x1, y1, x2, y2 = x2, y2, x1, y1
+        cell = self.cell_ft
+        slope = (y2 - y1) / (x2 - x1) if x2 != x1 else 0.0
+        for i in range(max(self._cell(x1), i_min), min(self._cell(x2), i_max) + 1):
+            # The segment's y extent within this column
+            xa = max(x1, i * cell)
+            xb = min(x2, (i + 1) * cell)
+            ya = y1 + (xa - x1) * slope
+            yb = y1 + (xb - x1) * slope
+            if x2 == x1:
+                ya, yb = y1, y2
+            j0, j1 = sorted((self._cell(ya), self._cell(yb)))
+            for j in range(max(j0, j_min), min(j1, j_max) + 1):
+                yield i, j
+
+    def _ring(self, ci: int, cj: int, r: int) -> Iterable[tuple[int, int]]:
+        """Cells at Chebyshev distance r from (ci, cj), clipped to the grid"""
+        i_min, j_min, i_max, j_max = self._bounds
+        if r == 0:
+            yield ci, cj
+            return
+        i_lo, i_hi = max(ci - r, i_min), min(ci + r, i_max)
+        for j in (cj - r, cj + r):
+            if j_min <= j <= j_max:
+                for i in range(i_lo, i_hi + 1):
+                    yield i, j
+        j_lo, j_hi = max(cj - r + 1, j_min), min(cj + r - 1, j_max)
+        for i in (ci - r, ci + r):
+            if i_min <= i <= i_max:
+                for j in range(j_lo, j_hi + 1):
+                    yield i, j
+
+    def _refs(self, entries: list[int], kinds: Optional[Collection[str]]) -> list[MemberRef]:
+        refs = self.refs
+        if kinds is None:
+            return [refs[entry] for entry in entries]
+        return [refs[entry] for entry in entries if refs[entry].kind in kinds]
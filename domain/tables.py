@@ -0,0 +1,224 @@
+"""
+Versioned data tables with atomic hot reload
+
+The Tip 312 span tables and the price book live in JSON data files, not in
+module dicts. Each file is compiled into an immutable snapshot: read-only
+mappings plus any derived lookups such as the SpanIndex. A TableSource holds
+the current snapshot and replaces it with a single reference assignment when
+the file changes, so long-running workers pick up a new file without a restart.
+
+Callers take current() once when an operation starts and use that snapshot
+until it finishes. An in-flight design or quote therefore never mixes two
+versions, even if a reload lands halfway through it.
+
+Replace data files atomically (write a temp file, then os.replace) so a reload
+never sees a half-written file. A file that fails to parse or validate is
+rejected and the previous snapshot stays current.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Generic, Mapping, TypeVar
+
+from .models import LUMBER_SPECS
+from .span_index import SpanIndex, compile_span_index, parse_beam_config
+
+
+T = TypeVar("T")
+
+# How often current() checks the data file for changes
+DEFAULT_CHECK_INTERVAL_S = 5.0
+
+CODE_TABLES_PATH = Path(
+    os.environ.get("KOLMO_CODE_TABLES", Path(__file__).parent / "data" / "code_tables.json")
+)
+
+
+class FrozenDict(dict):
+    """Read-only dict (picklable, so snapshots can be sent to worker processes)"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
+class TableSource(Generic[T]):
+    """
+    Current snapshot of one data file.
+
+    The file is loaded on first use. After that, current() checks its
+    modification time at most every check_interval seconds and reloads it when
+    it has changed (None turns this off; call reload() instead).
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        compile: Callable[[Mapping], T],
+        check_interval: float | None = DEFAULT_CHECK_INTERVAL_S
+    ):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.last_error: Exception | None = None   # Why the last automatic reload was rejected
+        self._compile = compile
+        self._snapshot: T | None = None
+        self._stamp: tuple[int, int] | None = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def current(self) -> T:
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._load(self.path)
+                return self._snapshot
+        if self.check_interval is not None and time.monotonic() >= self._next_check:
+            self._check()
+            return self._snapshot
+        return snapshot
+
+    def reload(self, path: str | Path | None = None) -> T:
+        """
+        Load the file now (or switch to another file) and make it current.
+        Raises ValueError if it does not parse or validate; the previous
+        snapshot stays current in that case.
+        """
+        with self._lock:
+            self._load(Path(path) if path is not None else self.path)
+            return self._snapshot
+
+    def reload_if_changed(self) -> bool:
+        """Reload if the file changed since it was loaded; True if a new snapshot was installed"""
+        with self._lock:
+            if self._snapshot is not None and _file_stamp(self.path) == self._stamp:
+                return False
+            self._load(self.path)
+            return True
+
+    def _check(self):
+        # Readers never wait: if another thread is already checking, skip it
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = time.monotonic() + self.check_interval
+            if _file_stamp(self.path) != self._stamp:
+                self._load(self.path)
+            self.last_error = None
+        except (OSError, ValueError) as e:
+            self.last_error = e  # Keep serving the last good snapshot
+        finally:
+            self._lock.release()
+
+    def _load(self, path: Path):
+        """Parse, compile and install (callers hold the lock)"""
+        stamp = _file_stamp(path)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            snapshot = self._compile(data)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid table file {path}: {e}") from e
+        self.path = path
+        self._stamp = stamp
+        self._snapshot = snapshot
+        if self.check_interval is not None:
+            self._next_check = time.monotonic() + self.check_interval
+
+
+def _file_stamp(path: Path) -> tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def require_version(data: Mapping) -> str:
+    version = data["version"]
+    if not isinstance(version, str) or not version:
+        raise ValueError("version must be a non-empty string")
+    return version
+
+
+def positive_numbers(table: Mapping, name: str) -> FrozenDict:
+    """Validate a flat name -> number table and freeze it"""
+    if not isinstance(table, Mapping):
+        raise ValueError(f"{name} must be an object")
+    for key, value in table.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            raise ValueError(f"{name}[{key!r}] must be a non-negative number, got {value!r}")
+    return FrozenDict(table)
+
+
+# ===== CODE TABLES =====
+
+@dataclass(frozen=True)
+class CodeTables:
+    """One version of the Tip 312 span tables and their compiled index"""
+    version: str
+    joist_spans: Mapping[tuple[str, int], float]      # (nominal_size, spacing_in) -> max_span_ft
+    beam_spans: Mapping[tuple[str, str], float]       # (beam_config, joist_span_category) -> max_beam_span_ft
+    post_height_limits: Mapping[str, float]           # nominal_size -> max_height_ft
+    span_index: SpanIndex
+
+
+def _check_lumber(size: str, table: str):
+    if size not in LUMBER_SPECS:
+        raise ValueError(f"{table} names unknown lumber size {size!r}")
+
+
+def compile_code_tables(data: Mapping) -> CodeTables:
+    """
+    Compile a code tables document:
+
+        {"version": "...",
+         "joist_spans": {"2x8": {"16": 12.5, ...}, ...},        size -> spacing_in -> ft
+         "beam_spans": {"2-2x8": {"6": 7.0, ...}, ...},         config -> category -> ft
+         "post_height_limits": {"4x4": 8.0, ...}}
+    """
+    version = require_version(data)
+
+    joist_spans = {}
+    for size, by_spacing in data["joist_spans"].items():
+        _check_lumber(size, "joist_spans")
+        for spacing, max_span in positive_numbers(by_spacing, f"joist_spans[{size!r}]").items():
+            joist_spans[(size, int(spacing))] = float(max_span)
+
+    beam_spans = {}
+    categories = set()
+    for config, by_category in data["beam_spans"].items():
+        _check_lumber(parse_beam_config(config)[0], "beam_spans")
+        for category, max_span in positive_numbers(by_category, f"beam_spans[{config!r}]").items():
+            float(category)  # Categories must be numeric
+            beam_spans[(config, category)] = float(max_span)
+            categories.add(category)
+
+    post_height_limits = positive_numbers(data["post_height_limits"], "post_height_limits")
+    for size in post_height_limits:
+        _check_lumber(size, "post_height_limits")
+
+    if not joist_spans or not beam_spans or not post_height_limits:
+        raise ValueError("joist_spans, beam_spans and post_height_limits must not be empty")
+
+    return CodeTables(
+        version=version,
+        joist_spans=FrozenDict(joist_spans),
+        beam_spans=FrozenDict(beam_spans),
+        post_height_limits=FrozenDict({k: float(v) for k, v in post_height_limits.items()}),
+        span_index=compile_span_index(joist_spans, beam_spans, post_height_limits),
+    )
+
+
+CODE_TABLES: TableSource[CodeTables] = TableSource(CODE_TABLES_PATH, compile_code_tables)
+
+
+def code_tables() -> CodeTables:
+    """Current code tables snapshot"""
+    return CODE_TABLES.current()
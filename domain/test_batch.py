@@ -0,0 +1,67 @@
+"""generate_structures_batch() agrees with generate_structure() row by row"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from domain.batch import generate_structures_batch
+from domain.code_engine import generate_structure
+from domain.models import LedgerAttachment, SiteInput
+
+
+WIDTHS = (4, 8, 12.5, 16, 23.75, 30, 44, 60)
+DEPTHS = (4, 6, 8.5, 12, 14, 16, 20, 26)   # 26' exceeds every joist span
+HEIGHTS = (1, 3, 6, 9.5, 12)
+
+
+def _rows(ledger: LedgerAttachment, soil: int = 1500):
+    sites = [
+        SiteInput(width_ft=w, depth_ft=d, height_ft=h, ledger_attachment=ledger, soil_bearing_psf=soil)
+        for w, d, h in itertools.product(WIDTHS, DEPTHS, HEIGHTS)
+    ]
+    batch = generate_structures_batch(
+        [s.width_ft for s in sites], [s.depth_ft for s in sites], [s.height_ft for s in sites],
+        ledger_attachment=ledger, soil_bearing_psf=soil,
+    )
+    return sites, batch
+
+
+@pytest.mark.parametrize("ledger", list(LedgerAttachment))
+@pytest.mark.parametrize("soil", [1000, 1500, 3000])
+def test_rows_match_scalar_engine(ledger, soil):
+    sites, batch = _rows(ledger, soil)
+    assert len(batch) == len(sites)
+    for i, site in enumerate(sites):
+        s = generate_structure(site, lazy=True)
+        row = (
+            bool(batch.compliant[i]), batch.joist_size[i], batch.beam_size[i], int(batch.beam_ply[i]),
+            batch.post_size[i], int(batch.footing_diameter_in[i]), int(batch.footing_count[i]),
+            int(batch.post_count[i]), int(batch.joist_count[i]), bool(batch.has_ledger[i]),
+        )
+        expected = (
+            s.compliant, s.joist_size, s.beam_size, s.beam_ply, s.post_size, s.footing_diameter_in,
+            len(s.footings), len(s.posts), len(s.joists), bool(s.ledger),
+        )
+        assert row == expected, site
+
+
+def test_includes_failing_rows():
+    sites, batch = _rows(LedgerAttachment.DIRECT)
+    assert batch.compliant.any() and not batch.compliant.all()
+
+
+def test_scalar_arguments_broadcast():
+    batch = generate_structures_batch([16, 20], 12, 6, ledger_attachment="freestanding")
+    assert len(batch) == 2
+    assert np.all(batch.freestanding)
+    assert list(batch.depth_ft) == [12.0, 12.0]
+
+
+def test_fractional_soil_and_frost_are_kept():
+    site = SiteInput(width_ft=16, depth_ft=12, height_ft=6, soil_bearing_psf=1000.9, frost_depth_in=18.5)
+    batch = generate_structures_batch([16], 12, 6, soil_bearing_psf=1000.9, frost_depth_in=18.5)
+    s = generate_structure(site)
+    assert batch.soil_bearing_psf[0] == 1000.9
+    assert batch.frost_depth_in[0] == s.layout.footing_depth_in == 18.5
+    assert int(batch.footing_diameter_in[0]) == s.footing_diameter_in
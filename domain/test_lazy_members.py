@@ -0,0 +1,74 @@
+"""Lazy member mode (lazy=True) gives the same design as building every member"""
+
+import pytest
+
+from domain.code_engine import generate_structure
+from domain.models import LazyMembers, LedgerAttachment, SiteInput, iter_members
+from services.pricing import calculate_quote
+
+
+SITES = [
+    SiteInput(width_ft=16, depth_ft=12, height_ft=6),
+    SiteInput(width_ft=10, depth_ft=8, height_ft=2, ledger_attachment=LedgerAttachment.FREESTANDING),
+    SiteInput(width_ft=47.5, depth_ft=12, height_ft=10),
+    SiteInput(width_ft=130, depth_ft=14, height_ft=4, ledger_attachment=LedgerAttachment.FREESTANDING),
+]
+KINDS = ("footings", "posts", "beams", "joists")
+
+
+@pytest.fixture(params=SITES, ids=lambda s: f"{s.width_ft}x{s.depth_ft}")
+def site(request):
+    return request.param
+
+
+def test_summary_needs_no_members(site):
+    lazy = generate_structure(site, lazy=True)
+    eager = generate_structure(site)
+    for kind in KINDS:
+        assert len(getattr(lazy, kind)) == len(getattr(eager, kind))
+    assert lazy.post_lf == pytest.approx(eager.post_lf)
+    assert lazy.beam_lf == pytest.approx(eager.beam_lf)
+    assert lazy.joist_lf == pytest.approx(eager.joist_lf)
+    calculate_quote(lazy)
+    assert not any(getattr(lazy, kind).materialized for kind in KINDS)
+
+
+def test_layout_lengths_match_members(site):
+    eager = generate_structure(site)
+    layout = eager.layout
+    assert layout.post_lf == pytest.approx(sum(p.lumber_lf for p in eager.posts))
+    assert layout.beam_lf == pytest.approx(sum(b.lumber_lf for b in eager.beams))
+    assert layout.joist_lf == pytest.approx(sum(j.lumber_lf for j in eager.joists))
+
+
+@pytest.mark.parametrize("footing_sizing", ["uniform", "tributary"])
+def test_members_match_eager_and_compact(site, footing_sizing):
+    eager = generate_structure(site, footing_sizing=footing_sizing)
+    compact = generate_structure(site, compact=True, footing_sizing=footing_sizing)
+    lazy = generate_structure(site, lazy=True, footing_sizing=footing_sizing)
+    for kind in KINDS:
+        members = getattr(eager, kind)
+        store = getattr(lazy, kind)
+        assert isinstance(store, LazyMembers)
+        assert list(iter_members(store)) == members
+        assert [store[i] for i in range(-len(store), 0)] == members
+        assert not store.materialized
+        assert list(store) == members
+        assert list(getattr(compact, kind)) == members
+    assert lazy.ledger == eager.ledger
+    assert lazy.rim_joists == eager.rim_joists
+
+
+def test_quotes_match(site):
+    eager = calculate_quote(generate_structure(site))
+    for structure in (generate_structure(site, lazy=True), generate_structure(site, compact=True)):
+        quote = calculate_quote(structure)
+        assert [(li.category, li.quantity) for li in quote.line_items] == \
+            [(li.category, li.quantity) for li in eager.line_items]
+        assert quote.total == pytest.approx(eager.total, abs=1e-9)
+
+
+def test_index_out_of_range():
+    lazy = generate_structure(SITES[0], lazy=True)
+    with pytest.raises(IndexError):
+        lazy.joists[len(lazy.joists)]
@@ -0,0 +1,89 @@
+"""Tributary post loads balance the deck load and agree with the scalar engine"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from domain.code_engine import TOTAL_LOAD_PSF, _calculate_footing_diameter, generate_structure
+from domain.loads import analyze_post_loads, footing_diameters, grid_post_loads, joist_support_depths
+from domain.models import LedgerAttachment, SiteInput
+
+
+SITES = [
+    SiteInput(width_ft=w, depth_ft=d, height_ft=6, ledger_attachment=ledger, soil_bearing_psf=soil)
+    for (w, d), ledger, soil in zip(
+        itertools.product((8, 16, 23.5, 40), (6, 12, 16)),
+        itertools.cycle(LedgerAttachment),
+        itertools.cycle((1500, 2000, 3000)),
+    )
+]
+
+
+def _structures():
+    for site in SITES:
+        structure = generate_structure(site, footing_sizing="tributary")
+        if structure.compliant:
+            yield structure
+
+
+def _is_ledger(site):
+    return site.ledger_attachment != LedgerAttachment.FREESTANDING
+
+
+@pytest.mark.parametrize("depth", [6.0, 12.0, 15.5])
+@pytest.mark.parametrize("supports", [[4.0], [0.0, 10.0], [2.0, 5.0], [0.0, 3.0, 9.0], [1.0, 4.0, 7.0, 11.0]])
+def test_support_depths_sum_to_depth(supports, depth):
+    assert joist_support_depths(supports, depth).sum() == pytest.approx(depth)
+
+
+def test_two_supports_balance_moments():
+    depth, (a, b) = 12.0, (1.0, 9.0)
+    near, far = joist_support_depths([b, a], depth)[::-1]
+    assert near + far == pytest.approx(depth)
+    assert far * (b - a) == pytest.approx(depth * (depth / 2 - a))   # Moments about the first support
+
+
+def test_total_reaction_is_deck_load():
+    structures = list(_structures())
+    assert len(structures) > 5
+    for s in structures:
+        site = s.input
+        layout = s.layout
+        loads = grid_post_loads(
+            site.width_ft, site.depth_ft, layout.beam_y_positions, layout.posts_per_beam, layout.beam_span_ft,
+            ledger=_is_ledger(site), soil_bearing_psf=site.soil_bearing_psf,
+        )
+        deck_load = site.width_ft * site.depth_ft * TOTAL_LOAD_PSF
+        if _is_ledger(site):
+            ledger_depth = joist_support_depths([0.0, *layout.beam_y_positions], site.depth_ft)[0]
+            deck_load -= site.width_ft * ledger_depth * TOTAL_LOAD_PSF
+        assert loads.total_reaction_lb == pytest.approx(deck_load)
+
+
+def test_grid_matches_general_analysis():
+    for s in _structures():
+        site = s.input
+        layout = s.layout
+        posts, beams = s.posts, s.beams
+        general = analyze_post_loads(
+            [p.x_ft for p in posts], [p.y_ft for p in posts],
+            [b.y_ft for b in beams], [b.x_start_ft for b in beams], [b.x_end_ft for b in beams],
+            site.depth_ft, ledger=_is_ledger(site), soil_bearing_psf=site.soil_bearing_psf,
+        )
+        grid = grid_post_loads(
+            site.width_ft, site.depth_ft, layout.beam_y_positions, layout.posts_per_beam, layout.beam_span_ft,
+            ledger=_is_ledger(site), soil_bearing_psf=site.soil_bearing_psf,
+        )
+        np.testing.assert_allclose(grid.tributary_sqft, general.tributary_sqft)
+        np.testing.assert_array_equal(grid.footing_diameter_in, general.footing_diameter_in)
+        assert layout.footing_diameters_in == tuple(general.footing_diameter_in.tolist())
+        assert [f.diameter_in for f in s.footings] == list(layout.footing_diameters_in)
+        assert s.footing_diameter_in == max(layout.footing_diameters_in)
+
+
+@pytest.mark.parametrize("soil", [1000, 1500, 2000, 3000])
+def test_footing_diameters_match_scalar(soil):
+    areas = np.linspace(0.5, 200, 400)
+    expected = [_calculate_footing_diameter(a, soil) for a in areas]
+    assert footing_diameters(areas * TOTAL_LOAD_PSF, soil).tolist() == expected
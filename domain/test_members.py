@@ -0,0 +1,77 @@
+"""Array-backed member stores (compact=True) hold the same members as the dataclass lists"""
+
+import pytest
+
+from domain.code_engine import generate_structure
+from domain.members import FootingArray, JoistArray, compact_members
+from domain.models import Joist, LedgerAttachment, SiteInput
+from services.pricing import calculate_quote
+
+
+SITES = [
+    SiteInput(width_ft=16, depth_ft=12, height_ft=6),
+    SiteInput(width_ft=10, depth_ft=8, height_ft=2, ledger_attachment=LedgerAttachment.FREESTANDING),
+    SiteInput(width_ft=47.5, depth_ft=12, height_ft=10),
+]
+KINDS = ("footings", "posts", "beams", "joists")
+
+
+@pytest.fixture(params=SITES, ids=lambda s: f"{s.width_ft}x{s.depth_ft}")
+def pair(request):
+    site = request.param
+    return generate_structure(site), generate_structure(site, compact=True)
+
+
+def test_members_match(pair):
+    eager, compact = pair
+    for kind in KINDS:
+        members, store = getattr(eager, kind), getattr(compact, kind)
+        assert len(store) == len(members)
+        assert store.to_members() == members
+        assert store == members
+        assert list(store) == members
+
+
+def test_total_lengths_match(pair):
+    eager, compact = pair
+    assert compact.post_lf == pytest.approx(eager.post_lf)
+    assert compact.beam_lf == pytest.approx(eager.beam_lf)
+    assert compact.joist_lf == pytest.approx(eager.joist_lf)
+
+
+def test_quotes_match(pair):
+    eager, compact = pair
+    assert calculate_quote(compact).total == pytest.approx(calculate_quote(eager).total, abs=1e-9)
+
+
+def test_compact_members_in_place():
+    structure = generate_structure(SITES[0])
+    joists = list(structure.joists)
+    compact_members(structure)
+    assert isinstance(structure.joists, JoistArray)
+    assert structure.joists.to_members() == joists
+
+
+def test_indexing_and_slices():
+    structure = generate_structure(SITES[2])
+    store = JoistArray.from_members(structure.joists)
+    assert store[-1] == structure.joists[-1]
+    assert store[2:5].to_members() == structure.joists[2:5]
+    assert store[0].materialize() == structure.joists[0]
+    assert isinstance(store[0].materialize(), Joist)
+    with pytest.raises(IndexError):
+        store[len(store)]
+
+
+def test_shared_fields_must_agree():
+    structure = generate_structure(SITES[0])
+    joists = list(structure.joists)
+    joists[0] = Joist(joists[0].x_ft, joists[0].y_start_ft, joists[0].y_end_ft, joists[0].z_ft,
+                      structure.posts[0].lumber)
+    with pytest.raises(ValueError):
+        JoistArray.from_members(joists)
+
+
+def test_empty_store():
+    store = FootingArray.from_members([])
+    assert len(store) == 0 and list(store) == []
@@ -0,0 +1,90 @@
+"""SpanIndex selection agrees with a linear scan over the raw span tables"""
+
+import numpy as np
+import pytest
+
+from domain.code_engine import (
+    joist_span_category, _select_beam_size, select_joist_size, _select_post_size,
+)
+from domain.span_index import _lumber_order, parse_beam_config
+from domain.tables import code_tables
+
+
+TABLES = code_tables()
+SPANS = [x / 4 for x in range(1, 101)]   # 0.25' to 25', every table value lands on this grid
+
+
+def _scan_joist(span: float, spacing: int):
+    sizes = sorted({size for size, _ in TABLES.joist_spans}, key=_lumber_order)
+    for size in sizes:
+        if TABLES.joist_spans.get((size, spacing), 0) >= span:
+            return size
+    return None
+
+
+def _scan_category(span: float) -> str:
+    categories = sorted({category for _, category in TABLES.beam_spans}, key=float)
+    for category in categories:
+        if span <= float(category):
+            return category
+    return categories[-1]
+
+
+def _scan_beam(beam_span: float, joist_span: float):
+    category = _scan_category(joist_span)
+    configs = [parse_beam_config(config) for config, _ in TABLES.beam_spans]
+    for ply in sorted({ply for _, ply in configs}, reverse=True):
+        for size in sorted({size for size, p in configs if p == ply}, key=_lumber_order):
+            name = f"{ply}-{size}" if ply > 1 else size
+            if TABLES.beam_spans.get((name, category), 0) >= beam_span:
+                return size, ply
+    return None
+
+
+def _scan_post(height: float) -> str:
+    sizes = sorted(TABLES.post_height_limits, key=_lumber_order)
+    for size in sizes:
+        if TABLES.post_height_limits[size] >= height:
+            return size
+    return sizes[-1]
+
+
+@pytest.mark.parametrize("spacing", sorted({spacing for _, spacing in TABLES.joist_spans}))
+def test_joist_size(spacing):
+    for span in SPANS:
+        expected = _scan_joist(span, spacing)
+        if expected is None:
+            with pytest.raises(ValueError):
+                select_joist_size(span, spacing)
+        else:
+            assert select_joist_size(span, spacing) == expected, span
+
+
+def test_joist_span_category():
+    for span in SPANS:
+        assert joist_span_category(span) == _scan_category(span), span
+
+
+@pytest.mark.parametrize("joist_span", [4, 6, 6.25, 8, 9, 10, 11.5, 12, 14])
+def test_beam_size(joist_span):
+    for beam_span in SPANS:
+        expected = _scan_beam(beam_span, joist_span)
+        if expected is None:
+            with pytest.raises(ValueError):
+                _select_beam_size(beam_span, joist_span)
+        else:
+            assert _select_beam_size(beam_span, joist_span) == expected, beam_span
+
+
+def test_post_size():
+    for height in SPANS:
+        assert _select_post_size(height) == _scan_post(height), height
+
+
+def test_array_selection_matches_scalar():
+    index = TABLES.span_index
+    spans = np.array(SPANS)
+    for spacing, ladder in index.joist_ladders.items():
+        expected = [ladder.select(span) or "" for span in SPANS]
+        assert ladder.select_array(spans).tolist() == expected
+    assert index.joist_span_category_array(spans).tolist() == [_scan_category(s) for s in SPANS]
@@ -0,0 +1,93 @@
+"""SpatialIndex queries agree with brute-force scans over every member footprint"""
+
+import random
+
+import pytest
+
+from domain.code_engine import generate_structure
+from domain.models import LedgerAttachment, SiteInput
+from domain.spatial import MemberRef, SpatialIndex, box_distance, member_footprints, segment_hits_box
+
+
+SITES = [
+    SiteInput(width_ft=16, depth_ft=12, height_ft=6),
+    SiteInput(width_ft=41, depth_ft=14, height_ft=3, ledger_attachment=LedgerAttachment.FREESTANDING),
+]
+KIND_FILTERS = [None, {"joist"}, {"post", "footing"}, {"ledger", "rim", "beam"}]
+
+
+@pytest.fixture(params=[(site, lazy, cell) for site in SITES for lazy in (False, True) for cell in (None, 0.5, 5.0)],
+                ids=lambda p: f"{p[0].width_ft}x{p[0].depth_ft}-{'lazy' if p[1] else 'eager'}-{p[2]}")
+def indexed(request):
+    site, lazy, cell_ft = request.param
+    structure = generate_structure(site, lazy=lazy)
+    return SpatialIndex(structure, cell_ft), list(member_footprints(structure))
+
+
+def _random_points(rng, n, structure):
+    half = structure.input.width_ft / 2
+    depth = structure.input.depth_ft
+    return [(rng.uniform(-half - 4, half + 4), rng.uniform(-4, depth + 4)) for _ in range(n)]
+
+
+def _filter(footprints, kinds):
+    return [(ref, box) for ref, box in footprints if kinds is None or ref.kind in kinds]
+
+
+def test_in_box(indexed):
+    index, footprints = indexed
+    rng = random.Random(1)
+    for (x, y), kinds in zip(_random_points(rng, 200, index.structure), KIND_FILTERS * 50):
+        w, h = rng.uniform(0, 6), rng.uniform(0, 6)
+        box = (x, y, x + w, y + h)
+        expected = [
+            ref for ref, b in _filter(footprints, kinds)
+            if b[0] <= box[2] and box[0] <= b[2] and b[1] <= box[3] and box[1] <= b[3]
+        ]
+        assert index.in_box(box, kinds) == expected
+        assert index.is_clear(box, kinds) == (not expected)
+
+
+def test_crossing(indexed):
+    index, footprints = indexed
+    rng = random.Random(2)
+    points = _random_points(rng, 200, index.structure)
+    for (start, end), kinds in zip(zip(points[::2], points[1::2]), KIND_FILTERS * 25):
+        hits = [(ref, b) for ref, b in _filter(footprints, kinds) if segment_hits_box(*start, *end, b)]
+        hits.sort(key=lambda hit: box_distance(hit[1], *start))
+        assert index.crossing(start, end, kinds) == [ref for ref, _ in hits]
+
+
+def test_nearest(indexed):
+    index, footprints = indexed
+    rng = random.Random(3)
+    for (x, y), kinds in zip(_random_points(rng, 200, index.structure), KIND_FILTERS * 50):
+        candidates = _filter(footprints, kinds)
+        best = min(candidates, key=lambda c: box_distance(c[1], x, y))   # First wins ties
+        ref, distance = index.nearest(x, y, kinds)
+        assert distance == pytest.approx(box_distance(best[1], x, y))
+        assert ref == best[0]
+        limited = index.nearest(x, y, kinds, max_distance=0.5)
+        assert limited == ((ref, distance) if distance < 0.5 else None)
+
+
+def test_batch_queries_match_single(indexed):
+    index, _ = indexed
+    points = _random_points(random.Random(4), 20, index.structure)
+    assert index.nearest_many(points, {"post"}) == [index.nearest(x, y, {"post"}) for x, y in points]
+    boxes = [(x, y, x + 1, y + 1) for x, y in points]
+    assert index.in_boxes(boxes) == [index.in_box(box) for box in boxes]
+    segments = list(zip(points[::2], points[1::2]))
+    assert index.crossings(segments) == [index.crossing(*segment) for segment in segments]
+
+
+def test_member_lookup():
+    structure = generate_structure(SITES[0])
+    index = SpatialIndex(structure)
+    assert len(index) == len(list(member_footprints(structure)))
+    assert index.member(MemberRef("joist", 3)) == structure.joists[3]
+    assert index.member(MemberRef("ledger", 0)) is structure.ledger
+    assert index.member(MemberRef("rim", 1)) is structure.rim_joists[1]
+    ref, distance = index.nearest(structure.posts[0].x_ft, structure.posts[0].y_ft, {"post"})
+    assert ref == MemberRef("post", 0) and distance == 0
+
@@ -0,0 +1,81 @@
+"""Versioned table files: compilation, validation and hot reload"""
+
+import json
+import os
+import pickle
+
+import pytest
+
+from domain.code_engine import generate_structure
+from domain.models import SiteInput
+from domain.tables import CODE_TABLES_PATH, FrozenDict, TableSource, compile_code_tables
+
+
+def _tables_data() -> dict:
+    with open(CODE_TABLES_PATH) as f:
+        return json.load(f)
+
+
+def _write(path, data, mtime_ns=None):
+    path.write_text(json.dumps(data))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_frozen_dict_is_read_only_and_picklable():
+    table = FrozenDict({"a": 1})
+    with pytest.raises(TypeError):
+        table["b"] = 2
+    with pytest.raises(TypeError):
+        table.update(b=2)
+    copy = pickle.loads(pickle.dumps(table))
+    assert copy == table and isinstance(copy, FrozenDict)
+
+
+def test_compile_rejects_bad_tables():
+    data = _tables_data()
+    data["version"] = ""
+    with pytest.raises(ValueError):
+        compile_code_tables(data)
+    data = _tables_data()
+    data["post_height_limits"]["9x9"] = 20.0
+    with pytest.raises(ValueError):
+        compile_code_tables(data)
+
+
+def test_reload_if_changed(tmp_path):
+    path = tmp_path / "tables.json"
+    data = _tables_data()
+    _write(path, data, mtime_ns=1_000_000_000)
+    source = TableSource(path, compile_code_tables, check_interval=None)
+    first = source.current()
+    assert source.current() is first
+    assert not source.reload_if_changed()
+
+    data["version"] = "next"
+    _write(path, data, mtime_ns=2_000_000_000)
+    assert source.reload_if_changed()
+    assert source.current().version == "next"
+
+
+def test_invalid_file_keeps_last_snapshot(tmp_path):
+    path = tmp_path / "tables.json"
+    _write(path, _tables_data(), mtime_ns=1_000_000_000)
+    source = TableSource(path, compile_code_tables, check_interval=0)
+    good = source.current()
+
+    path.write_text("{not json")
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+    assert source.current() is good
+    assert isinstance(source.last_error, ValueError)
+    with pytest.raises(ValueError):
+        source.reload()
+    assert source.current() is good
+
+
+def test_structures_record_and_pin_their_tables():
+    data = _tables_data()
+    data["version"] = "pinned"
+    tables = compile_code_tables(data)
+    structure = generate_structure(SiteInput(width_ft=16, depth_ft=12, height_ft=6), tables=tables)
+    assert structure.code_tables_version == "pinned"
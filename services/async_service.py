@@ -0,0 +1,141 @@
+"""
+Asyncio facade over the blocking engine, pricing and PDF code.
+
+CPU work runs on a thread or process pool so the event loop stays free.
+Each operation type has its own concurrency cap, and identical requests that
+arrive while one is already running share its result instead of running again.
+
+    async with DesignService(processes=True) as service:
+        quote = await service.quote(site_input)
+        pdf_bytes = await service.permit_pdf(structure)
+"""
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable
+
+from domain.code_engine import generate_structure
+from domain.models import SiteInput, DeckStructure
+from services.permit_pdf import render_permit_pdf
+from services.pricing import Quote, calculate_quote
+
+
+DEFAULT_MAX_QUOTES = 16
+DEFAULT_MAX_PDFS = 4
+
+
+@dataclass
+class ServiceStats:
+    """Counters since the service was created"""
+    submitted: int = 0      # Calls to design/quote/permit_pdf
+    executed: int = 0       # Jobs actually run on the pool
+    deduplicated: int = 0   # Calls that joined an identical in-flight job
+
+
+def _design(site_input: SiteInput) -> tuple[DeckStructure, Quote]:
+    """Pool job: structure and quote together (module-level so it pickles)"""
+    structure = generate_structure(site_input)
+    return structure, calculate_quote(structure)
+
+
+def _structure_key(structure: DeckStructure) -> Hashable:
+    """Structures with the same input and framing layout render the same PDF"""
+    return structure.input.canonical_key(), structure.layout
+
+
+class DesignService:
+    """Async quote and permit service with per-operation backpressure"""
+
+    def __init__(
+        self,
+        *,
+        executor: Executor | None = None,
+        pdf_executor: Executor | None = None,
+        processes: bool = False,
+        max_workers: int | None = None,
+        max_quotes: int = DEFAULT_MAX_QUOTES,
+        max_pdfs: int = DEFAULT_MAX_PDFS,
+        tolerance_ft: float = 0.0
+    ):
+        """
+        executor runs design/quote jobs and pdf_executor runs PDF renders
+        (default: the quote executor). When no executor is given, the service
+        creates and owns one: a ProcessPoolExecutor if processes=True,
+        otherwise a ThreadPoolExecutor. max_quotes/max_pdfs cap how many jobs
+        of each kind are on the pool at once. Inputs within tolerance_ft share
+        one in-flight job and are designed from the snapped input.
+        """
+        if max_quotes < 1 or max_pdfs < 1:
+            raise ValueError("max_quotes and max_pdfs must be at least 1")
+        self._owned: list[Executor] = []
+        if executor is None:
+            pool_type = ProcessPoolExecutor if processes else ThreadPoolExecutor
+            executor = pool_type(max_workers=max_workers)
+            self._owned.append(executor)
+        self._executor = executor
+        self._pdf_executor = pdf_executor or executor
+
+        self._quote_slots = asyncio.Semaphore(max_quotes)
+        self._pdf_slots = asyncio.Semaphore(max_pdfs)
+        self._designs_in_flight: dict[Hashable, asyncio.Future] = {}
+        self._pdfs_in_flight: dict[Hashable, asyncio.Future] = {}
+        self.tolerance_ft = tolerance_ft
+        self.stats = ServiceStats()
+
+    async def __aenter__(self) -> "DesignService":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut down executors the service created (caller-supplied ones are left running)"""
+        for executor in self._owned:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._owned.clear()
+
+    async def design(self, site_input: SiteInput) -> tuple[DeckStructure, Quote]:
+        """generate_structure() and calculate_quote() off the event loop"""
+        if self.tolerance_ft > 0:
+            site_input = site_input.quantized(self.tolerance_ft)
+        return await self._submit(
+            self._designs_in_flight,
+            site_input.canonical_key(),
+            lambda: self._run(self._quote_slots, self._executor, _design, site_input),
+        )
+
+    async def quote(self, site_input: SiteInput) -> Quote:
+        _, quote = await self.design(site_input)
+        return quote
+
+    async def permit_pdf(self, structure: DeckStructure) -> bytes:
+        """Render the permit package to bytes off the event loop"""
+        return await self._submit(
+            self._pdfs_in_flight,
+            _structure_key(structure),
+            lambda: self._run(self._pdf_slots, self._pdf_executor, render_permit_pdf, structure),
+        )
+
+    async def _submit(
+        self,
+        in_flight: dict[Hashable, asyncio.Future],
+        key: Hashable,
+        start: Callable[[], Awaitable]
+    ):
+        self.stats.submitted += 1
+        task = in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(start())
+            in_flight[key] = task
+            task.add_done_callback(lambda _: in_flight.pop(key, None))
+        else:
+            self.stats.deduplicated += 1
+        # Shielded so one caller cancelling does not cancel the job for the others
+        return await asyncio.shield(task)
+
+    async def _run(self, slots: asyncio.Semaphore, executor: Executor, fn, *args):
+        async with slots:
+            self.stats.executed += 1
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, fn, *args)
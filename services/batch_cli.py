@@ -0,0 +1,183 @@
+"""
+Streaming JSONL batch designer.
+
+Reads one SiteInput JSON object per line (from a file or stdin) and writes one
+result line per input, in input order: design summary, notes/errors, and the
+quote with line items. Lines flow through a generator pipeline, so memory
+stays flat however long the input is; with --workers, chunks of lines are
+farmed out to a process pool with a bounded number in flight.
+
+    python -m services.batch_cli leads.jsonl -o results.jsonl --workers 8
+    cat leads.jsonl | python -m services.batch_cli > results.jsonl
+"""
+
+import argparse
+import json
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, islice
+from typing import IO, Iterable, Iterator
+
+from domain.code_engine import generate_structure
+from domain.models import SiteInput, DeckStructure
+from domain.span_index import beam_config_name
+from services.pricing import Quote, calculate_quote
+
+
+DEFAULT_CHUNK_SIZE = 256
+
+# LineItem fields written to the output (price dependencies are internal)
+LINE_ITEM_FIELDS = ("category", "description", "quantity", "unit", "material_cost", "labor_cost")
+QUOTE_TOTAL_FIELDS = (
+    "deck_sqft", "materials_subtotal", "labor_subtotal", "permit_fees",
+    "subtotal", "margin_amount", "total", "price_per_sqft", "price_book_version",
+)
+
+
+def design_summary(structure: DeckStructure) -> dict:
+    return {
+        "joist_size": structure.joist_size,
+        "joist_spacing_in": structure.joist_spacing_in,
+        "beam": beam_config_name(structure.beam_size, structure.beam_ply) if structure.beam_size else "",
+        "post_size": structure.post_size,
+        "footing_diameter_in": structure.footing_diameter_in,
+        "footing_count": len(structure.footings),
+        "post_count": len(structure.posts),
+        "beam_count": len(structure.beams),
+        "joist_count": len(structure.joists),
+        "code_tables_version": structure.code_tables_version,
+    }
+
+
+def quote_summary(quote: Quote) -> dict:
+    summary = {name: getattr(quote, name) for name in QUOTE_TOTAL_FIELDS}
+    summary["line_items"] = [
+        {name: getattr(item, name) for name in LINE_ITEM_FIELDS}
+        for item in quote.line_items
+    ]
+    return summary
+
+
+def process_record(line_number: int, line: str) -> str:
+    """One input line -> one JSON result line (errors are reported, not raised)"""
+    try:
+        site = SiteInput.from_dict(json.loads(line))
+        # Lazy members: counts and lengths are all the summary and quote need
+        structure = generate_structure(site, lazy=True)
+        quote = calculate_quote(structure) if structure.compliant else None
+    except (ValueError, TypeError) as e:  # Bad JSON, unknown fields/enums, non-numeric sizes
+        return json.dumps({"line": line_number, "error": f"Invalid input: {e}"})
+    except ArithmeticError as e:  # Sizes that pass validation but still break the math
+        return json.dumps({"line": line_number, "error": f"Design failed: {e}"})
+
+    return json.dumps({
+        "line": line_number,
+        "compliant": structure.compliant,
+        "design": design_summary(structure),
+        "notes": structure.notes,
+        "errors": structure.errors,
+        "quote": quote_summary(quote) if quote is not None else None,
+    })
+
+
+def process_chunk(records: list[tuple[int, str]]) -> list[str]:
+    """Pool job (module-level so it pickles)"""
+    return [process_record(n, line) for n, line in records]
+
+
+def _chunk_errors(chunk: list[tuple[int, str]], e: Exception) -> list[str]:
+    """One error line per record of a chunk the pool could not process"""
+    error = f"Processing failed: {type(e).__name__}: {e}"
+    return [json.dumps({"line": n, "error": error}) for n, _ in chunk]
+
+
+def _chunk_results(future: Future, chunk: list[tuple[int, str]]) -> list[str]:
+    """A finished pool job's lines; if the job itself failed, one error line per record"""
+    try:
+        return future.result()
+    except Exception as e:  # Worker crashed or raised outside process_record
+        return _chunk_errors(chunk, e)
+
+
+def read_records(lines: Iterable[str]) -> Iterator[tuple[int, str]]:
+    """(1-based line number, line) for each non-blank line"""
+    for n, line in enumerate(lines, start=1):
+        if line.strip():
+            yield n, line
+
+
+def _chunks(records: Iterator, size: int) -> Iterator[list]:
+    while chunk := list(islice(records, size)):
+        yield chunk
+
+
+def process_records(
+    records: Iterable[tuple[int, str]],
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[str]:
+    """
+    Result lines in input order. With workers > 1, at most 2 x workers chunks
+    are in flight; results are yielded as soon as the oldest chunk finishes.
+    """
+    if workers <= 1:
+        for n, line in records:
+            yield process_record(n, line)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()  # (future, chunk)
+        chunks = _chunks(iter(records), chunk_size)
+        for chunk in chunks:
+            if len(pending) >= 2 * workers:
+                yield from _chunk_results(*pending.popleft())
+            try:
+                future = pool.submit(process_chunk, chunk)
+            except BrokenProcessPool as e:
+                # A worker died: jobs already submitted fail on their own, the rest here
+                while pending:
+                    yield from _chunk_results(*pending.popleft())
+                for unsent in chain([chunk], chunks):
+                    yield from _chunk_errors(unsent, e)
+                return
+            pending.append((future, chunk))
+        while pending:
+            yield from _chunk_results(*pending.popleft())
+
+
+def run(source: IO[str], sink: IO[str], workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Stream source to sink; returns the number of result lines written"""
+    count = 0
+    for result in process_records(read_records(source), workers, chunk_size):
+        sink.write(result)
+        sink.write("\n")
+        count += 1
+    return count
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Design and quote SiteInput records from JSONL")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Output JSONL file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (default: 1, inline)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Records per worker job (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    sink = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        count = run(source, sink, args.workers, args.chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    print(f"{count} records", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+"""
+Vectorized deck pricing.
+
+Columnar counterpart of calculate_quote() for pricing many decks at once,
+from a list of DeckStructures or straight from domain.batch.StructureBatch.
+Line items are priced from the same section terms (services.pricing) as the
+scalar calculator, evaluated over NumPy columns with the same operations in
+the same order, so results agree with it to the cent.
+"""
+
+import csv
+from dataclasses import dataclass
+from typing import IO, Sequence
+
+import numpy as np
+
+from domain.batch import StructureBatch
+from domain.models import DeckStructure, DeckingType, RailingType, SiteInput
+from services import pricing
+
+
+# Line-item categories in calculate_quote() order: (column prefix, Quote category)
+CATEGORIES: list[tuple[str, str]] = [
+    ("footings", "Footings"),
+    ("posts", "Posts"),
+    ("beams", "Beams"),
+    ("joists", "Joists"),
+    ("ledger_rim", "Ledger & Rim"),
+    ("framing_labor", "Framing Labor"),
+    ("decking", "Decking"),
+    ("railing", "Railing"),
+    ("stairs", "Stairs"),
+    ("cleanup", "Cleanup"),
+    ("permits", "Permits"),
+]
+
+TOTAL_COLUMNS = [
+    "deck_sqft", "materials_subtotal", "labor_subtotal", "permit_fees",
+    "subtotal", "margin_amount", "total", "price_per_sqft",
+]
+
+@dataclass
+class QuoteBatch:
+    """Columnar quotes: one array per line-item cost and total, one entry per deck"""
+    columns: dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.columns["total"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    @property
+    def column_names(self) -> list[str]:
+        return list(self.columns)
+
+    def as_dict(self) -> dict[str, np.ndarray]:
+        return dict(self.columns)
+
+    def to_csv(self, file: IO[str]):
+        """Write a header row plus one row per deck"""
+        writer = csv.writer(file)
+        writer.writerow(self.column_names)
+        writer.writerows(zip(*(column.tolist() for column in self.columns.values())))
+
+
+class _KeyColumn:
+    """
+    A price key that varies by deck, standing in for one key in a section's
+    terms: the distinct keys plus each row's index into them (hashed by
+    identity, so two columns never merge in a terms dict)
+    """
+    __slots__ = ("keys", "inverse")
+
+    def __init__(self, keys: list, inverse: np.ndarray):
+        self.keys = keys
+        self.inverse = inverse
+
+    def prices(self, price_of) -> np.ndarray:
+        """Price of each row's key, calling price_of once per distinct key"""
+        return np.array([price_of(k) for k in self.keys], dtype=float)[self.inverse]
+
+
+def _key_column(values: np.ndarray, key_of) -> _KeyColumn:
+    """Map each value to its price key, calling key_of once per distinct value"""
+    unique, inverse = np.unique(values, return_inverse=True)
+    return _KeyColumn([key_of(v) for v in unique.tolist()], inverse)
+
+
+def _enum_column(values, enum_type, n: int) -> np.ndarray:
+    """Broadcast enum members (or their string values) to a column of string values"""
+    if isinstance(values, (enum_type, str)):
+        values = [values]
+    return np.broadcast_to(np.array([enum_type(v).value for v in values]), (n,))
+
+
+def _structure_columns(structures: Sequence[DeckStructure]) -> dict[str, np.ndarray]:
+    """Extract the quantities calculate_quote() reads from each structure"""
+    sites = [s.input for s in structures]
+    return {
+        "width": np.array([s.width_ft for s in sites], dtype=float),
+        "depth": np.array([s.depth_ft for s in sites], dtype=float),
+        "footing_count": np.array([len(s.footings) for s in structures]),
+        "concrete_bags": np.array([pricing._concrete_bags(s) for s in structures], dtype=float),
+        "post_count": np.array([len(s.posts) for s in structures]),
+        "post_lf": np.array([s.post_lf for s in structures], dtype=float),
+        "post_size": np.array([s.post_size for s in structures]),
+        "beam_lf": np.array([s.beam_lf for s in structures], dtype=float),
+        "beam_size": np.array([s.beam_size for s in structures]),
+        "joist_count": np.array([len(s.joists) for s in structures]),
+        "joist_lf": np.array([s.joist_lf for s in structures], dtype=float),
+        "joist_size": np.array([s.joist_size for s in structures]),
+        "has_ledger": np.array([bool(s.ledger) for s in structures]),
+        "decking_type": np.array([s.decking_type.value for s in sites]),
+        "railing_type": np.array([s.railing_type.value for s in sites]),
+        "railing_lf": np.array([s.railing_lf for s in sites], dtype=float),
+        "stair_count": np.array([s.stair_count for s in sites]),
+    }
+
+
+def _batch_columns(batch: StructureBatch, decking_type, railing_type, railing_lf, stair_count):
+    """Quantities from a StructureBatch plus per-deck customer selections"""
+    n = len(batch)
+    defaults = SiteInput(0, 0, 0)
+    return {
+        "width": batch.width_ft,
+        "depth": batch.depth_ft,
+        "footing_count": batch.footing_count,
+        "concrete_bags": batch.footing_count * np.ceil(   # Batches size footings uniformly
+            pricing.footing_volume_cuft(batch.footing_diameter_in, batch.frost_depth_in) / pricing.CONCRETE_BAG_CUFT),
+        "post_count": batch.post_count,
+        "post_lf": batch.post_count * batch.post_height_ft,
+        "post_size": batch.post_size,
+        "beam_lf": batch.beam_count * batch.width_ft * batch.beam_ply,
+        "beam_size": batch.beam_size,
+        "joist_count": batch.joist_count,
+        "joist_lf": batch.joist_count * batch.depth_ft,
+        "joist_size": batch.joist_size,
+        "has_ledger": batch.has_ledger,
+        "decking_type": _enum_column(
+            defaults.decking_type if decking_type is None else decking_type, DeckingType, n),
+        "railing_type": _enum_column(
+            defaults.railing_type if railing_type is None else railing_type, RailingType, n),
+        "railing_lf": np.broadcast_to(
+            np.asarray(defaults.railing_lf if railing_lf is None else railing_lf, dtype=float), (n,)),
+        "stair_count": np.broadcast_to(
+            np.asarray(defaults.stair_count if stair_count is None else stair_count), (n,)),
+    }
+
+
+def _section_terms(q: dict[str, np.ndarray]) -> tuple[dict[str, dict], dict[str, np.ndarray]]:
+    """
+    Each section's pricing terms (services.pricing) over the quantity columns,
+    by column prefix, plus the rows where optional sections are quoted.
+    """
+    width, depth = q["width"], q["depth"]
+    sqft = width * depth
+    joist_key = _key_column(q["joist_size"], pricing.lumber_price_key)
+    ledger_lf = np.where(q["has_ledger"], width, 0.0)
+    framing_misc_lf = pricing._ledger_rim_lf(width, depth, ledger_lf)
+    decking = _key_column(q["decking_type"], lambda v: pricing._decking_keys(DeckingType(v)))
+    railing = _key_column(q["railing_type"], RailingType)
+    railing_type = np.array(railing.keys, dtype=object)[railing.inverse]
+    terms = {
+        "footings": pricing._footings_terms(q["footing_count"], q["concrete_bags"]),
+        "posts": pricing._posts_terms(
+            _key_column(q["post_size"], pricing.lumber_price_key), q["post_lf"], q["post_count"]),
+        "beams": pricing._beams_terms(_key_column(q["beam_size"], pricing.lumber_price_key), q["beam_lf"]),
+        "joists": pricing._joists_terms(joist_key, q["joist_lf"], q["joist_count"]),
+        "ledger_rim": pricing._ledger_rim_terms(joist_key, framing_misc_lf, ledger_lf),
+        "framing_labor": pricing._framing_labor_terms(sqft),
+        "decking": pricing._decking_terms(
+            _KeyColumn([material for material, _ in decking.keys], decking.inverse),
+            _KeyColumn([labor for _, labor in decking.keys], decking.inverse),
+            sqft,
+        ),
+        "railing": pricing._railing_terms(
+            _KeyColumn([pricing.RAILING_PRICE_KEYS.get(t, "") for t in railing.keys], railing.inverse),
+            q["railing_lf"],
+        ),
+        "stairs": pricing._stairs_terms(q["stair_count"]),
+        "cleanup": pricing._cleanup_terms(sqft),
+    }
+    selected = {
+        "railing": pricing._railing_selected(railing_type, q["railing_lf"]),
+        "stairs": q["stair_count"] > 0,
+    }
+    return terms, selected
+
+
+def _price_terms(terms: dict, price_of) -> np.ndarray | float:
+    """sum(qty * price) in term order, as services.pricing._price_item does per deck"""
+    cost = 0
+    for key, qty in terms.items():
+        price = key.prices(price_of) if isinstance(key, _KeyColumn) else price_of(key)
+        cost += qty * price
+    return cost
+
+
+def calculate_quotes_batch(
+    structures: Sequence[DeckStructure] | StructureBatch,
+    *,
+    decking_type=None,
+    railing_type=None,
+    railing_lf=None,
+    stair_count=None,
+    book: pricing.PriceBook | None = None
+) -> QuoteBatch:
+    """
+    Price many decks at once.
+
+    structures is either a sequence of DeckStructure (customer selections come
+    from each structure's input) or a StructureBatch, in which case decking_type,
+    railing_type, railing_lf and stair_count give the selections as scalars or
+    per-deck columns (SiteInput defaults when omitted). book pins the price
+    book version (default: the current snapshot).
+    """
+    if isinstance(structures, StructureBatch):
+        q = _batch_columns(structures, decking_type, railing_type, railing_lf, stair_count)
+    else:
+        q = _structure_columns(structures)
+
+    book = book or pricing.price_book()
+    material_prices = book.material_prices
+    labor_rates = book.labor_rates
+    n = len(q["width"])
+    zeros = np.zeros(n)
+
+    section_terms, selected = _section_terms(q)
+    out: dict[str, np.ndarray] = {}
+    for prefix, terms in section_terms.items():
+        material = zeros
+        if terms.get("material_terms"):
+            material = _price_terms(
+                terms["material_terms"], lambda k: pricing._material_price(k, material_prices)
+            ) * terms.get("waste_factor", 1.0)
+        labor = zeros
+        if terms.get("labor_terms"):
+            labor = _price_terms(terms["labor_terms"], labor_rates.__getitem__)
+        if prefix in selected:
+            material = np.where(selected[prefix], material, 0.0)
+            labor = np.where(selected[prefix], labor, 0.0)
+        out[f"{prefix}_material"] = np.full(n, material, dtype=float)
+        out[f"{prefix}_labor"] = np.full(n, labor, dtype=float)
+
+    # ===== PERMITS =====
+    # Accumulate in line-item order, as sum() over quote.line_items does
+    materials_subtotal = zeros
+    labor_subtotal = zeros
+    for prefix, _ in CATEGORIES[:-1]:
+        materials_subtotal = materials_subtotal + out[f"{prefix}_material"]
+        labor_subtotal = labor_subtotal + out[f"{prefix}_labor"]
+    permit_fee, plan_review = pricing._permit_costs(materials_subtotal + labor_subtotal, book.permit_fees)
+    out["permits_material"] = permit_fee + plan_review
+    out["permits_labor"] = np.full(n, labor_rates["permit_filing"])
+
+    # ===== TOTALS =====
+    sqft = q["width"] * q["depth"]
+    out["deck_sqft"] = sqft
+    out["materials_subtotal"] = materials_subtotal + out["permits_material"]
+    out["labor_subtotal"] = labor_subtotal + out["permits_labor"]
+    out["permit_fees"] = permit_fee + plan_review + labor_rates["permit_filing"]
+    out["subtotal"] = out["materials_subtotal"] + out["labor_subtotal"]
+    out["margin_amount"] = pricing._margin_amount(out["subtotal"])
+    out["total"] = out["subtotal"] + out["margin_amount"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["price_per_sqft"] = out["total"] / sqft
+
+    return QuoteBatch(columns=out)
@@ -0,0 +1,356 @@
+"""
+Lumber cut-list optimizer for material takeoff.
+
+Maps the framing members of a DeckStructure (joists, beams, posts, ledger and
+rim joists) onto purchasable stock lengths. The result is a purchase list per
+lumber size plus the real offcut waste, which calculate_quote() can use
+instead of the flat WASTE_FACTOR.
+
+Pieces longer than the longest stock board are spliced. Beams are spliced
+over posts, so every joint lands on a support. Joists, rims and the ledger
+are spliced into equal lengths. Lengths are whole 1/16" so packing is exact
+integer arithmetic, and every cut loses a saw kerf.
+
+The default packer is best-fit decreasing, with identical pieces handled in
+bulk, so commercial member counts pack in milliseconds. exact=True packs each
+size optimally: fewest stock feet, then fewest boards. It uses a dynamic
+program over cutting patterns. Sizes whose search space exceeds
+EXACT_MAX_STEPS fall back to the heuristic.
+
+    cut_list = optimize_cut_list(structure, exact=True)
+    quote = calculate_quote(structure, cut_list=cut_list)
+"""
+
+from bisect import bisect_left, insort
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import product
+from math import ceil, prod
+
+from domain.models import DeckStructure, LumberSpec, iter_members
+
+
+STOCK_LENGTHS_FT: tuple[int, ...] = (8, 10, 12, 14, 16, 18, 20)
+KERF_IN = 0.125
+EXACT_MAX_STEPS = 50_000  # States x cutting patterns the exact solver may search per size
+
+UNITS_PER_FT = 192  # Lengths are packed in 1/16"
+
+
+def _units(length_ft: float) -> int:
+    return round(length_ft * UNITS_PER_FT)
+
+
+def _feet(units: int) -> float:
+    return units / UNITS_PER_FT
+
+
+@dataclass(frozen=True)
+class CutPattern:
+    """count boards of stock_ft, each cut into cuts_ft (longest first)"""
+    stock_ft: float
+    cuts_ft: tuple[float, ...]
+    count: int
+
+    @property
+    def offcut_ft(self) -> float:
+        """Waste per board, kerf included"""
+        return self.stock_ft - sum(self.cuts_ft)
+
+
+@dataclass
+class SizeCutList:
+    """Boards to buy for one lumber size"""
+    nominal: str
+    patterns: list[CutPattern] = field(default_factory=list)
+    piece_lf: float = 0.0       # Total length of the pieces to cut
+    optimal: bool = False       # True if packed by the exact solver
+
+    @property
+    def board_count(self) -> int:
+        return sum(p.count for p in self.patterns)
+
+    @property
+    def stock_lf(self) -> float:
+        return sum(p.stock_ft * p.count for p in self.patterns)
+
+    @property
+    def waste_lf(self) -> float:
+        return self.stock_lf - self.piece_lf
+
+    @property
+    def stock_ratio(self) -> float:
+        """Stock feet bought per foot of piece (the real waste factor)"""
+        return self.stock_lf / self.piece_lf if self.piece_lf else 1.0
+
+    @property
+    def purchase(self) -> dict[float, int]:
+        """Stock length -> board count, shortest first"""
+        boards = Counter()
+        for p in self.patterns:
+            boards[p.stock_ft] += p.count
+        return dict(sorted(boards.items()))
+
+
+@dataclass
+class CutList:
+    """Cut list for a whole structure, one entry per lumber size"""
+    sizes: dict[str, SizeCutList] = field(default_factory=dict)
+
+    @property
+    def stock_lf(self) -> float:
+        return sum(s.stock_lf for s in self.sizes.values())
+
+    @property
+    def piece_lf(self) -> float:
+        return sum(s.piece_lf for s in self.sizes.values())
+
+    @property
+    def waste_lf(self) -> float:
+        return self.stock_lf - self.piece_lf
+
+    def stock_ratio(self, nominal: str) -> float:
+        size = self.sizes.get(nominal)
+        return size.stock_ratio if size else 1.0
+
+    def purchase_list(self) -> list[tuple[str, float, int]]:
+        """(nominal size, stock length ft, board count) rows"""
+        return [
+            (nominal, length, count)
+            for nominal, size in self.sizes.items()
+            for length, count in size.purchase.items()
+        ]
+
+
+# ===== PIECES =====
+
+def _splice(length: int, max_length: int, module: int | None = None) -> list[int]:
+    """
+    Split a member longer than the longest board. With module (support
+    spacing), joints fall on multiples of it; otherwise pieces are equal.
+    """
+    if length <= max_length:
+        return [length]
+    if module and module <= max_length:
+        segment = (max_length // module) * module
+        pieces = []
+        while length > max_length:
+            pieces.append(segment)
+            length -= segment
+        return pieces + [length]
+    n = ceil(length / max_length)
+    base, extra = divmod(length, n)
+    return [base + 1] * extra + [base] * (n - extra)
+
+
+def cut_pieces(structure: DeckStructure, max_length_ft: float = STOCK_LENGTHS_FT[-1]) -> dict[str, Counter]:
+    """
+    Piece lengths (1/16") and counts per lumber size. Uses the closed-form
+    layout when the structure has one, so no members are built.
+    """
+    max_length = _units(max_length_ft)
+    pieces: dict[str, Counter] = {}
+
+    def add(lumber: LumberSpec, length_ft: float, count: int = 1, module_ft: float | None = None):
+        length = _units(length_ft)
+        if length <= 0 or count <= 0:
+            return
+        counter = pieces.setdefault(lumber.nominal, Counter())
+        for piece in _splice(length, max_length, _units(module_ft) if module_ft else None):
+            counter[piece] += count
+
+    layout = structure.layout
+    if layout is not None:
+        add(layout.joist_lumber, layout.depth_ft, layout.joist_count)
+        add(layout.post_lumber, layout.post_height_ft, layout.support_count)
+        add(layout.beam_lumber, layout.width_ft, len(layout.beam_y_positions) * layout.beam_ply,
+            module_ft=layout.beam_span_ft)
+    else:
+        for joist in iter_members(structure.joists):
+            add(joist.lumber, joist.y_end_ft - joist.y_start_ft)
+        posts_per_line = Counter()
+        for post in iter_members(structure.posts):
+            add(post.lumber, post.height_ft)
+            posts_per_line[post.y_ft] += 1
+        for beam in iter_members(structure.beams):
+            length = beam.x_end_ft - beam.x_start_ft
+            supports = posts_per_line[beam.y_ft]
+            add(beam.lumber, length, beam.ply, module_ft=length / (supports - 1) if supports > 1 else None)
+
+    for board in ([structure.ledger] if structure.ledger else []) + structure.rim_joists:
+        if "x_start_ft" in board:
+            add(board["lumber"], board["x_end_ft"] - board["x_start_ft"])
+        else:
+            add(board["lumber"], board["y_end_ft"] - board["y_start_ft"])
+    return pieces
+
+
+# ===== PACKING =====
+
+def _right_size(contents: list[int], stock: tuple[int, ...], kerf: int) -> int:
+    """Shortest stock board the pieces fit on"""
+    used = sum(contents) + kerf * (len(contents) - 1)
+    return stock[bisect_left(stock, used)]
+
+
+def _stock_lf(boards: Counter) -> tuple[int, int]:
+    return sum(length * n for (length, _), n in boards.items()), sum(boards.values())
+
+
+def _pack_best_fit(pieces: Counter, stock: tuple[int, ...], kerf: int) -> Counter:
+    """
+    Best-fit decreasing, then each board shortened to the smallest stock
+    length that holds its cuts. Packing is tried against every stock length
+    that fits the longest piece and the cheapest result kept. Returns
+    Counter[(stock length, cuts)].
+    """
+    longest = max(pieces)
+    return min(
+        (_best_fit_onto(pieces, board, stock, kerf) for board in stock if board >= longest),
+        key=_stock_lf,
+    )
+
+
+def _best_fit_onto(pieces: Counter, board: int, stock: tuple[int, ...], kerf: int) -> Counter:
+    """
+    Best-fit decreasing onto boards of one length. Identical boards are kept
+    as one group with a count, and identical pieces are placed a group at a
+    time, so the work grows with the number of distinct cut patterns rather
+    than the number of members.
+    """
+    capacity = board + kerf  # The last cut on a board needs no kerf
+    groups: list[tuple[tuple[int, ...], int]] = []  # (cuts, boards with those cuts)
+    free: list[tuple[int, int]] = []  # (remaining, group index), ascending
+
+    def open_group(cuts: tuple[int, ...], count: int, remaining: int):
+        groups.append((cuts, count))
+        insort(free, (remaining, len(groups) - 1))
+
+    for length in sorted(pieces, reverse=True):
+        need = length + kerf
+        count = pieces[length]
+
+        # Tightest open boards first; each takes as many pieces as still fit
+        while count and free and free[-1][0] >= need:
+            remaining, g = free.pop(bisect_left(free, (need, -1)))
+            cuts, boards = groups[g]
+            per_board = remaining // need
+            filled, partial = divmod(count, per_board)
+            if filled >= boards:
+                filled, partial = boards, 0
+            count -= filled * per_board + partial
+            groups[g] = (cuts, 0)
+            if filled:
+                open_group(cuts + (length,) * per_board, filled, remaining - per_board * need)
+            if partial:
+                open_group(cuts + (length,) * partial, 1, remaining - partial * need)
+            untouched = boards - filled - (1 if partial else 0)
+            if untouched:
+                open_group(cuts, untouched, remaining)
+
+        # Fresh boards in bulk, as many of this piece per board as fit
+        if count:
+            per_board = capacity // need
+            filled, partial = divmod(count, per_board)
+            if filled:
+                open_group((length,) * per_board, filled, capacity - per_board * need)
+            if partial:
+                open_group((length,) * partial, 1, capacity - partial * need)
+
+    result = Counter()
+    for cuts, boards in groups:
+        if boards:
+            result[(_right_size(cuts, stock, kerf), cuts)] += boards
+    return result
+
+
+def _pack_exact(pieces: Counter, stock: tuple[int, ...], kerf: int) -> Counter | None:
+    """
+    Minimum (stock length, board count) packing by dynamic programming over
+    remaining-piece count vectors, or None if the search is too large.
+    """
+    lengths = sorted(pieces, reverse=True)
+    counts = tuple(pieces[length] for length in lengths)
+    state_count = prod(c + 1 for c in counts)
+    if state_count > EXACT_MAX_STEPS:
+        return None
+    needs = [length + kerf for length in lengths]
+    capacity = stock[-1] + kerf
+
+    # Every way to cut one board: (count vector, stock length)
+    patterns: list[tuple[tuple[int, ...], int]] = []
+
+    def extend(i: int, vector: list[int], used: int):
+        if len(patterns) * state_count > EXACT_MAX_STEPS:
+            return
+        if i == len(lengths):
+            if used:
+                cuts = [lengths[k] for k, n in enumerate(vector) for _ in range(n)]
+                patterns.append((tuple(vector), _right_size(cuts, stock, kerf)))
+            return
+        n = 0
+        while n <= counts[i] and used + n * needs[i] <= capacity:
+            vector.append(n)
+            extend(i + 1, vector, used + n * needs[i])
+            vector.pop()
+            n += 1
+
+    extend(0, [], 0)
+    if len(patterns) * state_count > EXACT_MAX_STEPS:
+        return None
+
+    # Bottom up: product() yields every state after all states it can reduce to
+    states = product(*(range(c + 1) for c in counts))
+    best: dict[tuple[int, ...], tuple[int, int, int]] = {next(states): (0, 0, -1)}
+    for state in states:
+        # Some board must hold a piece of the longest remaining length
+        first = next(i for i, n in enumerate(state) if n)
+        answer = None
+        for index, (vector, stock_length) in enumerate(patterns):
+            if not vector[first] or any(v > s for v, s in zip(vector, state)):
+                continue
+            rest = best[tuple(s - v for s, v in zip(state, vector))]
+            candidate = (rest[0] + stock_length, rest[1] + 1, index)
+            if answer is None or candidate < answer:
+                answer = candidate
+        best[state] = answer
+
+    boards = Counter()
+    state = counts
+    while any(state):
+        vector, stock_length = patterns[best[state][2]]
+        cuts = tuple(lengths[k] for k, n in enumerate(vector) for _ in range(n))
+        boards[(stock_length, cuts)] += 1
+        state = tuple(s - v for s, v in zip(state, vector))
+    return boards
+
+
+def optimize_cut_list(
+    structure: DeckStructure,
+    *,
+    exact: bool = False,
+    stock_lengths_ft: tuple[float, ...] = STOCK_LENGTHS_FT,
+    kerf_in: float = KERF_IN
+) -> CutList:
+    """Pack every lumber size in the structure onto stock boards"""
+    stock = tuple(sorted(_units(length) for length in stock_lengths_ft))
+    if not stock or stock[0] <= 0:
+        raise ValueError("stock_lengths_ft must contain positive lengths")
+    kerf = _units(kerf_in / 12)
+
+    cut_list = CutList()
+    for nominal, pieces in cut_pieces(structure, _feet(stock[-1])).items():
+        boards = _pack_exact(pieces, stock, kerf) if exact else None
+        optimal = boards is not None
+        if boards is None:
+            boards = _pack_best_fit(pieces, stock, kerf)
+        cut_list.sizes[nominal] = SizeCutList(
+            nominal=nominal,
+            patterns=[
+                CutPattern(stock_ft=_feet(length), cuts_ft=tuple(_feet(c) for c in cuts), count=n)
+                for (length, cuts), n in sorted(boards.items(), key=lambda e: (-e[0][0], e[0][1]))
+            ],
+            piece_lf=_feet(sum(length * n for length, n in pieces.items())),
+            optimal=optimal,
+        )
+    return cut_list
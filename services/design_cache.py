@@ -0,0 +1,198 @@
+"""
+Bounded LRU cache for structures and quotes.
+
+The sales UI re-requests the same deck many times while a rep toggles options.
+Results are keyed on SiteInput.canonical_key() of the design fields, so inputs
+that differ by less than the tolerance, or only in customer name and address,
+share one entry and are designed from the snapped input.
+Keys also carry the code tables and price book versions: when either is
+reloaded, the cache is cleared and old results can never be served again.
+
+Cached DeckStructure and Quote objects are shared between callers - treat them
+as read-only.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Callable, Hashable
+
+from domain.code_engine import generate_structure
+from domain.models import SiteInput, DeckStructure
+from domain.tables import CodeTables, code_tables
+from services.pricing import PriceBook, Quote, calculate_quote, price_book
+
+
+DEFAULT_MAXSIZE = 1024
+DEFAULT_TOLERANCE_FT = 1.0 / 96  # 1/8"
+
+
+@dataclass
+class CacheStats:
+    """Counters since the cache was created"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _LRU:
+    """OrderedDict-backed LRU store (callers hold the lock)"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.entries: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable):
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value) -> int:
+        """Insert and return the number of entries evicted"""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        evicted = 0
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+
+class DesignCache:
+    """LRU cache in front of generate_structure() and calculate_quote()"""
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        tolerance_ft: float = DEFAULT_TOLERANCE_FT
+    ):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+        self.tolerance_ft = tolerance_ft
+        self._structures = _LRU(maxsize)
+        self._quotes = _LRU(maxsize)
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+        self._versions: tuple[str, str] | None = None
+        self._generation = 0   # Bumped on every clear; builds from an older generation are not stored
+
+    def key(self, site_input: SiteInput) -> tuple:
+        return site_input.without_project_info().canonical_key(self.tolerance_ft)
+
+    def structure(self, site_input: SiteInput) -> DeckStructure:
+        """
+        Cached generate_structure() of the snapped input. The shared entry is
+        designed without project info; the returned structure's input carries
+        this caller's customer name and address.
+        """
+        structure = self._structure(site_input)
+        if site_input.without_project_info() is site_input:
+            return structure
+        return replace(structure, input=site_input.quantized(self.tolerance_ft))
+
+    def quote(self, site_input: SiteInput) -> Quote:
+        """Cached calculate_quote() for the snapped input's structure"""
+        return self._lookup(
+            self._quotes, site_input,
+            lambda site, tables, book: calculate_quote(self._structure(site, (tables, book)), book)
+        )
+
+    def invalidate(self):
+        """
+        Drop every entry. Table reloads are detected automatically; this is
+        for clearing the cache by hand.
+        """
+        with self._lock:
+            self._clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                invalidations=self._stats.invalidations,
+                size=len(self._structures.entries) + len(self._quotes.entries),
+            )
+
+    def _clear(self):
+        self._structures.entries.clear()
+        self._quotes.entries.clear()
+        self._stats.invalidations += 1
+        self._generation += 1
+
+    def _build_structure(self, site_input: SiteInput, tables: CodeTables) -> DeckStructure:
+        site = site_input.without_project_info().quantized(self.tolerance_ft)
+        return generate_structure(site, tables=tables)
+
+    def _structure(
+        self,
+        site_input: SiteInput,
+        snapshots: tuple[CodeTables, PriceBook] | None = None
+    ) -> DeckStructure:
+        return self._lookup(
+            self._structures, site_input,
+            lambda site, tables, book: self._build_structure(site, tables),
+            snapshots
+        )
+
+    def _lookup(
+        self,
+        store: _LRU,
+        site_input: SiteInput,
+        build: Callable,
+        snapshots: tuple[CodeTables, PriceBook] | None = None
+    ):
+        # One snapshot of each table per lookup; the value is built from the same snapshots
+        current = (code_tables(), price_book())
+        tables, book = snapshots or current
+        versions = (tables.version, book.version)
+        key = (versions, self.key(site_input))
+        with self._lock:
+            # Clear only when the live tables moved; entries for pinned older
+            # snapshots are keyed by their versions and age out of the LRU
+            live = (current[0].version, current[1].version)
+            if live != self._versions:
+                if self._versions is not None:
+                    self._clear()  # Tables were reloaded
+                self._versions = live
+            value = store.get(key)
+            if value is not None:
+                self._stats.hits += 1
+                return value
+            self._stats.misses += 1
+            generation = self._generation
+
+        # Build outside the lock; a concurrent miss on the same key just recomputes
+        value = build(site_input, tables, book)
+        with self._lock:
+            if generation == self._generation:  # Not cleared while building
+                self._stats.evictions += store.put(key, value)
+        return value
+
+
+# Process-wide cache used by the helpers below
+default_cache = DesignCache()
+
+
+def cached_structure(site_input: SiteInput) -> DeckStructure:
+    """generate_structure() through the process-wide cache"""
+    return default_cache.structure(site_input)
+
+
+def cached_quote(site_input: SiteInput) -> Quote:
+    """calculate_quote(generate_structure()) through the process-wide cache"""
+    return default_cache.quote(site_input)
+
+
+def invalidate_design_cache():
+    """Clear the process-wide cache"""
+    default_cache.invalidate()
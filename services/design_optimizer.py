@@ -0,0 +1,180 @@
+"""
+Cost-optimizing deck design search.
+
+generate_structure() gives the standard prescriptive frame (16" O.C. joists,
+~8' beam spans, first beam size that passes). This searches joist spacing,
+post count and beam family for the lowest-cost compliant frame instead.
+"""
+
+import math
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+from domain.code_engine import generate_structure, joist_span, joist_span_category, select_joist_size
+from domain.models import SiteInput, DeckStructure
+from domain.tables import CodeTables, code_tables
+from services.pricing import PriceBook, Quote, lumber_price_key, calculate_quote, price_book
+
+
+# Search space
+JOIST_SPACINGS = (12, 16, 24)
+
+
+@dataclass
+class DesignCandidate:
+    """One evaluated layout"""
+    joist_spacing_in: int
+    num_posts: int           # Per beam line
+    beam_ply: int
+    structure: DeckStructure
+    quote: Quote
+
+    @property
+    def total(self) -> float:
+        return self.quote.total
+
+
+@dataclass
+class OptimizedDesign:
+    """Result of optimize_structure"""
+    best: DeckStructure
+    best_quote: Quote
+    alternatives: list[DesignCandidate] = field(default_factory=list)  # Runner-ups, cheapest first
+    evaluated: int = 0       # Candidates priced
+    pruned: int = 0          # Candidates skipped as dominated
+
+
+def _enumerate_layouts(
+    site_input: SiteInput,
+    tables: CodeTables
+) -> tuple[list[tuple[int, int, int]], int]:
+    """
+    List (joist_spacing_in, num_posts, beam_ply) layouts worth pricing.
+
+    Adding a post only pays off if it lets the beam drop a size, so for each
+    spacing and beam family we keep the fewest posts that reach each beam size
+    and skip the rest as dominated (more footings and posts, same beam).
+    Returns (layouts, pruned_count).
+    """
+    index = tables.span_index
+    width = site_input.width_ft
+    _, joist_span_ft = joist_span(site_input)
+    category = joist_span_category(joist_span_ft, index)
+
+    layouts = []
+    pruned = 0
+    for spacing in JOIST_SPACINGS:
+        try:
+            select_joist_size(joist_span_ft, spacing, index)
+        except ValueError:
+            continue  # No joist carries this span at this spacing
+
+        for ply in index.beam_plies:
+            ladder = index.beam_ladder(ply, category)
+            if not ladder.sizes:
+                continue
+
+            # Fewest posts that make any size in this family work
+            num_posts = max(2, math.ceil(width / ladder.max_capacity) + 1)
+            last_size = None
+            while True:
+                size = ladder.select(width / (num_posts - 1))
+                if size != last_size:
+                    layouts.append((spacing, num_posts, ply))
+                    last_size = size
+                else:
+                    pruned += 1
+                if size == ladder.sizes[0]:
+                    break  # Smallest beam reached; more posts only add cost
+                num_posts += 1
+
+    return layouts, pruned
+
+
+def _lumber_priced(structure: DeckStructure, book: PriceBook) -> bool:
+    """True if the book prices every framing lumber size the structure uses"""
+    return all(
+        lumber_price_key(size) in book.material_prices
+        for size in (structure.joist_size, structure.beam_size, structure.post_size)
+    )
+
+
+def _evaluate_layout(
+    site_input: SiteInput,
+    layout: tuple[int, int, int],
+    tables: CodeTables,
+    book: PriceBook
+) -> Optional[DesignCandidate]:
+    """
+    Build and price one layout (module-level so it pickles into worker processes).
+    Layouts using lumber the price book has no price for are rejected rather
+    than ranked on DEFAULT_LUMBER_PRICE.
+    """
+    spacing, num_posts, ply = layout
+    structure = generate_structure(
+        site_input, joist_spacing_in=spacing, num_posts=num_posts, beam_ply=ply, tables=tables
+    )
+    if not structure.compliant or not _lumber_priced(structure, book):
+        return None
+    return DesignCandidate(
+        joist_spacing_in=spacing,
+        num_posts=num_posts,
+        beam_ply=ply,
+        structure=structure,
+        quote=calculate_quote(structure, book),
+    )
+
+
+def optimize_structure(
+    site_input: SiteInput,
+    *,
+    max_alternatives: int = 3,
+    max_workers: int | None = None,
+    executor: Executor | None = None
+) -> OptimizedDesign:
+    """
+    Find the lowest-cost compliant frame for a deck.
+
+    Candidates are priced with calculate_quote(). Pass max_workers > 1 to fan
+    them out to a process pool, or executor to reuse a long-lived pool (worker
+    start-up costs far more than pricing a handful of layouts, so a per-call
+    pool only pays off for very wide decks).
+
+    If no layout is compliant (and fully priced), best is the standard generate_structure()
+    result with its errors, and alternatives is empty. Every candidate, in
+    every worker, is designed and priced from the same table snapshots.
+    """
+    tables, book = code_tables(), price_book()
+    layouts, pruned = _enumerate_layouts(site_input, tables)
+    n = len(layouts)
+    args = ([site_input] * n, layouts, [tables] * n, [book] * n)
+
+    if executor is not None:
+        results = list(executor.map(_evaluate_layout, *args))
+    elif max_workers and max_workers > 1 and len(layouts) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            chunksize = max(1, len(layouts) // (max_workers * 4))
+            results = list(pool.map(_evaluate_layout, *args, chunksize=chunksize))
+    else:
+        results = [_evaluate_layout(site_input, layout, tables, book) for layout in layouts]
+
+    candidates = sorted((c for c in results if c is not None), key=lambda c: c.total)
+
+    if not candidates:
+        structure = generate_structure(site_input, tables=tables)
+        return OptimizedDesign(
+            best=structure,
+            best_quote=calculate_quote(structure, book),
+            evaluated=len(layouts),
+            pruned=pruned,
+        )
+
+    best = candidates[0]
+    return OptimizedDesign(
+        best=best.structure,
+        best_quote=best.quote,
+        alternatives=candidates[1:1 + max_alternatives],
+        evaluated=len(layouts),
+        pruned=pruned,
+    )
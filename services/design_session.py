@@ -0,0 +1,160 @@
+"""
+Incremental design session for interactive configurators.
+
+A rep dragging a railing slider or flipping decking types changes one
+customer selection at a time, and most selections do not touch framing.
+DesignSession holds the current SiteInput, DeckStructure and Quote and, on
+each update, reruns only the stages that read a changed field:
+
+- structural fields (dimensions, site conditions): new structure, every line item
+- customer selections: only the line items listed in SECTION_INPUTS
+- project info (customer name, address): nothing
+
+The permit line and totals are recomputed from the cached line items after
+every change.
+
+    session = DesignSession(SiteInput(width_ft=16, depth_ft=12, height_ft=6))
+    session.update(railing_type="cable", railing_lf=40)   # {"pricing.railing", ...}
+    session.quote.total
+
+The session owns its structure and quote and updates the quote in place.
+"""
+
+from dataclasses import fields, replace
+from enum import Enum
+from typing import Any, Callable
+
+from domain.code_engine import generate_structure
+from domain.instrumentation import phase
+from domain.models import PROJECT_FIELDS, DeckStructure, SiteInput
+from domain.tables import code_tables
+from services.pricing import (
+    LINE_ITEM_SECTIONS, SECTION_INPUTS, LineItem, PriceBook, Quote,
+    _apply_permits_and_totals, _apply_stock_ratios, _price_item, _section_phase_name,
+    _stock_ratios, price_book,
+)
+
+
+# Fields read by line items only; everything else regenerates the structure
+SELECTION_FIELDS = frozenset().union(*SECTION_INPUTS.values())
+
+STRUCTURE_STAGE = "structure"
+CUT_LIST_STAGE = "cut_list"
+TOTALS_STAGE = "pricing.permits_and_totals"
+
+_SITE_FIELDS = {f.name: f.type for f in fields(SiteInput)}
+
+
+class DesignSession:
+    """
+    Current design for one configurator session.
+
+    lazy (default True) builds the structure with lazy members, which is all
+    pricing needs; call structure.joists etc. to materialize them for drawing.
+    optimize_cuts prices framing lumber from a cut list (services.cut_list),
+    rebuilt only when the structure changes.
+    """
+
+    def __init__(self, site: SiteInput, *, lazy: bool = True, optimize_cuts: bool = False):
+        self.lazy = lazy
+        self.optimize_cuts = optimize_cuts
+        self.site = site
+        self.structure: DeckStructure | None = None
+        self.quote = Quote()
+        self._items: dict[Callable, LineItem | None] = {}
+        self._stock_ratios: dict[str, float] | None = None
+        self._book: PriceBook | None = None
+        self._rebuild()
+
+    def update(self, **changes: Any) -> set[str]:
+        """
+        Apply field changes and recompute what they affect. Enum fields take
+        members or their string values. Returns the stages that ran
+        (STRUCTURE_STAGE, CUT_LIST_STAGE, pricing section phase names,
+        TOTALS_STAGE); empty if nothing changed.
+
+        A reload of the code tables or price book since the last update is
+        picked up here too: the structure is regenerated or every item repriced.
+        """
+        with phase("session.update") as p:
+            site = self.site
+            changed = set()
+            for name, value in changes.items():
+                field_type = _SITE_FIELDS.get(name)
+                if field_type is None:
+                    raise ValueError(f"Unknown SiteInput field: {name!r}")
+                if isinstance(field_type, type) and issubclass(field_type, Enum):
+                    value = field_type(value)
+                    changes[name] = value
+                if getattr(site, name) != value:
+                    changed.add(name)
+            if changed:
+                self.site = replace(site, **{name: changes[name] for name in changed})
+
+            if (changed.difference(SELECTION_FIELDS, PROJECT_FIELDS)
+                    or self.structure.code_tables_version != code_tables().version):
+                stages = self._rebuild()
+            else:
+                stages = self._refresh(changed)
+            p.count("stages", len(stages))
+            return stages
+
+    def refresh(self) -> set[str]:
+        """Pick up reloaded code tables or price book without changing inputs"""
+        return self.update()
+
+    # ===== STAGES =====
+
+    def _rebuild(self) -> set[str]:
+        """New structure (and cut list), then every line item"""
+        stages = {STRUCTURE_STAGE}
+        self.structure = generate_structure(self.site, lazy=self.lazy)
+        if self.optimize_cuts:
+            from services.cut_list import optimize_cut_list
+            self._stock_ratios = _stock_ratios(optimize_cut_list(self.structure))
+            stages.add(CUT_LIST_STAGE)
+        self._book = price_book()
+        site = self.site
+        self.quote = Quote(deck_sqft=site.width_ft * site.depth_ft)
+        return stages | self._recompute(LINE_ITEM_SECTIONS)
+
+    def _refresh(self, changed: set[str]) -> set[str]:
+        """Same structure: rebuild the sections that read a changed field"""
+        if changed:
+            self.structure.input = self.site  # Sections read the input through the structure
+
+        repriced = False
+        book = price_book()
+        if book is not self._book:
+            self._book = book
+            for item in self._items.values():
+                if item is not None:
+                    _price_item(item, book.material_prices, book.labor_rates)
+            repriced = True
+
+        sections = [s for s in LINE_ITEM_SECTIONS if not SECTION_INPUTS[s].isdisjoint(changed)]
+        if not sections and not repriced:
+            return set()  # Project info only
+        return self._recompute(sections)
+
+    def _recompute(self, sections: list[Callable]) -> set[str]:
+        """Rebuild and price the given sections, then the permit line and totals"""
+        book = self._book
+        stages = set()
+        for section in sections:
+            item = section(self.structure)
+            if item is not None:
+                if self._stock_ratios:
+                    _apply_stock_ratios(item, self._stock_ratios)
+                _price_item(item, book.material_prices, book.labor_rates)
+            self._items[section] = item
+            stages.add(_section_phase_name(section))
+
+        quote = self.quote
+        permit = quote.line_items[-1:] if quote.line_items else []
+        quote.line_items = [
+            item for item in (self._items[s] for s in LINE_ITEM_SECTIONS) if item is not None
+        ] + permit
+        _apply_permits_and_totals(quote, book)
+        stages.add(TOTALS_STAGE)
+        return stages
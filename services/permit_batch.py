@@ -0,0 +1,136 @@
+"""
+Bulk permit package generation.
+
+ReportLab rendering is CPU-bound, so month-end regeneration of hundreds of
+permit sets fans jobs out to a process pool. Jobs are submitted lazily with a
+bound on in-flight work, so an arbitrarily long (or generated) job queue never
+holds more than a few structures in memory at once. Each job runs the same
+generate_permit_pdf() as the serial path.
+"""
+
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from domain.models import DeckStructure
+from services.permit_pdf import generate_permit_pdf
+
+
+@dataclass
+class PermitJobResult:
+    """Outcome of one (structure, output_path) job"""
+    index: int              # Position in the input queue
+    output_path: Path
+    seconds: float          # Render time inside the worker
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BulkPermitReport:
+    """Per-job results in input order, plus wall-clock time for the run"""
+    results: list[PermitJobResult] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> list[PermitJobResult]:
+        return [r for r in self.results if r.ok]
+
+    @property
+    def failed(self) -> list[PermitJobResult]:
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def render_seconds(self) -> float:
+        """Summed worker render time (compare with wall_seconds for speedup)"""
+        return sum(r.seconds for r in self.results)
+
+
+def _render_job(index: int, structure: DeckStructure, output_path: Path, invariant: bool) -> PermitJobResult:
+    """Render one package; runs in a worker process, so failures come back as data"""
+    start = time.perf_counter()
+    try:
+        generate_permit_pdf(structure, output_path, invariant=invariant)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return PermitJobResult(
+        index=index,
+        output_path=output_path,
+        seconds=time.perf_counter() - start,
+        error=error,
+    )
+
+
+def generate_permit_pdfs(
+    jobs: Iterable[tuple[DeckStructure, str | Path]],
+    *,
+    max_workers: int | None = None,
+    max_in_flight: int | None = None,
+    executor: Executor | None = None,
+    invariant: bool = False,
+    on_result: Callable[[PermitJobResult], None] | None = None
+) -> BulkPermitReport:
+    """
+    Render a queue of permit packages in parallel.
+
+    At most max_in_flight jobs (default 2 x workers) are submitted at a time.
+    Pass executor to reuse a long-lived pool; max_workers=1 renders serially
+    on the calling thread. on_result is called as each job finishes, in
+    completion order; the report lists results in input order.
+    """
+    start = time.perf_counter()
+    report = BulkPermitReport()
+
+    workers = max_workers or os.cpu_count() or 1
+    if executor is None and workers == 1:
+        for index, (structure, output_path) in enumerate(jobs):
+            result = _render_job(index, structure, Path(output_path), invariant)
+            report.results.append(result)
+            if on_result:
+                on_result(result)
+        report.wall_seconds = time.perf_counter() - start
+        return report
+
+    limit = max_in_flight or 2 * workers
+    if limit < 1:
+        raise ValueError(f"max_in_flight must be at least 1, got {limit}")
+
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    pending: dict = {}
+    try:
+        def collect(done):
+            for future in done:
+                index, output_path = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:  # Worker died or job could not be pickled
+                    result = PermitJobResult(index, output_path, 0.0, f"{type(e).__name__}: {e}")
+                report.results.append(result)
+                if on_result:
+                    on_result(result)
+
+        for index, (structure, output_path) in enumerate(jobs):
+            if len(pending) >= limit:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            output_path = Path(output_path)
+            future = pool.submit(_render_job, index, structure, output_path, invariant)
+            pending[future] = (index, output_path)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+    finally:
+        if executor is None:
+            pool.shutdown()
+
+    report.results.sort(key=lambda r: r.index)
+    report.wall_seconds = time.perf_counter() - start
+    return report
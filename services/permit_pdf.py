@@ -3,25 +3,39 @@ SDCI Permit PDF Generator
 
 Generates code-compliant permit drawings per Seattle Tip 312.
 Uses ReportLab for PDF generation.
+
+ReportLab is imported on first render, not at module import, so workers that
+only quote or size structures never load it.
 """
 
-from reportlab.lib.pagesizes import ARCH_D, LETTER, landscape
-from reportlab.lib.units import inch, ft
-from reportlab.pdfgen import canvas
-from reportlab.lib.colors import black, gray, lightgrey, white
-from typing import Tuple
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, BinaryIO, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
 from datetime import date
+from functools import wraps
+
+from domain.instrumentation import phase
+from domain.models import DeckStructure, iter_members
+from domain.span_index import beam_config_name
 
-from domain.models import DeckStructure
+if TYPE_CHECKING:
+    from reportlab.pdfgen.canvas import Canvas
 
 
-# Drawing constants
-PAGE_SIZE = landscape(ARCH_D)  # 36" x 24"
+# Drawing constants (PDF points; same values as reportlab.lib.units/pagesizes)
+inch = 72.0
+ARCH_D = (24 * inch, 36 * inch)  # Not in reportlab.lib.pagesizes
+PAGE_SIZE = (ARCH_D[1], ARCH_D[0])  # Landscape, 36" x 24"
 MARGIN = 0.75 * inch
 TITLE_BLOCK_HEIGHT = 2.5 * inch
 TITLE_BLOCK_WIDTH = 4.5 * inch
 
+# Colors (RGB, as reportlab.lib.colors black/lightgrey/white)
+BLACK = (0, 0, 0)
+LIGHT_GREY = (0.827451, 0.827451, 0.827451)
+WHITE = (1, 1, 1)
+
 # Line weights
 LINE_HEAVY = 1.5
 LINE_MEDIUM = 1.0
@@ -31,39 +45,155 @@ LINE_HAIRLINE = 0.25
 # Scale: 1/2" = 1'-0" (0.5 inch per foot)
 SCALE = 0.5 * inch
 
+# Chunk size for streamed responses
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Form XObjects for the sheet layers that never change between sheets or
+# projects; drawn once per document and referenced from every page
+FORM_SHEET_FRAME = "SheetFrame"  # Border + title block
+FORM_GENERAL_NOTES = "GeneralNotes"
+
+GENERAL_NOTES = [
+    "1. Design per Seattle Tip 312 Prescriptive Standards",
+    "2. All lumber: Pressure treated SPF #2 or DF-L #2 min.",
+    "3. All hardware: Hot-dipped galvanized or stainless steel",
+    "4. Ledger: 1/2\" lag screws at 16\" O.C., staggered",
+    "5. Joist hangers: Simpson LUS210 or equivalent at ledger",
+    "6. Post base: Simpson PBS44 or equivalent",
+    "7. Post cap: Simpson BC4 or equivalent",
+    "8. Beam-to-post: Through-bolt with 1/2\" carriage bolts",
+    "9. Verify all dimensions in field before construction",
+    "10. Obtain required inspections per SDCI",
+]
+
+
+def _new_canvas(target, invariant: bool) -> Canvas:
+    """Page-sized canvas; the first call loads ReportLab"""
+    from reportlab.pdfgen.canvas import Canvas
+    return Canvas(target, pagesize=PAGE_SIZE, invariant=invariant)
+
+
+def _canvas_phase(name: str):
+    """
+    Instrument a drawing method as a phase, counting the page operations it
+    emits itself ("canvas_ops"): ops from nested _canvas_phase methods (e.g.
+    the sheet frame inside a sheet) are counted only under their own phase.
+    Ops that define a form XObject go to the phase that first uses the form
+    ("form_ops"; see _use_form), so each op is counted exactly once.
+    """
+    def decorate(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            open_phases = self._open_phases
+            with phase(name) as p:
+                ops_before = len(self.c._code)
+                open_phases.append([p, 0])
+                try:
+                    result = method(self, *args, **kwargs)
+                finally:
+                    _, child_ops = open_phases.pop()
+                ops = len(self.c._code) - ops_before
+                p.count("canvas_ops", ops - child_ops)
+            if open_phases:
+                open_phases[-1][1] += ops
+            return result
+        return wrapper
+    return decorate
+
 
 class PermitPDFGenerator:
     """Generates SDCI permit drawings from DeckStructure"""
     
-    def __init__(self, structure: DeckStructure, output_path: str | Path):
+    def __init__(
+        self,
+        structure: DeckStructure,
+        output_path: Optional[str | Path] = None,
+        invariant: bool = False
+    ):
         self.structure = structure
         self.config = structure.input
-        self.output_path = Path(output_path)
-        self.c: canvas.Canvas = None
+        self.output_path = Path(output_path) if output_path is not None else None  # Only for generate()
+        self.invariant = invariant  # Fixed PDF timestamps/IDs, for byte-identical output
+        self.c: Canvas = None
         self.page_width, self.page_height = PAGE_SIZE
         self.sheet_number = 0
         self.total_sheets = 2
+        self._open_phases: list[list] = []  # [phase, ops of nested _canvas_phase calls] per open phase
         
     def generate(self) -> Path:
         """Generate complete permit package and return path"""
-        self.c = canvas.Canvas(str(self.output_path), pagesize=PAGE_SIZE)
+        if self.output_path is None:
+            raise ValueError("No output_path given; use to_bytes(), write_to() or iter_chunks()")
+        c = _new_canvas(str(self.output_path), self.invariant)
+        self.draw_package(c)
+        with phase("pdf.serialize"):
+            c.save()
+        return self.output_path
+    
+    def to_bytes(self) -> bytes:
+        """Render the complete package in memory"""
+        c = _new_canvas(None, self.invariant)
+        self.draw_package(c)
+        with phase("pdf.serialize"):
+            return c.getpdfdata()
+    
+    def write_to(self, stream: BinaryIO) -> int:
+        """Render into a writable binary stream (e.g. an HTTP response); returns bytes written"""
+        data = self.to_bytes()
+        stream.write(data)
+        return len(data)
+    
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[memoryview]:
+        """
+        Yield the rendered package in chunks for streamed responses. ReportLab
+        serializes the document in one pass at the end, so chunks are zero-copy
+        slices of that buffer rather than pages emitted while drawing.
+        """
+        view = memoryview(self.to_bytes())
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+    
+    def draw_package(self, c: Canvas):
+        """Draw both sheets onto c, ending each page (lets binders share one canvas)"""
+        self.c = c
+        self.sheet_number = 0
         
         # Sheet 1: Framing Plan
         self._draw_framing_plan()
-        self.c.showPage()
+        c.showPage()
         
         # Sheet 2: Section and Details
         self._draw_section_and_details()
-        
-        self.c.save()
-        return self.output_path
+        c.showPage()
+    
+    def _use_form(self, name: str, draw):
+        """Reference a form XObject, defining it with draw() on first use in the document"""
+        c = self.c
+        if not c.hasForm(name):
+            c.beginForm(name)
+            draw()
+            form_ops = len(c._code)  # The form's own stream; the page stream is restored by endForm()
+            c.endForm()
+            if self._open_phases:
+                self._open_phases[-1][0].count("form_ops", form_ops)
+        c.doForm(name)
     
     def _to_scale(self, feet: float) -> float:
         """Convert feet to drawing units at current scale"""
         return feet * SCALE
     
+    @_canvas_phase("pdf.sheet_frame")
+    def _draw_sheet_frame(self):
+        """Border and title block: invariant layers from FORM_SHEET_FRAME, project fields live"""
+        self._use_form(FORM_SHEET_FRAME, self._draw_sheet_frame_static)
+        self._draw_title_block()
+    
+    def _draw_sheet_frame_static(self):
+        self._draw_border()
+        self._draw_title_block_static()
+    
     def _draw_title_block(self):
-        """Draw standard title block in bottom-right corner"""
+        """Draw the per-project title block fields (address, date, sheet number)"""
         c = self.c
         self.sheet_number += 1
         
@@ -71,8 +201,30 @@ class PermitPDFGenerator:
         tb_x = self.page_width - MARGIN - TITLE_BLOCK_WIDTH
         tb_y = MARGIN
         
+        c.setFont("Helvetica", 9)
+        # Project info
+        address_lines = self.config.site_address.split(",")
+        y_pos = tb_y + 1.3*inch
+        for line in address_lines[:2]:
+            c.drawString(tb_x + 0.15*inch, y_pos, line.strip())
+            y_pos -= 0.15*inch
+        
+        # Date
+        c.drawString(tb_x + 2.5*inch, tb_y + 0.85*inch, f"Date: {date.today().strftime('%m/%d/%Y')}")
+        
+        # Sheet number
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(tb_x + 0.15*inch, tb_y + 0.2*inch, 
+                    f"Sheet {self.sheet_number} of {self.total_sheets}")
+    
+    def _draw_title_block_static(self):
+        """Title block frame and fixed text, in the bottom-right corner"""
+        c = self.c
+        tb_x = self.page_width - MARGIN - TITLE_BLOCK_WIDTH
+        tb_y = MARGIN
+        
         # Outer border
-        c.setStrokeColor(black)
+        c.setStrokeColorRGB(*BLACK)
         c.setLineWidth(LINE_HEAVY)
         c.rect(tb_x, tb_y, TITLE_BLOCK_WIDTH, TITLE_BLOCK_HEIGHT)
         
@@ -88,22 +240,9 @@ class PermitPDFGenerator:
         c.setFont("Helvetica", 10)
         c.drawString(tb_x + 0.15*inch, tb_y + 1.85*inch, "Seattle Tip 312 Prescriptive")
         
+        # Scale
         c.setFont("Helvetica", 9)
-        # Project info
-        address_lines = self.config.site_address.split(",")
-        y_pos = tb_y + 1.3*inch
-        for line in address_lines[:2]:
-            c.drawString(tb_x + 0.15*inch, y_pos, line.strip())
-            y_pos -= 0.15*inch
-        
-        # Scale and date
         c.drawString(tb_x + 0.15*inch, tb_y + 0.85*inch, f"Scale: 1/2\" = 1'-0\"")
-        c.drawString(tb_x + 2.5*inch, tb_y + 0.85*inch, f"Date: {date.today().strftime('%m/%d/%Y')}")
-        
-        # Sheet number
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(tb_x + 0.15*inch, tb_y + 0.2*inch, 
-                    f"Sheet {self.sheet_number} of {self.total_sheets}")
         
         # Kolmo info
         c.setFont("Helvetica", 8)
@@ -113,17 +252,17 @@ class PermitPDFGenerator:
     def _draw_border(self):
         """Draw sheet border"""
         c = self.c
-        c.setStrokeColor(black)
+        c.setStrokeColorRGB(*BLACK)
         c.setLineWidth(LINE_HEAVY)
         c.rect(MARGIN, MARGIN, 
                self.page_width - 2*MARGIN, 
                self.page_height - 2*MARGIN)
     
+    @_canvas_phase("pdf.framing_plan")
     def _draw_framing_plan(self):
         """Sheet 1: Top-down framing plan"""
         c = self.c
-        self._draw_border()
-        self._draw_title_block()
+        self._draw_sheet_frame()
         
         # Calculate drawing origin (center the deck in available space)
         draw_area_width = self.page_width - 2*MARGIN - TITLE_BLOCK_WIDTH - 1*inch
@@ -152,7 +291,7 @@ class PermitPDFGenerator:
         depth = self.config.depth_ft
         
         # === DECK OUTLINE ===
-        c.setStrokeColor(black)
+        c.setStrokeColorRGB(*BLACK)
         c.setLineWidth(LINE_HEAVY)
         
         # Perimeter
@@ -172,12 +311,21 @@ class PermitPDFGenerator:
             c.drawString(lx2 + 0.1*inch, ly - 0.05*inch, 
                         f"LEDGER ({self.structure.joist_size})")
         
+        # Each member class below is one path with a single stroke, and
+        # line width/dash are set once per class rather than per member.
+        # Members are streamed (iter_members) straight into the path, so
+        # lazy structures are never built into lists here
+        
         # === JOISTS ===
+        def joist_lines():
+            for joist in iter_members(self.structure.joists):
+                jx, jy1 = to_draw(joist.x_ft, joist.y_start_ft)
+                _, jy2 = to_draw(joist.x_ft, joist.y_end_ft)
+                yield jx, jy1, jx, jy2
+        
         c.setLineWidth(LINE_LIGHT)
-        for joist in self.structure.joists:
-            jx, jy1 = to_draw(joist.x_ft, joist.y_start_ft)
-            _, jy2 = to_draw(joist.x_ft, joist.y_end_ft)
-            c.line(jx, jy1, jx, jy2)
+        if self.structure.joists:
+            c.lines(joist_lines())
         
         # Joist spacing callout (at midpoint)
         if len(self.structure.joists) >= 2:
@@ -186,43 +334,52 @@ class PermitPDFGenerator:
             jx2, _ = to_draw(self.structure.joists[mid_idx].x_ft, depth/2)
             
             c.setLineWidth(LINE_HAIRLINE)
-            c.line(jx1, jy - 0.3*inch, jx1, jy + 0.3*inch)
-            c.line(jx2, jy - 0.3*inch, jx2, jy + 0.3*inch)
-            c.line(jx1, jy, jx2, jy)
+            c.lines([
+                (jx1, jy - 0.3*inch, jx1, jy + 0.3*inch),
+                (jx2, jy - 0.3*inch, jx2, jy + 0.3*inch),
+                (jx1, jy, jx2, jy),
+            ])
             
             c.setFont("Helvetica", 7)
             c.drawCentredString((jx1+jx2)/2, jy + 0.15*inch, 
                                f"{self.structure.joist_spacing_in}\" O.C. TYP")
         
         # === BEAM (dashed - below joists) ===
-        c.setLineWidth(LINE_MEDIUM)
-        c.setDash(6, 3)
-        for beam in self.structure.beams:
+        beam_lines = []
+        for beam in iter_members(self.structure.beams):
             bx1, by = to_draw(beam.x_start_ft, beam.y_ft)
             bx2, _ = to_draw(beam.x_end_ft, beam.y_ft)
-            c.line(bx1, by, bx2, by)
+            beam_lines.append((bx1, by, bx2, by))
+        
+        if beam_lines:
+            c.setLineWidth(LINE_MEDIUM)
+            c.setDash(6, 3)
+            c.lines(beam_lines)
+            c.setDash()  # Reset
             
-            # Label
-            c.setDash()
+            # Labels
             c.setFont("Helvetica", 8)
-            beam_label = f"BEAM ({self.structure.beam_ply}-{self.structure.beam_size})"
-            c.drawString(bx2 + 0.1*inch, by - 0.05*inch, beam_label)
-            c.setDash(6, 3)
-        
-        c.setDash()  # Reset
+            beam_label = f"BEAM ({beam_config_name(self.structure.beam_size, self.structure.beam_ply)})"
+            for _, by, bx2, _ in beam_lines:
+                c.drawString(bx2 + 0.1*inch, by - 0.05*inch, beam_label)
         
         # === FOOTINGS ===
         c.setLineWidth(LINE_MEDIUM)
         footing_radius = self._to_scale(self.structure.footing_diameter_in / 12 / 2)
         
-        for footing in self.structure.footings:
+        mark = footing_radius*0.5
+        
+        footing_path = c.beginPath()
+        for footing in iter_members(self.structure.footings):
             fx, fy = to_draw(footing.x_ft, footing.y_ft)
-            c.circle(fx, fy, footing_radius)
+            footing_path.circle(fx, fy, footing_radius)
             # X mark inside
-            c.line(fx - footing_radius*0.5, fy - footing_radius*0.5,
-                   fx + footing_radius*0.5, fy + footing_radius*0.5)
-            c.line(fx - footing_radius*0.5, fy + footing_radius*0.5,
-                   fx + footing_radius*0.5, fy - footing_radius*0.5)
+            footing_path.moveTo(fx - mark, fy - mark)
+            footing_path.lineTo(fx + mark, fy + mark)
+            footing_path.moveTo(fx - mark, fy + mark)
+            footing_path.lineTo(fx + mark, fy - mark)
+        if self.structure.footings:
+            c.drawPath(footing_path, stroke=1, fill=0)
         
         # === DIMENSIONS ===
         self._draw_dimension_horizontal(
@@ -247,7 +404,7 @@ class PermitPDFGenerator:
         c.setFont("Helvetica", 9)
         notes = [
             f"1. Joists: {self.structure.joist_size} at {self.structure.joist_spacing_in}\" O.C.",
-            f"2. Beam: {self.structure.beam_ply}-{self.structure.beam_size}",
+            f"2. Beam: {beam_config_name(self.structure.beam_size, self.structure.beam_ply)}",
             f"3. Posts: {self.structure.post_size}",
             f"4. Footings: {self.structure.footing_diameter_in}\" dia. x {self.config.frost_depth_in}\" deep",
             f"5. Ledger: {self.structure.joist_size}, attach per IRC Table R507.9.1.3",
@@ -258,11 +415,11 @@ class PermitPDFGenerator:
         for i, note in enumerate(notes):
             c.drawString(notes_x, notes_y - (i+1)*0.2*inch, note)
     
+    @_canvas_phase("pdf.section_and_details")
     def _draw_section_and_details(self):
         """Sheet 2: Cross section and connection details"""
         c = self.c
-        self._draw_border()
-        self._draw_title_block()
+        self._draw_sheet_frame()
         
         # Section drawing origin
         section_origin_x = MARGIN + 4*inch
@@ -313,12 +470,12 @@ class PermitPDFGenerator:
         
         # === HOUSE WALL (left side) ===
         c.setLineWidth(LINE_HEAVY)
-        c.setFillColor(lightgrey)
+        c.setFillColorRGB(*LIGHT_GREY)
         wx, wy = to_draw(-0.5, 0)
         wall_width = 0.5 * inch
         wall_height = self._to_scale(height + 2)
         c.rect(wx - wall_width, wy, wall_width, wall_height, fill=1)
-        c.setFillColor(white)
+        c.setFillColorRGB(*WHITE)
         
         c.setFont("Helvetica", 8)
         c.drawString(wx - wall_width - 0.5*inch, wy + wall_height/2, "HOUSE")
@@ -385,6 +542,16 @@ class PermitPDFGenerator:
         c.drawString(fx1 + 0.15*inch, (fy1+fy2)/2, f"{footing.depth_in}\"")
         
         # === GENERAL NOTES ===
+        self._draw_general_notes()
+    
+    @_canvas_phase("pdf.general_notes")
+    def _draw_general_notes(self):
+        """General notes block, from FORM_GENERAL_NOTES"""
+        self._use_form(FORM_GENERAL_NOTES, self._draw_general_notes_static)
+    
+    def _draw_general_notes_static(self):
+        """Fixed general notes text (FORM_GENERAL_NOTES)"""
+        c = self.c
         notes_x = self.page_width - MARGIN - TITLE_BLOCK_WIDTH - 3.5*inch
         notes_y = self.page_height - MARGIN - 1*inch
         
@@ -392,42 +559,29 @@ class PermitPDFGenerator:
         c.drawString(notes_x, notes_y, "GENERAL NOTES:")
         
         c.setFont("Helvetica", 8)
-        notes = [
-            "1. Design per Seattle Tip 312 Prescriptive Standards",
-            "2. All lumber: Pressure treated SPF #2 or DF-L #2 min.",
-            "3. All hardware: Hot-dipped galvanized or stainless steel",
-            "4. Ledger: 1/2\" lag screws at 16\" O.C., staggered",
-            "5. Joist hangers: Simpson LUS210 or equivalent at ledger",
-            "6. Post base: Simpson PBS44 or equivalent",
-            "7. Post cap: Simpson BC4 or equivalent",
-            "8. Beam-to-post: Through-bolt with 1/2\" carriage bolts",
-            "9. Verify all dimensions in field before construction",
-            "10. Obtain required inspections per SDCI",
-        ]
-        
-        for i, note in enumerate(notes):
+        for i, note in enumerate(GENERAL_NOTES):
             c.drawString(notes_x, notes_y - (i+1)*0.18*inch, note)
     
     def _draw_dimension_horizontal(self, c, origin_x, origin_y, 
                                    x1_ft, x2_ft, y_ft, text):
         """Draw a horizontal dimension line"""
         c.setLineWidth(LINE_HAIRLINE)
-        c.setStrokeColor(black)
+        c.setStrokeColorRGB(*BLACK)
         
         dx1 = origin_x + self._to_scale(x1_ft)
         dx2 = origin_x + self._to_scale(x2_ft)
         dy = origin_y + self._to_scale(y_ft)
         
-        # Extension lines
-        c.line(dx1, dy - 0.1*inch, dx1, dy + 0.1*inch)
-        c.line(dx2, dy - 0.1*inch, dx2, dy + 0.1*inch)
-        
-        # Dimension line
-        c.line(dx1, dy, dx2, dy)
-        
-        # Arrows (tick marks)
-        c.line(dx1, dy - 0.08*inch, dx1, dy + 0.08*inch)
-        c.line(dx2, dy - 0.08*inch, dx2, dy + 0.08*inch)
+        c.lines([
+            # Extension lines
+            (dx1, dy - 0.1*inch, dx1, dy + 0.1*inch),
+            (dx2, dy - 0.1*inch, dx2, dy + 0.1*inch),
+            # Dimension line
+            (dx1, dy, dx2, dy),
+            # Arrows (tick marks)
+            (dx1, dy - 0.08*inch, dx1, dy + 0.08*inch),
+            (dx2, dy - 0.08*inch, dx2, dy + 0.08*inch),
+        ])
         
         # Text
         c.setFont("Helvetica", 9)
@@ -437,18 +591,19 @@ class PermitPDFGenerator:
                                  z1_ft, z2_ft, y_ft, text):
         """Draw a vertical dimension line"""
         c.setLineWidth(LINE_HAIRLINE)
-        c.setStrokeColor(black)
+        c.setStrokeColorRGB(*BLACK)
         
         dx = origin_x + self._to_scale(y_ft)
         dz1 = origin_y + self._to_scale(z1_ft)
         dz2 = origin_y + self._to_scale(z2_ft)
         
-        # Extension lines
-        c.line(dx - 0.1*inch, dz1, dx + 0.1*inch, dz1)
-        c.line(dx - 0.1*inch, dz2, dx + 0.1*inch, dz2)
-        
-        # Dimension line
-        c.line(dx, dz1, dx, dz2)
+        c.lines([
+            # Extension lines
+            (dx - 0.1*inch, dz1, dx + 0.1*inch, dz1),
+            (dx - 0.1*inch, dz2, dx + 0.1*inch, dz2),
+            # Dimension line
+            (dx, dz1, dx, dz2),
+        ])
         
         # Text (rotated)
         c.saveState()
@@ -459,7 +614,42 @@ class PermitPDFGenerator:
         c.restoreState()
 
 
-def generate_permit_pdf(structure: DeckStructure, output_path: str | Path) -> Path:
+def generate_permit_pdf(
+    structure: DeckStructure,
+    output_path: str | Path,
+    invariant: bool = False
+) -> Path:
     """Convenience function to generate permit PDF"""
-    generator = PermitPDFGenerator(structure, output_path)
+    generator = PermitPDFGenerator(structure, output_path, invariant=invariant)
     return generator.generate()
+
+
+def render_permit_pdf(structure: DeckStructure, invariant: bool = False) -> bytes:
+    """Permit PDF as bytes, without touching the filesystem"""
+    return PermitPDFGenerator(structure, invariant=invariant).to_bytes()
+
+
+def stream_permit_pdf(
+    structure: DeckStructure,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    invariant: bool = False
+) -> Iterator[memoryview]:
+    """Permit PDF as an iterator of chunks, for streamed HTTP responses"""
+    return PermitPDFGenerator(structure, invariant=invariant).iter_chunks(chunk_size)
+
+
+def generate_permit_binder(
+    structures: Iterable[DeckStructure],
+    output_path: str | Path,
+    invariant: bool = False
+) -> Path:
+    """
+    Several permit packages in one PDF. The static sheet layers are stored
+    once for the whole binder rather than once per package.
+    """
+    output_path = Path(output_path)
+    c = _new_canvas(str(output_path), invariant)
+    for structure in structures:
+        PermitPDFGenerator(structure, invariant=invariant).draw_package(c)
+    c.save()
+    return output_path
@@ -0,0 +1,256 @@
+"""
+Precomputed instant-quote price grid.
+
+The website "instant estimate" widget needs sub-millisecond answers. A build
+step sweeps width x depth x height x decking x railing through the engine and
+pricing (vectorized) and writes quote totals and compliance flags into a dense
+binary grid. Lookups memory-map the file, so opening it reads only the small
+header; pages are faulted in as cells are touched.
+
+Grid assumptions: ledger-attached deck (direct), default soil and frost depth,
+no stairs, and railing (when selected) along the open perimeter
+(width + 2 x depth). Anything off the grid falls back to the full engine, as
+does every lookup once the code tables or price book have been reloaded to a
+version other than the one the grid was built from.
+
+File layout: MAGIC, uint32 header length, JSON header, zero padding to a
+64-byte boundary, then totals (float64) and compliant (uint8) arrays in
+C order with shape (widths, depths, heights, decking types, railing types).
+"""
+
+import argparse
+import json
+import os
+import struct
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from domain.batch import generate_structures_batch
+from domain.code_engine import generate_structure
+from domain.models import SiteInput, DeckingType, RailingType, LedgerAttachment
+from domain.tables import code_tables
+from services.batch_pricing import calculate_quotes_batch
+from services.pricing import calculate_quote, price_book
+
+
+MAGIC = b"KOLMOGRD"
+FORMAT_VERSION = 2
+ALIGNMENT = 64
+
+DEFAULT_WIDTHS = [float(w) for w in range(6, 61, 2)]
+DEFAULT_DEPTHS = [float(d) for d in range(4, 25, 2)]
+DEFAULT_HEIGHTS = [float(h) for h in range(1, 15)]
+
+
+@dataclass
+class InstantEstimate:
+    """Answer from InstantQuoteGrid.estimate"""
+    total: float
+    compliant: bool
+    source: str             # "grid" or "engine"
+
+
+def grid_railing_lf(width_ft: float, depth_ft: float, railing_type: RailingType) -> float:
+    """Railing length assumed by the grid: the open perimeter, if railing is selected"""
+    if railing_type == RailingType.NONE:
+        return 0.0
+    return width_ft + 2 * depth_ft
+
+
+def grid_site_input(
+    width_ft: float,
+    depth_ft: float,
+    height_ft: float,
+    decking_type: DeckingType,
+    railing_type: RailingType
+) -> SiteInput:
+    """SiteInput for a widget query under the grid assumptions"""
+    return SiteInput(
+        width_ft=width_ft,
+        depth_ft=depth_ft,
+        height_ft=height_ft,
+        ledger_attachment=LedgerAttachment.DIRECT,
+        decking_type=decking_type,
+        railing_type=railing_type,
+        railing_lf=grid_railing_lf(width_ft, depth_ft, railing_type),
+    )
+
+
+def build_price_grid(
+    path: str | Path,
+    widths: Sequence[float] = DEFAULT_WIDTHS,
+    depths: Sequence[float] = DEFAULT_DEPTHS,
+    heights: Sequence[float] = DEFAULT_HEIGHTS,
+    decking_types: Sequence[DeckingType] = tuple(DeckingType),
+    railing_types: Sequence[RailingType] = tuple(RailingType),
+) -> Path:
+    """Sweep the grid through the batch engine and pricing and write it to path"""
+    path = Path(path)
+    for name, axis in (("widths", widths), ("depths", depths), ("heights", heights)):
+        if list(axis) != sorted(set(axis)):
+            raise ValueError(f"{name} must be strictly increasing")
+
+    w, d, h = np.meshgrid(
+        np.asarray(widths, dtype=float),
+        np.asarray(depths, dtype=float),
+        np.asarray(heights, dtype=float),
+        indexing="ij",
+    )
+    w, d, h = w.ravel(), d.ravel(), h.ravel()
+    tables, book = code_tables(), price_book()
+    structures = generate_structures_batch(w, d, h, LedgerAttachment.DIRECT, tables=tables)
+
+    shape = (len(widths), len(depths), len(heights), len(decking_types), len(railing_types))
+    totals = np.empty(shape, dtype=np.float64)
+    compliant = np.empty(shape, dtype=np.uint8)
+    cell_shape = shape[:3]
+    for k, decking_type in enumerate(decking_types):
+        for r, railing_type in enumerate(railing_types):
+            railing_lf = w + 2 * d if railing_type != RailingType.NONE else 0.0
+            quotes = calculate_quotes_batch(
+                structures,
+                decking_type=decking_type,
+                railing_type=railing_type,
+                railing_lf=railing_lf,
+                book=book,
+            )
+            totals[..., k, r] = quotes["total"].reshape(cell_shape)
+            compliant[..., k, r] = structures.compliant.reshape(cell_shape)
+
+    header = {
+        "version": FORMAT_VERSION,
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "code_tables_version": tables.version,
+        "price_book_version": book.version,
+        "widths": [float(x) for x in widths],
+        "depths": [float(x) for x in depths],
+        "heights": [float(x) for x in heights],
+        "decking_types": [t.value for t in decking_types],
+        "railing_types": [t.value for t in railing_types],
+        "shape": list(shape),
+    }
+    header_bytes = json.dumps(header).encode()
+    prefix_len = len(MAGIC) + 4 + len(header_bytes)
+    padding = -prefix_len % ALIGNMENT
+
+    # Write to a temp file and rename, so readers never see a partial grid
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * padding)
+        f.write(totals.tobytes(order="C"))
+        f.write(compliant.tobytes(order="C"))
+    os.replace(tmp_path, path)
+    return path
+
+
+def _bracket(axis: list[float], value: float) -> tuple[int, float] | None:
+    """(lower index, fraction toward the next point), or None outside the axis"""
+    if not axis[0] <= value <= axis[-1]:
+        return None
+    i = bisect_right(axis, value) - 1
+    if axis[i] == value:
+        return i, 0.0   # On a grid point (including the last): no upper neighbour needed
+    return i, (value - axis[i]) / (axis[i + 1] - axis[i])
+
+
+class InstantQuoteGrid:
+    """Memory-mapped price grid with interpolating lookups"""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            magic = f.read(len(MAGIC))
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not an instant-quote grid")
+            (header_len,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(header_len))
+        if header["version"] != FORMAT_VERSION:
+            raise ValueError(
+                f"{self.path} has grid format v{header['version']}, expected v{FORMAT_VERSION}"
+            )
+
+        self.header = header
+        self.widths: list[float] = header["widths"]
+        self.depths: list[float] = header["depths"]
+        self.heights: list[float] = header["heights"]
+        self._decking = {v: i for i, v in enumerate(header["decking_types"])}
+        self._railing = {v: i for i, v in enumerate(header["railing_types"])}
+
+        shape = tuple(header["shape"])
+        offset = len(MAGIC) + 4 + header_len
+        offset += -offset % ALIGNMENT
+        self.totals = np.memmap(self.path, dtype=np.float64, mode="r", offset=offset, shape=shape)
+        offset += self.totals.nbytes
+        self.compliant = np.memmap(self.path, dtype=np.uint8, mode="r", offset=offset, shape=shape)
+
+    def estimate(
+        self,
+        width_ft: float,
+        depth_ft: float,
+        height_ft: float,
+        decking_type: DeckingType = DeckingType.COMPOSITE_TREX,
+        railing_type: RailingType = RailingType.NONE
+    ) -> InstantEstimate:
+        """
+        Trilinear interpolation between the surrounding grid points. Falls back
+        to the full engine off the grid or when any grid point the estimate
+        is weighted on is non-compliant, or when the current tables are not the grid's versions.
+        """
+        if not self.is_current():
+            return self._engine(width_ft, depth_ft, height_ft, decking_type, railing_type)
+        k = self._decking.get(decking_type.value)
+        r = self._railing.get(railing_type.value)
+        brackets = (
+            _bracket(self.widths, width_ft),
+            _bracket(self.depths, depth_ft),
+            _bracket(self.heights, height_ft),
+        )
+        if k is None or r is None or None in brackets:
+            return self._engine(width_ft, depth_ft, height_ft, decking_type, railing_type)
+
+        (i, fw), (j, fd), (l, fh) = brackets
+        # Upper neighbours only where the point lies between grid points
+        i1 = i + 1 if fw > 0 else i
+        j1 = j + 1 if fd > 0 else j
+        l1 = l + 1 if fh > 0 else l
+
+        block = np.ix_((i, i1), (j, j1), (l, l1))
+        if not self.compliant[..., k, r][block].all():
+            return self._engine(width_ft, depth_ft, height_ft, decking_type, railing_type)
+
+        corners = self.totals[..., k, r][block]
+        along_w = corners[0] * (1 - fw) + corners[1] * fw
+        along_d = along_w[0] * (1 - fd) + along_w[1] * fd
+        total = along_d[0] * (1 - fh) + along_d[1] * fh
+        return InstantEstimate(total=float(total), compliant=True, source="grid")
+
+    def is_current(self) -> bool:
+        """True if the grid was built from the current code tables and price book"""
+        return (self.header["code_tables_version"] == code_tables().version
+                and self.header["price_book_version"] == price_book().version)
+
+    def _engine(self, width_ft, depth_ft, height_ft, decking_type, railing_type) -> InstantEstimate:
+        site = grid_site_input(width_ft, depth_ft, height_ft, decking_type, railing_type)
+        structure = generate_structure(site, lazy=True)
+        quote = calculate_quote(structure)
+        return InstantEstimate(total=quote.total, compliant=structure.compliant, source="engine")
+
+
+def main(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(description="Build the instant-quote price grid")
+    parser.add_argument("output", type=Path)
+    args = parser.parse_args(argv)
+    path = build_price_grid(args.output)
+    print(f"Wrote {path} ({path.stat().st_size:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,78 +3,144 @@ Deck pricing calculator for Kolmo Construction.
 Generates detailed line-item quotes from structural models.
 """
 
+import math
+import os
+from collections import Counter
 from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Mapping
+from domain.instrumentation import phase
 from domain.models import DeckStructure, DeckingType, RailingType
+from domain.span_index import beam_config_name
+from domain.tables import FrozenDict, TableSource, positive_numbers, require_version
 
+if TYPE_CHECKING:
+    from services.cut_list import CutList
 
-# Material prices (per linear foot unless noted)
-MATERIAL_PRICES: dict[str, float] = {
-    # Framing lumber (pressure treated)
-    "2x6_pt_lf": 1.25,
-    "2x8_pt_lf": 1.55,
-    "2x10_pt_lf": 1.85,
-    "2x12_pt_lf": 2.40,
-    "4x4_pt_lf": 2.10,
-    "4x6_pt_lf": 3.20,
-    "6x6_pt_lf": 4.80,
-    
-    # Decking (per linear foot)
-    "trex_transcend_lf": 4.50,
-    "trex_select_lf": 3.80,
-    "timbertech_azek_lf": 5.20,
-    "timbertech_pro_lf": 4.00,
-    "cedar_decking_lf": 3.40,
-    "pt_decking_lf": 1.80,
-    
-    # Hardware (each)
-    "concrete_60lb_bag": 6.50,
-    "joist_hanger": 3.50,
-    "joist_hanger_lus210": 4.25,
-    "post_base_pb44": 18.00,
-    "post_base_pb66": 28.00,
-    "post_cap_bc4": 12.00,
-    "post_cap_bc6": 18.00,
-    "ledger_bolt_half_inch": 1.20,
-    "lag_screw_half_inch": 0.85,
-    "carriage_bolt_half_inch": 1.40,
-    "deck_screws_lb": 8.50,
-    "structural_screws_box": 45.00,
-    
-    # Railing (per linear foot)
-    "cable_rail_lf": 45.00,
-    "glass_rail_lf": 120.00,
-    "aluminum_rail_lf": 55.00,
-    "wood_rail_cedar_lf": 25.00,
-    "wood_rail_pt_lf": 18.00,
-    
-    # Stairs
-    "stair_stringer_each": 35.00,
-    "stair_tread_composite_each": 28.00,
-    "stair_tread_cedar_each": 18.00,
+
+# Price book: material prices (per linear foot unless noted), labor rates and
+# Seattle permit fees, loaded from a versioned data file (see domain.tables)
+PRICE_BOOK_PATH = Path(
+    os.environ.get("KOLMO_PRICE_BOOK", Path(__file__).parent / "data" / "price_book.json")
+)
+
+# Business
+WASTE_FACTOR = 1.10     # 10% waste on materials
+MARGIN = 0.25           # 25% gross margin
+DEFAULT_LUMBER_PRICE = 2.00  # Per LF, for sizes missing from the price book
+
+# Concrete
+CONCRETE_BAG_CUFT = 0.45   # Yield of one 60 lb bag
+
+# Material price keys for customer selections
+DECKING_PRICE_KEYS: dict[DeckingType, str] = {
+    DeckingType.COMPOSITE_TREX: "trex_transcend_lf",
+    DeckingType.COMPOSITE_TIMBERTECH: "timbertech_azek_lf",
+    DeckingType.CEDAR: "cedar_decking_lf",
+    DeckingType.PRESSURE_TREATED: "pt_decking_lf",
 }
 
-# Labor rates
-LABOR_RATES: dict[str, float] = {
-    "footing_each": 175.00,           # Dig, form, pour, strip
-    "framing_sqft": 14.00,            # Joists, beams, ledger, rim
-    "decking_composite_sqft": 9.00,   # Composite install
-    "decking_wood_sqft": 7.00,        # Wood install
-    "railing_lf": 35.00,              # Any type, includes posts
-    "stairs_tread_each": 225.00,      # Per tread installed
-    "permit_filing": 250.00,          # Admin time for permit prep/filing
-    "cleanup_sqft": 0.50,             # Site cleanup
+RAILING_PRICE_KEYS: dict[RailingType, str] = {
+    RailingType.CABLE: "cable_rail_lf",
+    RailingType.GLASS: "glass_rail_lf",
+    RailingType.ALUMINUM: "aluminum_rail_lf",
+    RailingType.WOOD: "wood_rail_cedar_lf",
 }
 
-# Permit fees (Seattle)
-PERMIT_FEES: dict[str, float] = {
-    "sdci_base": 197.00,              # Base permit fee
-    "sdci_per_1000_valuation": 14.50, # Per $1,000 of project value
-    "plan_review_multiplier": 0.65,   # 65% of permit fee
+COMPOSITE_DECKING = (DeckingType.COMPOSITE_TREX, DeckingType.COMPOSITE_TIMBERTECH)
+
+# Keys every price book must define (lumber sizes fall back to DEFAULT_LUMBER_PRICE)
+REQUIRED_MATERIAL_KEYS = (
+    *DECKING_PRICE_KEYS.values(), *RAILING_PRICE_KEYS.values(),
+    "concrete_60lb_bag", "post_base_pb44", "post_cap_bc4", "joist_hanger",
+    "ledger_bolt_half_inch", "deck_screws_lb", "stair_stringer_each", "stair_tread_composite_each",
+)
+REQUIRED_LABOR_KEYS = (
+    "footing_each", "framing_sqft", "decking_composite_sqft", "decking_wood_sqft",
+    "railing_lf", "stairs_tread_each", "permit_filing", "cleanup_sqft",
+)
+REQUIRED_PERMIT_KEYS = ("sdci_base", "sdci_per_1000_valuation", "plan_review_multiplier")
+
+
+@dataclass(frozen=True)
+class PriceBook:
+    """One version of the price book (read-only)"""
+    version: str
+    material_prices: Mapping[str, float]
+    labor_rates: Mapping[str, float]
+    permit_fees: Mapping[str, float]
+    
+    def changes_from(
+        self,
+        older: "PriceBook"
+    ) -> tuple[dict[str, float], dict[str, float], dict[str, float]]:
+        """(material, labor, permit fee) keys whose value differs from older"""
+        return (
+            {k: v for k, v in self.material_prices.items() if older.material_prices.get(k) != v},
+            {k: v for k, v in self.labor_rates.items() if older.labor_rates.get(k) != v},
+            {k: v for k, v in self.permit_fees.items() if older.permit_fees.get(k) != v},
+        )
+    
+    def with_changes(
+        self,
+        material_prices: Mapping[str, float] | None = None,
+        labor_rates: Mapping[str, float] | None = None,
+        permit_fees: Mapping[str, float] | None = None
+    ) -> "PriceBook":
+        """
+        Copy with the given keys overridden: an ad-hoc adjustment, so it has no
+        version and quotes priced from it keep their price_book_version.
+        """
+        return PriceBook(
+            version="",
+            material_prices=FrozenDict({**self.material_prices, **(material_prices or {})}),
+            labor_rates=FrozenDict({**self.labor_rates, **(labor_rates or {})}),
+            permit_fees=FrozenDict({**self.permit_fees, **(permit_fees or {})}),
+        )
+
+
+def compile_price_book(data: Mapping) -> PriceBook:
+    """
+    Compile a price book document:
+
+        {"version": "...", "material_prices": {...}, "labor_rates": {...}, "permit_fees": {...}}
+    """
+    book = PriceBook(
+        version=require_version(data),
+        material_prices=positive_numbers(data["material_prices"], "material_prices"),
+        labor_rates=positive_numbers(data["labor_rates"], "labor_rates"),
+        permit_fees=positive_numbers(data["permit_fees"], "permit_fees"),
+    )
+    for table, required in ((book.material_prices, REQUIRED_MATERIAL_KEYS),
+                            (book.labor_rates, REQUIRED_LABOR_KEYS),
+                            (book.permit_fees, REQUIRED_PERMIT_KEYS)):
+        missing = [key for key in required if key not in table]
+        if missing:
+            raise ValueError(f"price book is missing {', '.join(missing)}")
+    return book
+
+
+PRICE_BOOK: TableSource[PriceBook] = TableSource(PRICE_BOOK_PATH, compile_price_book)
+
+
+def price_book() -> PriceBook:
+    """Current price book snapshot"""
+    return PRICE_BOOK.current()
+
+
+_BOOK_ATTRS = {
+    "MATERIAL_PRICES": "material_prices",
+    "LABOR_RATES": "labor_rates",
+    "PERMIT_FEES": "permit_fees",
 }
 
-# Business
-WASTE_FACTOR = 1.10     # 10% waste on materials
-MARGIN = 0.25           # 25% gross margin
+
+def __getattr__(name: str):
+    """MATERIAL_PRICES, LABOR_RATES and PERMIT_FEES from the current price book"""
+    attr = _BOOK_ATTRS.get(name)
+    if attr is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(price_book(), attr)
 
 
 @dataclass
@@ -87,9 +153,19 @@ class LineItem:
     material_cost: float
     labor_cost: float
     
+    # Price dependencies: cost = sum(qty * rate) over material price / labor rate keys
+    material_terms: dict[str, float] = field(default_factory=dict)
+    labor_terms: dict[str, float] = field(default_factory=dict)
+    waste_factor: float = 1.0     # Applied to material cost
+    
     @property
     def total(self) -> float:
         return self.material_cost + self.labor_cost
+    
+    @property
+    def price_keys(self) -> set[str]:
+        """Material price and labor rate keys this item is priced from"""
+        return set(self.material_terms) | set(self.labor_terms)
 
 
 @dataclass
@@ -107,226 +183,652 @@ class Quote:
     # Metadata
     deck_sqft: float = 0.0
     price_per_sqft: float = 0.0
+    price_book_version: str = ""  # Published price book the quote was last priced from
+    # Prices the line items were priced from; repricing applies changes on top of these
+    price_book: PriceBook | None = field(default=None, repr=False, compare=False)
+
 
+def _material_price(key: str, prices: Mapping[str, float]) -> float:
+    """Price for a material key (lumber sizes not in the book use the default)"""
+    return prices.get(key, DEFAULT_LUMBER_PRICE)
 
-def _get_lumber_price(nominal: str) -> float:
+
+def lumber_price_key(nominal: str) -> str:
+    """Price book material key for a nominal lumber size (e.g. "2x10" -> "2x10_pt_lf")"""
+    return f"{nominal.lower()}_pt_lf"
+
+
+def _get_lumber_price(nominal: str, book: PriceBook | None = None) -> float:
     """Get price per LF for lumber size"""
-    key = f"{nominal.lower()}_pt_lf"
-    return MATERIAL_PRICES.get(key, 2.00)
+    return _material_price(lumber_price_key(nominal), (book or price_book()).material_prices)
 
 
-def _get_decking_price(decking_type: DeckingType) -> float:
+def _get_decking_price(decking_type: DeckingType, book: PriceBook | None = None) -> float:
     """Get decking material price per LF"""
-    mapping = {
-        DeckingType.COMPOSITE_TREX: MATERIAL_PRICES["trex_transcend_lf"],
-        DeckingType.COMPOSITE_TIMBERTECH: MATERIAL_PRICES["timbertech_azek_lf"],
-        DeckingType.CEDAR: MATERIAL_PRICES["cedar_decking_lf"],
-        DeckingType.PRESSURE_TREATED: MATERIAL_PRICES["pt_decking_lf"],
-    }
-    return mapping.get(decking_type, MATERIAL_PRICES["trex_transcend_lf"])
+    key = DECKING_PRICE_KEYS.get(decking_type, DECKING_PRICE_KEYS[DeckingType.COMPOSITE_TREX])
+    return (book or price_book()).material_prices[key]
 
 
-def _get_railing_price(railing_type: RailingType) -> float:
+def _get_railing_price(railing_type: RailingType, book: PriceBook | None = None) -> float:
     """Get railing material price per LF"""
-    mapping = {
-        RailingType.CABLE: MATERIAL_PRICES["cable_rail_lf"],
-        RailingType.GLASS: MATERIAL_PRICES["glass_rail_lf"],
-        RailingType.ALUMINUM: MATERIAL_PRICES["aluminum_rail_lf"],
-        RailingType.WOOD: MATERIAL_PRICES["wood_rail_cedar_lf"],
-        RailingType.NONE: 0.0,
-    }
-    return mapping.get(railing_type, 0.0)
+    key = RAILING_PRICE_KEYS.get(railing_type)
+    return (book or price_book()).material_prices[key] if key else 0.0
+
+
+def _line_item(
+    category: str,
+    description: str,
+    quantity: float,
+    unit: str,
+    material_terms: dict[str, float] | None = None,
+    labor_terms: dict[str, float] | None = None,
+    waste_factor: float = 1.0
+) -> LineItem:
+    """Build a line item from its price terms (costs are filled in by _price_item)"""
+    return LineItem(
+        category=category,
+        description=description,
+        quantity=quantity,
+        unit=unit,
+        material_cost=0,
+        labor_cost=0,
+        material_terms=material_terms or {},
+        labor_terms=labor_terms or {},
+        waste_factor=waste_factor,
+    )
+
+
+def _price_item(item: LineItem, material_prices: Mapping, labor_rates: Mapping):
+    """(Re)compute an item's costs from its terms"""
+    if item.material_terms:
+        materials = 0
+        for key, qty in item.material_terms.items():
+            materials += qty * _material_price(key, material_prices)
+        item.material_cost = materials * item.waste_factor
+    if item.labor_terms:
+        labor = 0
+        for key, qty in item.labor_terms.items():
+            labor += qty * labor_rates[key]
+        item.labor_cost = labor
+
+
+# ===== LINE ITEM SECTIONS =====
+
+def footing_volume_cuft(diameter_in, depth_in):
+    """Concrete volume of a round pier footing (plain arithmetic, so it also takes NumPy arrays)"""
+    return math.pi * (diameter_in / 24) ** 2 * depth_in / 12
 
 
-def calculate_quote(structure: DeckStructure) -> Quote:
+def _concrete_bags(structure: DeckStructure) -> int:
     """
-    Generate detailed quote from structural model.
+    Bags of concrete for the footings, each footing rounded up to whole bags
+    from its own volume. Uniform and tributary sizing are priced the same way,
+    so smaller tributary footings always buy less concrete.
     """
-    quote = Quote()
-    site = structure.input
-    
-    width = site.width_ft
-    depth = site.depth_ft
-    sqft = width * depth
-    quote.deck_sqft = sqft
-    
-    # ===== FOOTINGS =====
+    layout = structure.layout
+    if layout is None:
+        sizes = Counter((f.diameter_in, f.depth_in) for f in structure.footings)
+    elif layout.footing_diameters_in is None:
+        sizes = {(layout.footing_diameter_in, layout.footing_depth_in): len(structure.footings)}
+    else:
+        sizes = Counter((d, layout.footing_depth_in) for d in layout.footing_diameters_in)
+    return sum(
+        count * math.ceil(footing_volume_cuft(diameter, depth) / CONCRETE_BAG_CUFT)
+        for (diameter, depth), count in sizes.items()
+    )
+
+
+# Price terms of each section, shared by calculate_quote() and
+# services.batch_pricing: quantities are scalars for one deck or NumPy columns
+# for many, and price keys that vary by deck may be any hashable stand-in the
+# batch pricer resolves per row.
+
+def _footings_terms(footing_count, concrete_bags) -> dict:
+    return dict(
+        material_terms={
+            "concrete_60lb_bag": concrete_bags,
+            "post_base_pb44": footing_count,  # Post bases
+        },
+        labor_terms={"footing_each": footing_count},
+        waste_factor=WASTE_FACTOR,
+    )
+
+
+def _posts_terms(post_key, post_lf, post_count) -> dict:
+    return dict(
+        material_terms={
+            post_key: post_lf,
+            "post_cap_bc4": post_count,  # Post caps
+        },
+        waste_factor=WASTE_FACTOR,  # Labor included in framing
+    )
+
+
+def _beams_terms(beam_key, beam_lf) -> dict:
+    return dict(
+        material_terms={beam_key: beam_lf},
+        waste_factor=WASTE_FACTOR,  # Labor included in framing
+    )
+
+
+def _joists_terms(joist_key, joist_lf, joist_count) -> dict:
+    return dict(
+        material_terms={
+            joist_key: joist_lf,
+            "joist_hanger": joist_count * 2,  # Both ends
+        },
+        waste_factor=WASTE_FACTOR,  # Part of framing labor below
+    )
+
+
+def _ledger_rim_lf(width_ft, depth_ft, ledger_lf):
+    """Ledger plus rim joists (two sides + outer)"""
+    rim_lf = (depth_ft * 2) + width_ft
+    return ledger_lf + rim_lf
+
+
+def _ledger_rim_terms(joist_key, framing_misc_lf, ledger_lf) -> dict:
+    return dict(
+        material_terms={
+            joist_key: framing_misc_lf,
+            "ledger_bolt_half_inch": (ledger_lf / 16) * 12,  # Ledger bolts at 16" O.C. staggered
+        },
+        waste_factor=WASTE_FACTOR,
+    )
+
+
+def _framing_labor_terms(sqft) -> dict:
+    return dict(labor_terms={"framing_sqft": sqft})
+
+
+def _decking_keys(decking_type: DeckingType) -> tuple[str, str]:
+    """(material price key, labor rate key) for a decking type"""
+    material_key = DECKING_PRICE_KEYS.get(decking_type, DECKING_PRICE_KEYS[DeckingType.COMPOSITE_TREX])
+    labor_key = "decking_composite_sqft" if decking_type in COMPOSITE_DECKING else "decking_wood_sqft"
+    return material_key, labor_key
+
+
+def _decking_terms(decking_key, labor_key, sqft) -> dict:
+    decking_lf = (sqft / (5.5 / 12))  # 5.5" wide boards
+    return dict(
+        material_terms={
+            decking_key: decking_lf,
+            "deck_screws_lb": sqft / 4,  # ~1 lb per 4 SF
+        },
+        labor_terms={labor_key: sqft},
+        waste_factor=WASTE_FACTOR,
+    )
+
+
+def _railing_selected(railing_type, railing_lf):
+    """True where railing is quoted (element-wise for columns)"""
+    return (railing_type != RailingType.NONE) & (railing_lf > 0)
+
+
+def _railing_terms(railing_key, railing_lf) -> dict:
+    return dict(
+        material_terms={railing_key: railing_lf},
+        labor_terms={"railing_lf": railing_lf},
+        waste_factor=WASTE_FACTOR,
+    )
+
+
+def _stairs_terms(stair_count) -> dict:
+    stringers = 3  # Standard 3 stringers
+    return dict(
+        material_terms={
+            "stair_stringer_each": stringers * 1.5,  # Adjusted for length
+            "stair_tread_composite_each": stair_count,
+        },
+        labor_terms={"stairs_tread_each": stair_count},
+        waste_factor=WASTE_FACTOR,
+    )
+
+
+def _cleanup_terms(sqft) -> dict:
+    return dict(labor_terms={"cleanup_sqft": sqft})
+
+
+def _footings_item(structure: DeckStructure) -> LineItem:
     footing_count = len(structure.footings)
-    bags_per_footing = 4  # ~4 bags for 18" deep x 12-16" diameter
-    
-    footing_materials = footing_count * bags_per_footing * MATERIAL_PRICES["concrete_60lb_bag"]
-    footing_materials += footing_count * MATERIAL_PRICES["post_base_pb44"]  # Post bases
-    footing_labor = footing_count * LABOR_RATES["footing_each"]
-    
-    quote.line_items.append(LineItem(
+    site = structure.input
+    layout = structure.layout
+    if layout is not None and layout.footing_diameters_in:
+        diameter = f"{min(layout.footing_diameters_in)}-{structure.footing_diameter_in}\""
+    else:
+        diameter = f"{structure.footing_diameter_in}\""
+    return _line_item(
         category="Footings",
-        description=f"{footing_count} concrete pier footings, {structure.footing_diameter_in}\" dia x {site.frost_depth_in}\" deep",
+        description=f"{footing_count} concrete pier footings, {diameter} dia x {site.frost_depth_in}\" deep",
         quantity=footing_count,
         unit="each",
-        material_cost=footing_materials * WASTE_FACTOR,
-        labor_cost=footing_labor
-    ))
-    
-    # ===== POSTS =====
-    post_lf = sum(p.height_ft for p in structure.posts)
-    post_price = _get_lumber_price(structure.post_size)
-    post_materials = post_lf * post_price
-    post_materials += len(structure.posts) * MATERIAL_PRICES["post_cap_bc4"]  # Post caps
-    
-    quote.line_items.append(LineItem(
+        **_footings_terms(footing_count, _concrete_bags(structure)),
+    )
+
+
+def _posts_item(structure: DeckStructure) -> LineItem:
+    post_count = len(structure.posts)
+    post_lf = structure.post_lf
+    return _line_item(
         category="Posts",
-        description=f"{len(structure.posts)} {structure.post_size} posts, {post_lf:.0f} LF total",
-        quantity=len(structure.posts),
+        description=f"{post_count} {structure.post_size} posts, {post_lf:.0f} LF total",
+        quantity=post_count,
         unit="each",
-        material_cost=post_materials * WASTE_FACTOR,
-        labor_cost=0  # Included in framing
-    ))
-    
-    # ===== BEAMS =====
-    beam_lf = sum((b.x_end_ft - b.x_start_ft) * b.ply for b in structure.beams)
-    beam_price = _get_lumber_price(structure.beam_size)
-    beam_materials = beam_lf * beam_price
-    
-    beam_desc = f"{structure.beam_ply}-{structure.beam_size}"
-    quote.line_items.append(LineItem(
+        **_posts_terms(lumber_price_key(structure.post_size), post_lf, post_count),
+    )
+
+
+def _beams_item(structure: DeckStructure) -> LineItem:
+    beam_lf = structure.beam_lf
+    beam_desc = beam_config_name(structure.beam_size, structure.beam_ply)
+    return _line_item(
         category="Beams",
         description=f"{beam_desc} beam, {beam_lf:.0f} LF",
         quantity=beam_lf,
         unit="LF",
-        material_cost=beam_materials * WASTE_FACTOR,
-        labor_cost=0  # Included in framing
-    ))
-    
-    # ===== JOISTS =====
-    joist_lf = sum((j.y_end_ft - j.y_start_ft) for j in structure.joists)
-    joist_price = _get_lumber_price(structure.joist_size)
-    joist_materials = joist_lf * joist_price
-    joist_materials += len(structure.joists) * 2 * MATERIAL_PRICES["joist_hanger"]  # Both ends
-    
-    quote.line_items.append(LineItem(
+        **_beams_terms(lumber_price_key(structure.beam_size), beam_lf),
+    )
+
+
+def _joists_item(structure: DeckStructure) -> LineItem:
+    joist_count = len(structure.joists)
+    joist_lf = structure.joist_lf
+    return _line_item(
         category="Joists",
-        description=f"{len(structure.joists)} {structure.joist_size} joists at {structure.joist_spacing_in}\" O.C., {joist_lf:.0f} LF",
+        description=f"{joist_count} {structure.joist_size} joists at {structure.joist_spacing_in}\" O.C., {joist_lf:.0f} LF",
         quantity=joist_lf,
         unit="LF",
-        material_cost=joist_materials * WASTE_FACTOR,
-        labor_cost=0  # Part of framing labor below
-    ))
-    
-    # ===== LEDGER & RIM =====
-    ledger_lf = width if structure.ledger else 0
-    rim_lf = (depth * 2) + width  # Two sides + outer
-    framing_misc_lf = ledger_lf + rim_lf
-    
-    misc_materials = framing_misc_lf * joist_price
-    misc_materials += (ledger_lf / 16) * 12 * MATERIAL_PRICES["ledger_bolt_half_inch"]  # Ledger bolts at 16" O.C. staggered
-    
-    quote.line_items.append(LineItem(
+        **_joists_terms(lumber_price_key(structure.joist_size), joist_lf, joist_count),
+    )
+
+
+def _ledger_rim_item(structure: DeckStructure) -> LineItem:
+    site = structure.input
+    ledger_lf = site.width_ft if structure.ledger else 0
+    framing_misc_lf = _ledger_rim_lf(site.width_ft, site.depth_ft, ledger_lf)
+    return _line_item(
         category="Ledger & Rim",
         description=f"Ledger board and rim joists, {framing_misc_lf:.0f} LF",
         quantity=framing_misc_lf,
         unit="LF",
-        material_cost=misc_materials * WASTE_FACTOR,
-        labor_cost=0
-    ))
-    
-    # ===== FRAMING LABOR (combined) =====
-    framing_labor = sqft * LABOR_RATES["framing_sqft"]
-    quote.line_items.append(LineItem(
+        **_ledger_rim_terms(lumber_price_key(structure.joist_size), framing_misc_lf, ledger_lf),
+    )
+
+
+def _framing_labor_item(structure: DeckStructure) -> LineItem:
+    sqft = structure.input.width_ft * structure.input.depth_ft
+    return _line_item(
         category="Framing Labor",
         description=f"Complete framing installation, {sqft:.0f} SF",
         quantity=sqft,
         unit="SF",
-        material_cost=0,
-        labor_cost=framing_labor
-    ))
-    
-    # ===== DECKING =====
-    decking_lf = (sqft / (5.5 / 12))  # 5.5" wide boards
-    decking_price = _get_decking_price(site.decking_type)
-    decking_materials = decking_lf * decking_price
-    decking_materials += (sqft / 4) * MATERIAL_PRICES["deck_screws_lb"]  # ~1 lb per 4 SF
-    
-    is_composite = site.decking_type in [DeckingType.COMPOSITE_TREX, DeckingType.COMPOSITE_TIMBERTECH]
-    decking_labor = sqft * (LABOR_RATES["decking_composite_sqft"] if is_composite else LABOR_RATES["decking_wood_sqft"])
-    
-    quote.line_items.append(LineItem(
+        **_framing_labor_terms(sqft),
+    )
+
+
+def _decking_item(structure: DeckStructure) -> LineItem:
+    site = structure.input
+    sqft = site.width_ft * site.depth_ft
+    return _line_item(
         category="Decking",
         description=f"{site.decking_type.value} decking, {sqft:.0f} SF",
         quantity=sqft,
         unit="SF",
-        material_cost=decking_materials * WASTE_FACTOR,
-        labor_cost=decking_labor
-    ))
-    
-    # ===== RAILING (if any) =====
-    if site.railing_type != RailingType.NONE and site.railing_lf > 0:
-        railing_price = _get_railing_price(site.railing_type)
-        railing_materials = site.railing_lf * railing_price
-        railing_labor = site.railing_lf * LABOR_RATES["railing_lf"]
-        
-        quote.line_items.append(LineItem(
-            category="Railing",
-            description=f"{site.railing_type.value} railing, {site.railing_lf:.0f} LF",
-            quantity=site.railing_lf,
-            unit="LF",
-            material_cost=railing_materials * WASTE_FACTOR,
-            labor_cost=railing_labor
-        ))
-    
-    # ===== STAIRS (if any) =====
-    if site.stair_count > 0:
-        stringers = 3  # Standard 3 stringers
-        stringer_materials = stringers * MATERIAL_PRICES["stair_stringer_each"] * 1.5  # Adjusted for length
-        tread_materials = site.stair_count * MATERIAL_PRICES["stair_tread_composite_each"]
-        stair_materials = stringer_materials + tread_materials
-        stair_labor = site.stair_count * LABOR_RATES["stairs_tread_each"]
-        
-        quote.line_items.append(LineItem(
-            category="Stairs",
-            description=f"{site.stair_count}-tread staircase with 3 stringers",
-            quantity=site.stair_count,
-            unit="treads",
-            material_cost=stair_materials * WASTE_FACTOR,
-            labor_cost=stair_labor
-        ))
-    
-    # ===== CLEANUP =====
-    cleanup_labor = sqft * LABOR_RATES["cleanup_sqft"]
-    quote.line_items.append(LineItem(
+        **_decking_terms(*_decking_keys(site.decking_type), sqft),
+    )
+
+
+def _railing_item(structure: DeckStructure) -> LineItem | None:
+    site = structure.input
+    if not _railing_selected(site.railing_type, site.railing_lf):
+        return None
+    return _line_item(
+        category="Railing",
+        description=f"{site.railing_type.value} railing, {site.railing_lf:.0f} LF",
+        quantity=site.railing_lf,
+        unit="LF",
+        **_railing_terms(RAILING_PRICE_KEYS[site.railing_type], site.railing_lf),
+    )
+
+
+def _stairs_item(structure: DeckStructure) -> LineItem | None:
+    site = structure.input
+    if site.stair_count <= 0:
+        return None
+    return _line_item(
+        category="Stairs",
+        description=f"{site.stair_count}-tread staircase with 3 stringers",
+        quantity=site.stair_count,
+        unit="treads",
+        **_stairs_terms(site.stair_count),
+    )
+
+
+def _cleanup_item(structure: DeckStructure) -> LineItem:
+    sqft = structure.input.width_ft * structure.input.depth_ft
+    return _line_item(
         category="Cleanup",
         description="Site cleanup and debris removal",
         quantity=sqft,
         unit="SF",
-        material_cost=0,
-        labor_cost=cleanup_labor
-    ))
+        **_cleanup_terms(sqft),
+    )
+
+
+# Sections in quote order (railing and stairs only when selected)
+LINE_ITEM_SECTIONS = [
+    _footings_item,
+    _posts_item,
+    _beams_item,
+    _joists_item,
+    _ledger_rim_item,
+    _framing_labor_item,
+    _decking_item,
+    _railing_item,
+    _stairs_item,
+    _cleanup_item,
+]
+
+# SiteInput fields each section reads besides the structure (customer
+# selections that do not change framing). Every other field is structural:
+# changing it means a new structure and so every section.
+SECTION_INPUTS: dict[Callable, frozenset[str]] = {
+    section: frozenset() for section in LINE_ITEM_SECTIONS
+}
+SECTION_INPUTS[_decking_item] = frozenset({"decking_type"})
+SECTION_INPUTS[_railing_item] = frozenset({"railing_type", "railing_lf"})
+SECTION_INPUTS[_stairs_item] = frozenset({"stair_count"})
+
+
+def _permit_costs(project_value, permit_fees: Mapping[str, float]) -> tuple:
+    """(SDCI permit fee, plan review fee) for a project valuation"""
+    permit_fee = permit_fees["sdci_base"]
+    permit_fee += (project_value / 1000) * permit_fees["sdci_per_1000_valuation"]
+    plan_review = permit_fee * permit_fees["plan_review_multiplier"]
+    return permit_fee, plan_review
+
+
+def _margin_amount(subtotal):
+    """Margin added to a subtotal so it is MARGIN of the sell price"""
+    return subtotal * MARGIN / (1 - MARGIN)
+
+
+def _apply_permits_and_totals(quote: Quote, book: PriceBook):
+    """
+    (Re)compute the permit line from the other items' valuation, then the totals.
+    An existing permit line (always last) is updated in place.
+    """
+    permit_fees = book.permit_fees
+    labor_rates = book.labor_rates
+    items = quote.line_items
+    permit_item = items[-1] if items and items[-1].category == "Permits" else None
+    priced_items = items[:-1] if permit_item else items
     
     # ===== PERMITS =====
-    materials_subtotal = sum(li.material_cost for li in quote.line_items)
-    labor_subtotal = sum(li.labor_cost for li in quote.line_items)
+    materials_subtotal = sum(li.material_cost for li in priced_items)
+    labor_subtotal = sum(li.labor_cost for li in priced_items)
     project_value = materials_subtotal + labor_subtotal
     
-    permit_fee = PERMIT_FEES["sdci_base"]
-    permit_fee += (project_value / 1000) * PERMIT_FEES["sdci_per_1000_valuation"]
-    plan_review = permit_fee * PERMIT_FEES["plan_review_multiplier"]
-    total_permit = permit_fee + plan_review + LABOR_RATES["permit_filing"]
-    
-    quote.line_items.append(LineItem(
-        category="Permits",
-        description="SDCI permit fees + Kolmo permit preparation",
-        quantity=1,
-        unit="LS",
-        material_cost=permit_fee + plan_review,
-        labor_cost=LABOR_RATES["permit_filing"]
-    ))
+    permit_fee, plan_review = _permit_costs(project_value, permit_fees)
+    total_permit = permit_fee + plan_review + labor_rates["permit_filing"]
+    
+    if permit_item is None:
+        permit_item = LineItem(
+            category="Permits",
+            description="SDCI permit fees + Kolmo permit preparation",
+            quantity=1,
+            unit="LS",
+            material_cost=0,
+            labor_cost=0,
+            labor_terms={"permit_filing": 1},
+        )
+        items.append(permit_item)
+    permit_item.material_cost = permit_fee + plan_review
+    permit_item.labor_cost = labor_rates["permit_filing"]
     
     # ===== TOTALS =====
-    quote.materials_subtotal = sum(li.material_cost for li in quote.line_items)
-    quote.labor_subtotal = sum(li.labor_cost for li in quote.line_items)
+    quote.materials_subtotal = sum(li.material_cost for li in items)
+    quote.labor_subtotal = sum(li.labor_cost for li in items)
     quote.permit_fees = total_permit
     quote.subtotal = quote.materials_subtotal + quote.labor_subtotal
-    quote.margin_amount = quote.subtotal * MARGIN / (1 - MARGIN)
+    quote.margin_amount = _margin_amount(quote.subtotal)
     quote.total = quote.subtotal + quote.margin_amount
-    quote.price_per_sqft = quote.total / sqft
+    quote.price_per_sqft = quote.total / quote.deck_sqft
+    quote.price_book = book
+    if book.version:  # Ad-hoc adjustments (PriceBook.with_changes) keep the last real version
+        quote.price_book_version = book.version
+
+
+def calculate_quote(
+    structure: DeckStructure,
+    book: PriceBook | None = None,
+    *,
+    cut_list: "CutList | None" = None
+) -> Quote:
+    """
+    Generate detailed quote from structural model.
+    
+    book pins the price book version (default: the current snapshot, taken
+    once at the start so every line item is priced from the same version).
     
+    cut_list (services.cut_list.optimize_cut_list) prices framing lumber at
+    the stock boards actually bought instead of WASTE_FACTOR.
+    """
+    book = book or price_book()
+    stock_ratios = _stock_ratios(cut_list) if cut_list is not None else None
+    material_prices = book.material_prices
+    labor_rates = book.labor_rates
+    quote = Quote()
+    site = structure.input
+    quote.deck_sqft = site.width_ft * site.depth_ft
+    
+    for section in LINE_ITEM_SECTIONS:
+        with phase(_section_phase_name(section)) as p:
+            item = section(structure)
+            if item is not None:
+                if stock_ratios:
+                    _apply_stock_ratios(item, stock_ratios)
+                _price_item(item, material_prices, labor_rates)
+                quote.line_items.append(item)
+                p.count("line_items")
+    
+    with phase("pricing.permits_and_totals"):
+        _apply_permits_and_totals(quote, book)
     return quote
+
+
+def _stock_ratios(cut_list: "CutList") -> dict[str, float]:
+    """Lumber price key -> stock feet bought per foot of framing"""
+    return {lumber_price_key(nominal): size.stock_ratio for nominal, size in cut_list.sizes.items()}
+
+
+def _apply_stock_ratios(item: LineItem, stock_ratios: Mapping[str, float]):
+    """
+    Scale an item's lumber terms to purchased stock length and drop the flat
+    waste factor (its hardware is counted exactly).
+    """
+    terms = item.material_terms
+    if stock_ratios.keys().isdisjoint(terms):
+        return
+    for key, ratio in stock_ratios.items():
+        if key in terms:
+            terms[key] *= ratio
+    item.waste_factor = 1.0
+
+
+_SECTION_PHASE_NAMES: dict[Callable, str] = {}
+
+
+def _section_phase_name(section: Callable) -> str:
+    """Instrumentation phase for a line-item section: _footings_item -> pricing.footings"""
+    name = _SECTION_PHASE_NAMES.get(section)
+    if name is None:
+        name = "pricing." + section.__name__.strip("_").removesuffix("_item")
+        _SECTION_PHASE_NAMES[section] = name
+    return name
+
+
+def reprice_quote(
+    quote: Quote,
+    material_prices: Mapping[str, float] | None = None,
+    labor_rates: Mapping[str, float] | None = None,
+    permit_fees: Mapping[str, float] | None = None
+) -> bool:
+    """
+    Apply changed prices to an existing quote in place.
+    
+    material_prices / labor_rates / permit_fees hold only the keys that moved;
+    every other key keeps the price the quote was last priced at
+    (quote.price_book), so successive changes accumulate. Only line items
+    priced from a changed key are recomputed, then the permit valuation and
+    totals. Returns True if the quote was affected.
+    """
+    material_changes = dict(material_prices or {})
+    labor_changes = dict(labor_rates or {})
+    book = _quote_book(quote).with_changes(material_changes, labor_changes, permit_fees)
+    
+    changed = False
+    for item in quote.line_items:
+        if item.category == "Permits":
+            continue
+        if (not material_changes.keys().isdisjoint(item.material_terms)
+                or not labor_changes.keys().isdisjoint(item.labor_terms)):
+            _price_item(item, book.material_prices, book.labor_rates)
+            changed = True
+    
+    if changed or permit_fees or "permit_filing" in labor_changes:
+        _apply_permits_and_totals(quote, book)
+        return True
+    quote.price_book = book
+    return False
+
+
+def _quote_book(quote: Quote) -> PriceBook:
+    """Book the quote was priced from (the current book for decoded quotes)"""
+    return quote.price_book or price_book()
+
+
+class RepricingIndex:
+    """
+    Open quotes indexed by the price keys their line items depend on, so a
+    price book change only touches the quotes and items that use a changed key.
+    """
+    
+    def __init__(self, quotes: Iterable[Quote] = ()):
+        self._quotes: dict[int, Quote] = {}
+        # key -> quote id -> line items priced from that key
+        self._material_items: dict[str, dict[int, list[LineItem]]] = {}
+        self._labor_items: dict[str, dict[int, list[LineItem]]] = {}
+        for quote in quotes:
+            self.add(quote)
+    
+    def __len__(self) -> int:
+        return len(self._quotes)
+    
+    def add(self, quote: Quote):
+        qid = id(quote)
+        self._quotes[qid] = quote
+        for item in quote.line_items:
+            for key in item.material_terms:
+                self._material_items.setdefault(key, {}).setdefault(qid, []).append(item)
+            for key in item.labor_terms:
+                self._labor_items.setdefault(key, {}).setdefault(qid, []).append(item)
+    
+    def remove(self, quote: Quote):
+        qid = id(quote)
+        if self._quotes.pop(qid, None) is None:
+            return
+        for index in (self._material_items, self._labor_items):
+            for by_quote in index.values():
+                by_quote.pop(qid, None)
+    
+    def reprice(
+        self,
+        material_prices: Mapping[str, float] | None = None,
+        labor_rates: Mapping[str, float] | None = None,
+        permit_fees: Mapping[str, float] | None = None
+    ) -> list[Quote]:
+        """
+        Apply an ad-hoc price change to affected quotes in place and return
+        them. Changed keys are applied on top of each quote's own prices
+        (quote.price_book); price_book_version is left alone. A permit fee
+        change affects every quote. Use reprice_all() to move to a new book.
+        """
+        material_changes = dict(material_prices or {})
+        labor_changes = dict(labor_rates or {})
+        qids = self._quotes.keys() if permit_fees else ()
+        affected = self._affected(material_changes, labor_changes, qids)
+        
+        books: dict[int, PriceBook] = {}  # id(quote's book) -> book with the changes applied
+        
+        def book_for(quote: Quote) -> PriceBook:
+            base = _quote_book(quote)
+            book = books.get(id(base))
+            if book is None:
+                book = books[id(base)] = base.with_changes(material_changes, labor_changes, permit_fees)
+            return book
+        
+        return self._reprice(affected, book_for)
+    
+    def reprice_all(self, book: PriceBook) -> list[Quote]:
+        """
+        Move every quote to book (e.g. after a price book reload) and stamp
+        its version. Only items priced from a key that differs from the
+        quote's own prices are recomputed; returns the quotes whose prices changed.
+        """
+        by_base: dict[int, tuple[PriceBook, list[int]]] = {}
+        for qid, quote in self._quotes.items():
+            base = _quote_book(quote)
+            by_base.setdefault(id(base), (base, []))[1].append(qid)
+        
+        quotes = []
+        for base, qids in by_base.values():
+            material_changes, labor_changes, permit_changes = book.changes_from(base)
+            affected = self._affected(material_changes, labor_changes, qids if permit_changes else (),
+                                      only=set(qids))
+            quotes += self._reprice(affected, lambda quote: book)
+            for qid in qids:
+                if qid not in affected:  # Same prices; just record the new book
+                    quote = self._quotes[qid]
+                    quote.price_book = book
+                    quote.price_book_version = book.version
+        return quotes
+    
+    def _affected(
+        self,
+        material_changes: Mapping[str, float],
+        labor_changes: Mapping[str, float],
+        qids: Iterable[int] = (),
+        only: set[int] | None = None
+    ) -> dict[int, dict[int, LineItem]]:
+        """
+        Quote id -> items priced from a changed key (each item once), plus
+        qids with no items (permit fee changes). only restricts to those quotes.
+        """
+        affected: dict[int, dict[int, LineItem]] = {qid: {} for qid in qids}
+        for changes, index in ((material_changes, self._material_items),
+                               (labor_changes, self._labor_items)):
+            for key in changes:
+                for qid, items in index.get(key, {}).items():
+                    if only is not None and qid not in only:
+                        continue
+                    bucket = affected.setdefault(qid, {})
+                    for item in items:
+                        bucket[id(item)] = item
+        return affected
+    
+    def _reprice(
+        self,
+        affected: dict[int, dict[int, LineItem]],
+        book_for: Callable[[Quote], PriceBook]
+    ) -> list[Quote]:
+        quotes = []
+        for qid, items in affected.items():
+            quote = self._quotes[qid]
+            book = book_for(quote)
+            for item in items.values():
+                if item.category != "Permits":
+                    _price_item(item, book.material_prices, book.labor_rates)
+            _apply_permits_and_totals(quote, book)
+            quotes.append(quote)
+        return quotes
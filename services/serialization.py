@@ -0,0 +1,494 @@
+"""
+Compact versioned binary encoding for DeckStructure and Quote.
+
+Smaller and faster than pickling the nested dataclasses, for passing designs
+between processes or storing them in a cache. The format is schema-based:
+fixed-shape records (SiteInput, FramingLayout, totals, line-item amounts) are
+single struct-packed blocks, lumber specs and enums are one-byte codes, and
+each member class is written column by column as packed little-endian
+float64/int64 arrays. Only the free-form ledger and rim-joist dicts use
+self-describing tagged values, so their mixed int/float values keep their types.
+
+Decoding gives plain member lists, whatever store the structure used
+(lists, LazyMembers, array-backed). Numbers in float fields come back as
+float, so the decoded objects compare equal to the originals.
+
+Layout: MAGIC, uint8 format version, uint8 kind (b"S" structure, b"Q"
+quote), then the body. Any change to the encoded dataclasses must bump
+FORMAT_VERSION; the schema check at import fails until it is updated.
+"""
+
+import struct
+import sys
+from array import array
+from dataclasses import fields
+
+from domain.models import (
+    SiteInput, DeckStructure, FramingLayout, LumberSpec,
+    Footing, Post, Beam, Joist,
+    LedgerAttachment, DeckingType, RailingType, LUMBER_SPECS
+)
+from services.pricing import Quote, LineItem
+
+
+MAGIC = b"KDB"
+FORMAT_VERSION = 4
+KIND_STRUCTURE = b"S"
+KIND_QUOTE = b"Q"
+
+# One-byte codes for format v1 - append only, never reorder
+LUMBER_CODES: tuple[str, ...] = (
+    "2x6", "2x8", "2x10", "2x12", "4x4", "4x6", "4x8", "4x10", "4x12", "6x6",
+)
+LEDGER_CODES: tuple[str, ...] = ("direct", "standoff", "freestanding")
+DECKING_CODES: tuple[str, ...] = ("trex", "timbertech", "cedar", "pt_wood")
+RAILING_CODES: tuple[str, ...] = ("none", "wood", "cable", "glass", "aluminum")
+
+# Dataclass fields each schema covers (checked at import)
+_SCHEMAS = {
+    SiteInput: (
+        "width_ft", "depth_ft", "height_ft", "ledger_attachment", "soil_bearing_psf",
+        "frost_depth_in", "slope_percent", "decking_type", "railing_type", "railing_lf",
+        "stair_count", "customer_name", "site_address",
+    ),
+    FramingLayout: (
+        "width_ft", "depth_ft", "beam_y_positions", "posts_per_beam", "beam_span_ft",
+        "post_height_ft", "beam_z_ft", "joist_z_ft", "joist_count", "joist_start_x_ft",
+        "joist_spacing_ft", "footing_diameter_in", "footing_depth_in", "joist_lumber",
+        "beam_lumber", "beam_ply", "post_lumber", "footing_diameters_in",
+    ),
+    DeckStructure: (
+        "input", "footings", "posts", "beams", "joists", "ledger", "rim_joists", "layout",
+        "joist_size", "joist_spacing_in", "beam_size", "beam_ply", "post_size",
+        "footing_diameter_in", "compliant", "notes", "errors", "code_tables_version",
+    ),
+    Quote: (
+        "line_items", "materials_subtotal", "labor_subtotal", "permit_fees", "subtotal",
+        "margin_amount", "total", "deck_sqft", "price_per_sqft", "price_book_version",
+        "price_book",
+    ),
+    LineItem: (
+        "category", "description", "quantity", "unit", "material_cost", "labor_cost",
+        "material_terms", "labor_terms", "waste_factor",
+    ),
+    Footing: ("x_ft", "y_ft", "diameter_in", "depth_in"),
+    Post: ("x_ft", "y_ft", "height_ft", "lumber"),
+    Beam: ("x_start_ft", "x_end_ft", "y_ft", "z_ft", "lumber", "ply"),
+    Joist: ("x_ft", "y_start_ft", "y_end_ft", "z_ft", "lumber"),
+}
+for _cls, _names in _SCHEMAS.items():
+    if tuple(f.name for f in fields(_cls)) != _names:
+        raise RuntimeError(
+            f"{_cls.__name__} fields changed; update services.serialization and bump FORMAT_VERSION"
+        )
+
+_HEADER = struct.Struct(f"<{len(MAGIC)}sBc")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+# width, depth, height, ledger, soil, frost, slope, decking, railing, railing_lf, stairs
+# (soil bearing and frost depth, and the footing depths taken from it, are float64:
+# inputs may carry fractional values)
+_SITE = struct.Struct("<dddBdddBBdq")
+# width, depth, posts_per_beam, beam_span, post_height, beam_z, joist_z, joist_count,
+# joist_start_x, joist_spacing, footing_dia, footing_depth, joist/beam lumber, ply, post lumber, n beam lines,
+# n per-footing diameters (0 = uniform)
+_LAYOUT = struct.Struct("<ddqddddqddqdBBBBII")
+# joist_spacing_in, beam_ply, footing_diameter_in, compliant, member counts x4
+_STRUCTURE_SCALARS = struct.Struct("<qqq?IIII")
+_QUOTE_TOTALS = struct.Struct("<8dI")
+# quantity, material_cost, labor_cost, waste_factor, material/labor term counts
+_LINE_ITEM = struct.Struct("<ddddII")
+
+_SWAP_BYTES = sys.byteorder != "little"
+
+_LUMBER = tuple(LUMBER_SPECS[nominal] for nominal in LUMBER_CODES)
+_LUMBER_CODE_BY_ID = {id(spec): code for code, spec in enumerate(_LUMBER)}
+_ENUM_CODES = {
+    enum_type: {enum_type(value): code for code, value in enumerate(values)}
+    for enum_type, values in (
+        (LedgerAttachment, LEDGER_CODES), (DeckingType, DECKING_CODES), (RailingType, RAILING_CODES)
+    )
+}
+_LEDGERS = tuple(LedgerAttachment(v) for v in LEDGER_CODES)
+_DECKINGS = tuple(DeckingType(v) for v in DECKING_CODES)
+_RAILINGS = tuple(RailingType(v) for v in RAILING_CODES)
+
+# Value tags for the free-form dicts
+_NONE, _TRUE, _FALSE, _INT, _FLOAT, _STR, _LUMBER_TAG, _LIST, _DICT = b"NTFifsLld"
+
+
+def _lumber_code(spec: LumberSpec) -> int:
+    code = _LUMBER_CODE_BY_ID.get(id(spec))
+    if code is None:  # An equal spec that is not the shared LUMBER_SPECS instance
+        if spec.nominal not in LUMBER_CODES or LUMBER_SPECS[spec.nominal] != spec:
+            raise ValueError(f"Cannot encode non-standard lumber spec {spec!r}")
+        code = LUMBER_CODES.index(spec.nominal)
+    return code
+
+
+def _lumber_codes(members) -> list[int]:
+    codes = _LUMBER_CODE_BY_ID
+    try:
+        return [codes[id(m.lumber)] for m in members]
+    except KeyError:
+        return [_lumber_code(m.lumber) for m in members]
+
+
+# ===== WRITER / READER =====
+
+class _Writer:
+    def __init__(self, kind: bytes):
+        self.buf = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, kind))
+
+    def str(self, s: str):
+        data = s.encode()
+        self.buf += _U32.pack(len(data))
+        self.buf += data
+
+    def strs(self, items: list[str]):
+        self.buf += _U32.pack(len(items))
+        for s in items:
+            self.str(s)
+
+    def column(self, typecode: str, values: list):
+        packed = array(typecode, values)
+        if _SWAP_BYTES:
+            packed.byteswap()
+        self.buf += packed
+
+    def terms(self, terms: dict[str, float]):
+        for key, qty in terms.items():
+            self.str(key)
+            self.buf += _F64.pack(qty)
+
+    def value(self, v):
+        """Self-describing value (for ledger / rim joist dicts)"""
+        buf = self.buf
+        if v is None:
+            buf.append(_NONE)
+        elif v is True or v is False:
+            buf.append(_TRUE if v else _FALSE)
+        elif isinstance(v, int):
+            buf.append(_INT)
+            buf += _I64.pack(v)
+        elif isinstance(v, float):
+            buf.append(_FLOAT)
+            buf += _F64.pack(v)
+        elif isinstance(v, str):
+            buf.append(_STR)
+            self.str(v)
+        elif isinstance(v, LumberSpec):
+            buf.append(_LUMBER_TAG)
+            buf.append(_lumber_code(v))
+        elif isinstance(v, list):
+            buf.append(_LIST)
+            buf += _U32.pack(len(v))
+            for item in v:
+                self.value(item)
+        elif isinstance(v, dict):
+            buf.append(_DICT)
+            buf += _U32.pack(len(v))
+            for key, item in v.items():
+                self.str(key)
+                self.value(item)
+        else:
+            raise TypeError(f"Cannot encode {type(v).__name__}")
+
+
+class _Reader:
+    def __init__(self, data: bytes, kind: bytes):
+        self.data = data
+        if len(data) < _HEADER.size:
+            raise ValueError("Truncated encoding")
+        magic, version, found_kind = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a Kolmo binary encoding")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported encoding version {version} (expected {FORMAT_VERSION})")
+        if found_kind != kind:
+            raise ValueError(f"Encoding holds kind {found_kind!r}, expected {kind!r}")
+        self.pos = _HEADER.size
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        values = fmt.unpack_from(self.data, self.pos)
+        self.pos += fmt.size
+        return values
+
+    def str(self) -> str:
+        (n,) = _U32.unpack_from(self.data, self.pos)
+        start = self.pos + 4
+        self.pos = start + n
+        return self.data[start:self.pos].decode()
+
+    def strs(self) -> list[str]:
+        (n,) = self.unpack(_U32)
+        return [self.str() for _ in range(n)]
+
+    def column(self, typecode: str, n: int) -> list:
+        values = array(typecode)
+        end = self.pos + n * values.itemsize
+        values.frombytes(self.data[self.pos:end])
+        if _SWAP_BYTES:
+            values.byteswap()
+        self.pos = end
+        return values.tolist()
+
+    def terms(self, n: int) -> dict[str, float]:
+        terms = {}
+        for _ in range(n):
+            key = self.str()
+            (terms[key],) = self.unpack(_F64)
+        return terms
+
+    def value(self):
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag == _NONE:
+            return None
+        if tag == _TRUE:
+            return True
+        if tag == _FALSE:
+            return False
+        if tag == _INT:
+            return self.unpack(_I64)[0]
+        if tag == _FLOAT:
+            return self.unpack(_F64)[0]
+        if tag == _STR:
+            return self.str()
+        if tag == _LUMBER_TAG:
+            code = self.data[self.pos]
+            self.pos += 1
+            return _LUMBER[code]
+        if tag == _LIST:
+            return [self.value() for _ in range(self.unpack(_U32)[0])]
+        if tag == _DICT:
+            return {self.str(): self.value() for _ in range(self.unpack(_U32)[0])}
+        raise ValueError(f"Corrupt encoding: unknown tag {tag!r} at offset {self.pos - 1}")
+
+
+# ===== DECK STRUCTURE =====
+
+def _write_site(w: _Writer, site: SiteInput):
+    w.buf += _SITE.pack(
+        site.width_ft, site.depth_ft, site.height_ft,
+        _ENUM_CODES[LedgerAttachment][site.ledger_attachment],
+        site.soil_bearing_psf, site.frost_depth_in, site.slope_percent,
+        _ENUM_CODES[DeckingType][site.decking_type],
+        _ENUM_CODES[RailingType][site.railing_type],
+        site.railing_lf, site.stair_count,
+    )
+    w.str(site.customer_name)
+    w.str(site.site_address)
+
+
+def _whole(value: float) -> int | float:
+    """int for whole numbers, so int-typed fields round-trip as int"""
+    return int(value) if value.is_integer() else value
+
+
+def _read_site(r: _Reader) -> SiteInput:
+    (width, depth, height, ledger, soil, frost, slope,
+     decking, railing, railing_lf, stairs) = r.unpack(_SITE)
+    return SiteInput(
+        width_ft=width, depth_ft=depth, height_ft=height,
+        ledger_attachment=_LEDGERS[ledger],
+        soil_bearing_psf=_whole(soil), frost_depth_in=_whole(frost), slope_percent=slope,
+        decking_type=_DECKINGS[decking], railing_type=_RAILINGS[railing],
+        railing_lf=railing_lf, stair_count=stairs,
+        customer_name=r.str(), site_address=r.str(),
+    )
+
+
+def _write_layout(w: _Writer, layout: FramingLayout):
+    w.buf += _LAYOUT.pack(
+        layout.width_ft, layout.depth_ft, layout.posts_per_beam, layout.beam_span_ft,
+        layout.post_height_ft, layout.beam_z_ft, layout.joist_z_ft, layout.joist_count,
+        layout.joist_start_x_ft, layout.joist_spacing_ft,
+        layout.footing_diameter_in, layout.footing_depth_in,
+        _lumber_code(layout.joist_lumber), _lumber_code(layout.beam_lumber),
+        layout.beam_ply, _lumber_code(layout.post_lumber),
+        len(layout.beam_y_positions), len(layout.footing_diameters_in or ()),
+    )
+    w.column("d", list(layout.beam_y_positions))
+    if layout.footing_diameters_in:
+        w.column("q", list(layout.footing_diameters_in))
+
+
+def _read_layout(r: _Reader) -> FramingLayout:
+    (width, depth, posts_per_beam, beam_span, post_height, beam_z, joist_z, joist_count,
+     joist_start_x, joist_spacing, footing_dia, footing_depth,
+     joist_lumber, beam_lumber, beam_ply, post_lumber, beam_lines, n_diameters) = r.unpack(_LAYOUT)
+    beam_y_positions = tuple(r.column("d", beam_lines))
+    return FramingLayout(
+        width_ft=width, depth_ft=depth,
+        beam_y_positions=beam_y_positions,
+        posts_per_beam=posts_per_beam, beam_span_ft=beam_span, post_height_ft=post_height,
+        beam_z_ft=beam_z, joist_z_ft=joist_z, joist_count=joist_count,
+        joist_start_x_ft=joist_start_x, joist_spacing_ft=joist_spacing,
+        footing_diameter_in=footing_dia, footing_depth_in=_whole(footing_depth),
+        joist_lumber=_LUMBER[joist_lumber], beam_lumber=_LUMBER[beam_lumber],
+        beam_ply=beam_ply, post_lumber=_LUMBER[post_lumber],
+        footing_diameters_in=tuple(r.column("q", n_diameters)) if n_diameters else None,
+    )
+
+
+def encode_structure(structure: DeckStructure) -> bytes:
+    w = _Writer(KIND_STRUCTURE)
+    _write_site(w, structure.input)
+
+    footings = list(structure.footings)
+    posts = list(structure.posts)
+    beams = list(structure.beams)
+    joists = list(structure.joists)
+    w.buf += _STRUCTURE_SCALARS.pack(
+        structure.joist_spacing_in, structure.beam_ply, structure.footing_diameter_in,
+        structure.compliant, len(footings), len(posts), len(beams), len(joists),
+    )
+    w.str(structure.joist_size)
+    w.str(structure.beam_size)
+    w.str(structure.post_size)
+    w.str(structure.code_tables_version)
+    w.strs(structure.notes)
+    w.strs(structure.errors)
+
+    w.column("d", [f.x_ft for f in footings])
+    w.column("d", [f.y_ft for f in footings])
+    w.column("q", [f.diameter_in for f in footings])
+    w.column("d", [f.depth_in for f in footings])
+
+    w.column("d", [p.x_ft for p in posts])
+    w.column("d", [p.y_ft for p in posts])
+    w.column("d", [p.height_ft for p in posts])
+    w.column("B", _lumber_codes(posts))
+
+    w.column("d", [b.x_start_ft for b in beams])
+    w.column("d", [b.x_end_ft for b in beams])
+    w.column("d", [b.y_ft for b in beams])
+    w.column("d", [b.z_ft for b in beams])
+    w.column("B", _lumber_codes(beams))
+    w.column("B", [b.ply for b in beams])
+
+    w.column("d", [j.x_ft for j in joists])
+    w.column("d", [j.y_start_ft for j in joists])
+    w.column("d", [j.y_end_ft for j in joists])
+    w.column("d", [j.z_ft for j in joists])
+    w.column("B", _lumber_codes(joists))
+
+    w.value(structure.ledger)
+    w.value(structure.rim_joists)
+    if structure.layout is None:
+        w.buf.append(0)
+    else:
+        w.buf.append(1)
+        _write_layout(w, structure.layout)
+    return bytes(w.buf)
+
+
+def decode_structure(data: bytes) -> DeckStructure:
+    r = _Reader(data, KIND_STRUCTURE)
+    site = _read_site(r)
+    (joist_spacing_in, beam_ply, footing_diameter_in, compliant,
+     n_footings, n_posts, n_beams, n_joists) = r.unpack(_STRUCTURE_SCALARS)
+    joist_size, beam_size, post_size = r.str(), r.str(), r.str()
+    code_tables_version = r.str()
+    notes = r.strs()
+    errors = r.strs()
+
+    col = r.column
+    n = n_footings
+    footings = list(map(Footing, col("d", n), col("d", n), col("q", n), map(_whole, col("d", n))))
+    n = n_posts
+    posts = list(map(Post, col("d", n), col("d", n), col("d", n),
+                     [_LUMBER[c] for c in col("B", n)]))
+    n = n_beams
+    beams = list(map(Beam, col("d", n), col("d", n), col("d", n), col("d", n),
+                     [_LUMBER[c] for c in col("B", n)], col("B", n)))
+    n = n_joists
+    joists = list(map(Joist, col("d", n), col("d", n), col("d", n), col("d", n),
+                      [_LUMBER[c] for c in col("B", n)]))
+
+    ledger = r.value()
+    rim_joists = r.value()
+    has_layout = r.data[r.pos]
+    r.pos += 1
+    layout = _read_layout(r) if has_layout else None
+
+    return DeckStructure(
+        input=site,
+        footings=footings,
+        posts=posts,
+        beams=beams,
+        joists=joists,
+        ledger=ledger,
+        rim_joists=rim_joists,
+        layout=layout,
+        joist_size=joist_size,
+        joist_spacing_in=joist_spacing_in,
+        beam_size=beam_size,
+        beam_ply=beam_ply,
+        post_size=post_size,
+        footing_diameter_in=footing_diameter_in,
+        compliant=compliant,
+        notes=notes,
+        errors=errors,
+        code_tables_version=code_tables_version,
+    )
+
+
+# ===== QUOTE =====
+
+def encode_quote(quote: Quote) -> bytes:
+    # price_book is not encoded; decoded quotes reprice from the current book
+    w = _Writer(KIND_QUOTE)
+    w.buf += _QUOTE_TOTALS.pack(
+        quote.materials_subtotal, quote.labor_subtotal, quote.permit_fees, quote.subtotal,
+        quote.margin_amount, quote.total, quote.deck_sqft, quote.price_per_sqft,
+        len(quote.line_items),
+    )
+    w.str(quote.price_book_version)
+    for item in quote.line_items:
+        w.buf += _LINE_ITEM.pack(
+            item.quantity, item.material_cost, item.labor_cost, item.waste_factor,
+            len(item.material_terms), len(item.labor_terms),
+        )
+        w.str(item.category)
+        w.str(item.description)
+        w.str(item.unit)
+        w.terms(item.material_terms)
+        w.terms(item.labor_terms)
+    return bytes(w.buf)
+
+
+def decode_quote(data: bytes) -> Quote:
+    r = _Reader(data, KIND_QUOTE)
+    (materials_subtotal, labor_subtotal, permit_fees, subtotal,
+     margin_amount, total, deck_sqft, price_per_sqft, n_items) = r.unpack(_QUOTE_TOTALS)
+    price_book_version = r.str()
+    line_items = []
+    for _ in range(n_items):
+        quantity, material_cost, labor_cost, waste_factor, n_material, n_labor = r.unpack(_LINE_ITEM)
+        line_items.append(LineItem(
+            category=r.str(),
+            description=r.str(),
+            quantity=quantity,
+            unit=r.str(),
+            material_cost=material_cost,
+            labor_cost=labor_cost,
+            material_terms=r.terms(n_material),
+            labor_terms=r.terms(n_labor),
+            waste_factor=waste_factor,
+        ))
+    return Quote(
+        line_items=line_items,
+        materials_subtotal=materials_subtotal,
+        labor_subtotal=labor_subtotal,
+        permit_fees=permit_fees,
+        subtotal=subtotal,
+        margin_amount=margin_amount,
+        total=total,
+        deck_sqft=deck_sqft,
+        price_per_sqft=price_per_sqft,
+        price_book_version=price_book_version,
+    )
@@ -0,0 +1,173 @@
+"""DesignService shares in-flight jobs, caps concurrency and isolates cancellation"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from domain.code_engine import generate_structure
+from domain.models import SiteInput
+from services import async_service
+from services.async_service import DesignService
+from services.pricing import calculate_quote
+
+
+SITE = SiteInput(width_ft=16, depth_ft=12, height_ft=6)
+
+
+class GatedDesign:
+    """Stand-in for the pool job: blocks until released, records calls and concurrency"""
+
+    def __init__(self, error: Exception | None = None, hold: float = 0.0):
+        self.release = threading.Event()
+        self.error = error
+        self.hold = hold
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, site_input):
+        with self._lock:
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            self.release.wait(5)
+            time.sleep(self.hold)
+            if self.error is not None:
+                raise self.error
+            return site_input, site_input.width_ft
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+@pytest.fixture
+def gated(monkeypatch):
+    def install(**kwargs):
+        job = GatedDesign(**kwargs)
+        monkeypatch.setattr(async_service, "_design", job)
+        return job
+    return install
+
+
+async def _until(predicate):
+    while not predicate():
+        await asyncio.sleep(0.001)
+
+
+def test_identical_requests_share_one_build(gated):
+    job = gated()
+
+    async def main():
+        async with DesignService(max_workers=4) as service:
+            waiters = [asyncio.ensure_future(service.design(SITE)) for _ in range(5)]
+            await _until(lambda: job.calls)
+            job.release.set()
+            results = await asyncio.gather(*waiters)
+            return service.stats, results
+
+    stats, results = asyncio.run(main())
+    assert job.calls == 1
+    assert all(r is results[0] for r in results)
+    assert (stats.submitted, stats.executed, stats.deduplicated) == (5, 1, 4)
+
+
+def test_tolerance_shares_nearby_inputs(gated):
+    job = gated()
+    job.release.set()
+
+    async def main():
+        async with DesignService(tolerance_ft=0.1) as service:
+            return await asyncio.gather(
+                service.design(SITE), service.design(SiteInput(width_ft=16.01, depth_ft=12, height_ft=6))
+            )
+
+    first, second = asyncio.run(main())
+    assert job.calls == 1 and first is second
+
+
+def test_semaphore_caps_jobs_on_the_pool(gated):
+    job = gated(hold=0.02)
+
+    async def main():
+        async with DesignService(max_workers=8, max_quotes=2) as service:
+            waiters = [
+                asyncio.ensure_future(service.design(SiteInput(width_ft=10 + i, depth_ft=12, height_ft=6)))
+                for i in range(6)
+            ]
+            await _until(lambda: job.running == 2)
+            await asyncio.sleep(0.02)
+            assert job.running == 2   # The rest wait for a slot, not on the pool
+            job.release.set()
+            return await asyncio.gather(*waiters)
+
+    results = asyncio.run(main())
+    assert [width for _, width in results] == [10 + i for i in range(6)]
+    assert job.calls == 6 and job.max_running == 2
+
+
+def test_cancelled_waiter_does_not_cancel_shared_build(gated):
+    job = gated()
+
+    async def main():
+        async with DesignService() as service:
+            first = asyncio.ensure_future(service.design(SITE))
+            second = asyncio.ensure_future(service.design(SITE))
+            await _until(lambda: job.calls)
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            job.release.set()
+            return await second
+
+    site, width = asyncio.run(main())
+    assert (site, width) == (SITE, 16)
+    assert job.calls == 1
+
+
+def test_executor_error_reaches_every_waiter(gated):
+    job = gated(error=RuntimeError("engine crashed"))
+
+    async def main():
+        async with DesignService() as service:
+            waiters = [asyncio.ensure_future(service.design(SITE)) for _ in range(3)]
+            await _until(lambda: job.calls)
+            job.release.set()
+            results = await asyncio.gather(*waiters, return_exceptions=True)
+            assert not service._designs_in_flight   # A failed job is not reused
+            job.error = None
+            return results, await service.design(SITE)
+
+    results, retry = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) and str(r) == "engine crashed" for r in results)
+    assert retry == (SITE, 16) and job.calls == 2
+
+
+def test_results_match_blocking_calls():
+    async def main():
+        async with DesignService() as service:
+            quote = await service.quote(SITE)
+            structure, _ = await service.design(SITE)
+            pdfs = await asyncio.gather(service.permit_pdf(structure), service.permit_pdf(structure))
+            return quote, pdfs, service.stats
+
+    quote, (pdf, again), stats = asyncio.run(main())
+    assert quote.total == calculate_quote(generate_structure(SITE)).total
+    assert pdf.startswith(b"%PDF") and again is pdf
+    assert stats.deduplicated == 1
+
+
+def test_close_leaves_caller_executor_running():
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        service = DesignService(executor=executor)
+        service.close()
+        assert executor.submit(lambda: 1).result() == 1
+    finally:
+        executor.shutdown()
+    with pytest.raises(ValueError):
+        DesignService(max_quotes=0)
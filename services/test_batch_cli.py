@@ -0,0 +1,118 @@
+"""Every input line gets one result line, in order, whether it designs or not"""
+
+import io
+import json
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from domain.code_engine import generate_structure
+from domain.models import SiteInput
+from services import batch_cli
+from services.batch_cli import _chunk_results, process_chunk, process_record, run
+from services.pricing import calculate_quote
+
+
+GOOD = {"width_ft": 16, "depth_ft": 12, "height_ft": 6, "railing_type": "cable", "railing_lf": 30}
+BAD = [
+    "{not json",
+    json.dumps({"width_ft": 16}),
+    json.dumps({**GOOD, "shoe_size": 9}),
+    json.dumps({**GOOD, "railing_type": "rope"}),
+    json.dumps({**GOOD, "width_ft": "wide"}),
+    json.dumps({**GOOD, "depth_ft": 0}),
+    json.dumps({**GOOD, "height_ft": -3}),
+    json.dumps({**GOOD, "soil_bearing_psf": 0}),
+    '{"width_ft": 16, "depth_ft": NaN, "height_ft": 6}',
+    '{"width_ft": Infinity, "depth_ft": 12, "height_ft": 6}',
+    '{"width_ft": 16, "depth_ft": 12, "height_ft": 6, "railing_lf": NaN}',
+    '{"width_ft": 16, "depth_ft": 12, "height_ft": 6, "slope_percent": -Infinity}',
+    json.dumps({**GOOD, "stair_count": "3"}),
+]
+
+
+def _lines(n_good: int = 30) -> list[str]:
+    good = [json.dumps({**GOOD, "width_ft": 8 + i % 20}) for i in range(n_good)]
+    lines = []
+    for i, line in enumerate(good):
+        lines.append(line)
+        if i < len(BAD):
+            lines.append(BAD[i])
+        if i % 7 == 0:
+            lines.append("   ")
+    return lines
+
+
+def test_bad_records_become_error_lines():
+    for line in BAD:
+        result = json.loads(process_record(5, line))
+        assert result["line"] == 5
+        assert result["error"].startswith("Invalid input: ")
+
+
+def test_good_record_matches_quote():
+    result = json.loads(process_record(1, json.dumps(GOOD)))
+    quote = calculate_quote(generate_structure(SiteInput.from_dict(GOOD)))
+    assert result["compliant"]
+    assert result["quote"]["total"] == pytest.approx(quote.total)
+    assert len(result["quote"]["line_items"]) == len(quote.line_items)
+
+
+@pytest.mark.parametrize("workers, chunk_size", [(1, 256), (2, 3), (3, 256)])
+def test_run_preserves_order(workers, chunk_size):
+    lines = _lines()
+    source = io.StringIO("\n".join(lines) + "\n")
+    expected = [process_record(n, line) for n, line in enumerate(lines, start=1) if line.strip()]
+    sink = io.StringIO()
+    assert run(source, sink, workers, chunk_size) == len(expected)
+    assert sink.getvalue().splitlines() == expected
+
+
+def test_failed_chunk_reports_every_record():
+    future = Future()
+    future.set_exception(RuntimeError("worker died"))
+    chunk = [(3, "a"), (4, "b")]
+    results = [json.loads(line) for line in _chunk_results(future, chunk)]
+    assert [r["line"] for r in results] == [3, 4]
+    assert all(r["error"] == "Processing failed: RuntimeError: worker died" for r in results)
+
+
+class BreakingPool:
+    """Runs jobs inline until a worker "dies", then refuses new work like a broken pool"""
+
+    def __init__(self, max_workers, alive_jobs):
+        self.alive_jobs = alive_jobs
+        self.submitted = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        future = Future()
+        if self.submitted > self.alive_jobs + 1:
+            raise BrokenProcessPool("A child process terminated abruptly")
+        if self.submitted == self.alive_jobs + 1:
+            future.set_exception(BrokenProcessPool("A child process terminated abruptly"))
+        else:
+            future.set_result(fn(*args))
+        return future
+
+
+@pytest.mark.parametrize("alive_jobs", [0, 2, 5])
+def test_broken_pool_reports_every_remaining_record(monkeypatch, alive_jobs):
+    monkeypatch.setattr(batch_cli, "ProcessPoolExecutor", lambda max_workers: BreakingPool(max_workers, alive_jobs))
+    lines = _lines()
+    records = [(n, line) for n, line in enumerate(lines, start=1) if line.strip()]
+    chunk_size = 4
+    out = io.StringIO()
+    assert run(io.StringIO("\n".join(lines)), out, workers=8, chunk_size=chunk_size) == len(records)
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["line"] for r in results] == [n for n, _ in records]
+    done = alive_jobs * chunk_size
+    assert results[:done] == [json.loads(line) for line in process_chunk(records[:done])]
+    assert all(r["error"].startswith("Processing failed: BrokenProcessPool") for r in results[done:])
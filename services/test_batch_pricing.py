@@ -0,0 +1,99 @@
+"""calculate_quotes_batch() agrees with calculate_quote() deck by deck"""
+
+import io
+import itertools
+
+import pytest
+
+from domain.batch import generate_structures_batch
+from domain.code_engine import generate_structure
+from domain.models import DeckingType, LedgerAttachment, RailingType, SiteInput
+from services.batch_pricing import CATEGORIES, TOTAL_COLUMNS, calculate_quotes_batch
+from services.pricing import calculate_quote, price_book
+
+
+def _sites():
+    selections = itertools.cycle(itertools.product(
+        DeckingType, RailingType, (0.0, 36.5), (0, 4),
+    ))
+    for (w, d, h, ledger), (decking, railing, railing_lf, stairs) in zip(
+        itertools.product((8, 16, 23.5, 40), (6, 12, 16), (2, 6, 10), LedgerAttachment), selections
+    ):
+        yield SiteInput(
+            width_ft=w, depth_ft=d, height_ft=h, ledger_attachment=ledger, decking_type=decking,
+            railing_type=railing, railing_lf=railing_lf, stair_count=stairs,
+        )
+
+
+def _assert_matches(batch, quotes):
+    assert len(batch) == len(quotes)
+    for i, quote in enumerate(quotes):
+        items = {li.category: li for li in quote.line_items}
+        for prefix, category in CATEGORIES:
+            item = items.get(category)
+            assert batch[f"{prefix}_material"][i] == pytest.approx(item.material_cost if item else 0.0, abs=1e-9)
+            assert batch[f"{prefix}_labor"][i] == pytest.approx(item.labor_cost if item else 0.0, abs=1e-9)
+        for name in TOTAL_COLUMNS:
+            assert batch[name][i] == pytest.approx(getattr(quote, name), abs=1e-9), name
+
+
+def test_structures_match_scalar():
+    structures = [s for s in (generate_structure(site) for site in _sites()) if s.compliant]
+    assert len(structures) > 50
+    _assert_matches(calculate_quotes_batch(structures), [calculate_quote(s) for s in structures])
+
+
+def test_lazy_structures_match_scalar():
+    structures = [s for s in (generate_structure(site, lazy=True) for site in _sites()) if s.compliant]
+    _assert_matches(calculate_quotes_batch(structures), [calculate_quote(s) for s in structures])
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_tributary_structures_match_scalar(compact):
+    structures = [
+        s for s in (generate_structure(site, footing_sizing="tributary", compact=compact) for site in _sites())
+        if s.compliant
+    ]
+    assert any(len(set(s.layout.footing_diameters_in)) > 1 for s in structures)
+    _assert_matches(calculate_quotes_batch(structures), [calculate_quote(s) for s in structures])
+
+
+def test_structure_batch_matches_scalar():
+    dims = [(w, d, h) for w, d, h in itertools.product((8, 16, 23.5, 40), (6, 12, 16), (2, 6, 10))]
+    batch = generate_structures_batch(*zip(*dims), ledger_attachment=LedgerAttachment.FREESTANDING)
+    ok = batch.compliant
+    quotes = calculate_quotes_batch(
+        batch, decking_type="cedar", railing_type=RailingType.CABLE, railing_lf=30, stair_count=3,
+    )
+    expected = []
+    for (w, d, h), compliant in zip(dims, ok):
+        site = SiteInput(
+            width_ft=w, depth_ft=d, height_ft=h, ledger_attachment=LedgerAttachment.FREESTANDING,
+            decking_type=DeckingType.CEDAR, railing_type=RailingType.CABLE, railing_lf=30, stair_count=3,
+        )
+        expected.append(calculate_quote(generate_structure(site)) if compliant else None)
+    rows = [i for i, q in enumerate(expected) if q is not None]
+    assert rows
+    for i in rows:
+        quote = expected[i]
+        for name in TOTAL_COLUMNS:
+            assert quotes[name][i] == pytest.approx(getattr(quote, name), abs=1e-9), (dims[i], name)
+
+
+def test_changed_price_book_matches_scalar():
+    book = price_book().with_changes(
+        {"2x10_pt_lf": 3.3, "concrete_60lb_bag": 9.0, "cedar_decking_lf": 4.1, "cable_rail_lf": 80.0},
+        {"decking_wood_sqft": 7.5, "permit_filing": 400.0},
+        {"sdci_per_1000_valuation": 12.0},
+    )
+    structures = [s for s in (generate_structure(site) for site in _sites()) if s.compliant]
+    _assert_matches(calculate_quotes_batch(structures, book=book), [calculate_quote(s, book) for s in structures])
+
+
+def test_to_csv_header():
+    structures = [generate_structure(SiteInput(width_ft=16, depth_ft=12, height_ft=6))]
+    out = io.StringIO()
+    calculate_quotes_batch(structures).to_csv(out)
+    header, row = out.getvalue().splitlines()
+    assert header.split(",")[-len(TOTAL_COLUMNS):] == TOTAL_COLUMNS
+    assert len(row.split(",")) == len(header.split(","))
@@ -0,0 +1,126 @@
+"""Cut lists cover every piece, fit their stock, and the exact packer is optimal"""
+
+import random
+from collections import Counter
+from dataclasses import replace
+
+import pytest
+
+from domain.code_engine import generate_structure
+from domain.models import LedgerAttachment, SiteInput
+from services.cut_list import (
+    KERF_IN, STOCK_LENGTHS_FT, _pack_best_fit, _pack_exact, _stock_lf, _units, cut_pieces,
+    optimize_cut_list,
+)
+from services.pricing import calculate_quote
+
+
+SITES = [
+    SiteInput(width_ft=16, depth_ft=12, height_ft=6),
+    SiteInput(width_ft=12, depth_ft=10, height_ft=2.5, ledger_attachment=LedgerAttachment.FREESTANDING),
+    SiteInput(width_ft=37.3, depth_ft=13.5, height_ft=9),   # Beams and ledger spliced
+]
+STOCK = tuple(_units(length) for length in STOCK_LENGTHS_FT)
+KERF = _units(KERF_IN / 12)
+
+
+def _covers(size, pieces: Counter):
+    cuts = Counter()
+    for pattern in size.patterns:
+        assert pattern.stock_ft in STOCK_LENGTHS_FT
+        used = sum(pattern.cuts_ft) + KERF_IN / 12 * (len(pattern.cuts_ft) - 1)
+        assert used <= pattern.stock_ft + 1e-9, pattern
+        for cut in pattern.cuts_ft:
+            cuts[_units(cut)] += pattern.count
+    assert cuts == pieces
+
+
+@pytest.mark.parametrize("site", SITES, ids=lambda s: f"{s.width_ft}x{s.depth_ft}")
+@pytest.mark.parametrize("exact", [False, True])
+def test_patterns_cover_pieces(site, exact):
+    structure = generate_structure(site)
+    pieces = cut_pieces(structure)
+    cut_list = optimize_cut_list(structure, exact=exact)
+    assert set(cut_list.sizes) == set(pieces)
+    for nominal, size in cut_list.sizes.items():
+        _covers(size, pieces[nominal])
+        assert size.stock_ratio >= 1
+    assert cut_list.waste_lf >= 0
+
+
+@pytest.mark.parametrize("site", SITES, ids=lambda s: f"{s.width_ft}x{s.depth_ft}")
+def test_exact_never_buys_more(site):
+    structure = generate_structure(site)
+    heuristic = optimize_cut_list(structure)
+    exact = optimize_cut_list(structure, exact=True)
+    for nominal, size in exact.sizes.items():
+        assert size.stock_lf <= heuristic.sizes[nominal].stock_lf + 1e-9
+
+
+@pytest.mark.parametrize("site", SITES, ids=lambda s: f"{s.width_ft}x{s.depth_ft}")
+def test_layout_pieces_match_members(site):
+    eager = generate_structure(site)
+    assert cut_pieces(eager) == cut_pieces(replace(eager, layout=None))
+    lazy = generate_structure(site, lazy=True)
+    assert cut_pieces(lazy) == cut_pieces(eager)
+    optimize_cut_list(lazy)
+    assert not lazy.joists.materialized
+
+
+def test_beams_spliced_over_posts():
+    structure = generate_structure(SITES[2])
+    span = _units(structure.layout.beam_span_ft)
+    beam_pieces = cut_pieces(structure)[structure.beam_size]
+    longest = _units(STOCK_LENGTHS_FT[-1])
+    assert all(piece <= longest for piece in beam_pieces)
+    assert sum(1 for piece in beam_pieces if piece % span == 0) >= 1
+
+
+def _brute_force(pieces: list[int]) -> tuple[int, int]:
+    """Minimum (stock length, boards) over every partition of pieces onto boards"""
+    best = None
+
+    def place(i: int, boards: list[list[int]]):
+        nonlocal best
+        if i == len(pieces):
+            cost = (0, 0)
+            for board in boards:
+                used = sum(board) + KERF * (len(board) - 1)
+                fits = [s for s in STOCK if s >= used]
+                if not fits:
+                    return
+                cost = (cost[0] + fits[0], cost[1] + 1)
+            if best is None or cost < best:
+                best = cost
+            return
+        for board in boards:
+            board.append(pieces[i])
+            place(i + 1, boards)
+            board.pop()
+        boards.append([pieces[i]])
+        place(i + 1, boards)
+        boards.pop()
+
+    place(0, [])
+    return best
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_exact_packing_is_optimal(seed):
+    rng = random.Random(seed)
+    pieces = [rng.choice((_units(rng.uniform(1, 20)), _units(rng.choice((3, 4.5, 6, 7.75, 12)))))
+              for _ in range(rng.randint(1, 7))]
+    boards = _pack_exact(Counter(pieces), STOCK, KERF)
+    assert boards is not None
+    assert _stock_lf(boards) == _brute_force(pieces)
+    heuristic = _pack_best_fit(Counter(pieces), STOCK, KERF)
+    assert _stock_lf(heuristic) >= _stock_lf(boards)
+
+
+def test_cut_list_pricing():
+    structure = generate_structure(SITES[0])
+    cut_list = optimize_cut_list(structure)
+    plain = calculate_quote(structure)
+    quote = calculate_quote(structure, cut_list=cut_list)
+    assert quote.line_items[0] == plain.line_items[0]   # Footings have no lumber
+    assert quote.total != plain.total
@@ -0,0 +1,101 @@
+"""DesignCache returns what the engine and pricer would, and never stale entries"""
+
+from dataclasses import replace
+
+import pytest
+
+from domain.code_engine import generate_structure
+from domain.models import SiteInput
+from domain.tables import code_tables
+from services import design_cache
+from services.design_cache import DesignCache
+from services.pricing import calculate_quote, price_book
+
+
+SITE = SiteInput(width_ft=16, depth_ft=12, height_ft=6)
+
+
+def test_hits_match_engine_and_pricer():
+    cache = DesignCache()
+    structure = cache.structure(SITE)
+    assert cache.structure(SITE) is structure
+    assert structure == generate_structure(SITE)
+    quote = cache.quote(SITE)
+    assert cache.quote(SITE) is quote
+    assert quote.total == pytest.approx(calculate_quote(generate_structure(SITE)).total, abs=1e-9)
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (3, 2, 2)
+
+
+def test_inputs_within_tolerance_share_an_entry():
+    cache = DesignCache(tolerance_ft=0.25)
+    first = cache.structure(replace(SITE, width_ft=16.1))
+    assert cache.structure(replace(SITE, width_ft=15.9)) is first
+    assert first.input.width_ft == 16.0
+    assert cache.structure(replace(SITE, width_ft=16.2)) is not first
+
+
+def test_project_info_shares_entry_but_is_returned():
+    cache = DesignCache()
+    a = cache.structure(replace(SITE, customer_name="Ng", site_address="1 Pine St"))
+    b = cache.structure(replace(SITE, customer_name="Ortiz"))
+    assert cache.stats().misses == 1
+    assert (a.input.customer_name, a.input.site_address) == ("Ng", "1 Pine St")
+    assert (b.input.customer_name, b.input.site_address) == ("Ortiz", "")
+    assert a.joists is b.joists
+    assert cache.structure(SITE).input.customer_name == ""
+
+
+def test_lru_eviction():
+    cache = DesignCache(maxsize=2)
+    sites = [replace(SITE, width_ft=w) for w in (10, 12, 14)]
+    for site in sites:
+        cache.structure(site)
+    cache.structure(sites[2])
+    stats = cache.stats()
+    assert stats.evictions == 1 and stats.size == 2 and stats.hits == 1
+    cache.structure(sites[0])
+    assert cache.stats().misses == 4
+
+
+def test_invalidate_during_build_drops_result(monkeypatch):
+    cache = DesignCache()
+    build = cache._build_structure
+
+    def build_then_invalidate(site, tables):
+        structure = build(site, tables)
+        cache.invalidate()   # E.g. another thread clearing the cache mid-build
+        return structure
+
+    monkeypatch.setattr(cache, "_build_structure", build_then_invalidate)
+    cache.structure(SITE)
+    assert cache.stats().size == 0
+
+
+def test_price_book_reload_clears(monkeypatch):
+    cache = DesignCache()
+    quote = cache.quote(SITE)
+    new = replace(price_book().with_changes({"2x10_pt_lf": 3.1}), version="next")
+    monkeypatch.setattr(design_cache, "price_book", lambda: new)
+    repriced = cache.quote(SITE)
+    assert repriced is not quote
+    assert repriced.price_book_version == "next"
+    assert cache.stats().invalidations == 1
+
+
+def test_pinned_old_snapshots_do_not_clear(monkeypatch):
+    cache = DesignCache()
+    old = (code_tables(), price_book())
+    new = replace(price_book().with_changes({"2x10_pt_lf": 3.1}), version="next")
+    monkeypatch.setattr(design_cache, "price_book", lambda: new)
+    current = cache.quote(SITE)        # Reload detected here, once
+    pinned = cache._structure(SITE, old)
+    for _ in range(3):                 # Old-snapshot and current callers interleaved
+        assert cache._structure(SITE, old) is pinned
+        assert cache.quote(SITE) is current
+    assert cache.stats().invalidations == 0   # Nothing cached before the first lookup
+
+
+def test_maxsize_must_be_positive():
+    with pytest.raises(ValueError):
+        DesignCache(maxsize=0)
@@ -0,0 +1,68 @@
+"""optimize_structure() never loses to the standard design and only ranks priced lumber"""
+
+import pytest
+
+from domain.code_engine import generate_structure, joist_span, select_joist_size
+from domain.models import LedgerAttachment, SiteInput
+from domain.tables import code_tables
+from services import design_optimizer
+from services.design_optimizer import _enumerate_layouts, _lumber_priced, optimize_structure
+from services.pricing import PriceBook, calculate_quote, lumber_price_key, price_book
+
+
+SITES = [
+    SiteInput(width_ft=12, depth_ft=10, height_ft=3),
+    SiteInput(width_ft=24, depth_ft=14, height_ft=8),
+    SiteInput(width_ft=40, depth_ft=12, height_ft=6, ledger_attachment=LedgerAttachment.FREESTANDING),
+]
+
+
+def _without(book: PriceBook, *keys: str) -> PriceBook:
+    prices = {k: v for k, v in book.material_prices.items() if k not in keys}
+    return PriceBook(book.version, prices, book.labor_rates, book.permit_fees)
+
+
+@pytest.mark.parametrize("site", SITES, ids=lambda s: f"{s.width_ft}x{s.depth_ft}")
+def test_best_is_no_dearer_than_standard(site):
+    result = optimize_structure(site)
+    assert result.best.compliant
+    assert all(_lumber_priced(c.structure, price_book()) for c in result.alternatives)
+    assert _lumber_priced(result.best, price_book())   # e.g. solid 4x beams have no price
+    standard = generate_structure(site)
+    if standard.compliant:
+        assert result.best_quote.total <= calculate_quote(standard).total + 1e-9
+    totals = [result.best_quote.total] + [c.total for c in result.alternatives]
+    assert totals == sorted(totals)
+    assert result.evaluated >= 1 + len(result.alternatives)
+
+
+@pytest.mark.parametrize("site", SITES, ids=lambda s: f"{s.width_ft}x{s.depth_ft}")
+def test_only_priced_lumber(site, monkeypatch):
+    unpriced = lumber_price_key(optimize_structure(site).best.beam_size)
+    book = _without(price_book(), unpriced)
+    monkeypatch.setattr(design_optimizer, "price_book", lambda: book)
+    result = optimize_structure(site)
+    if result.best.compliant and _lumber_priced(result.best, book):
+        assert all(_lumber_priced(c.structure, book) for c in result.alternatives)
+    else:
+        # Nothing priceable: the standard design comes back with no alternatives
+        assert not result.alternatives
+        assert result.best == generate_structure(site)
+
+
+@pytest.mark.parametrize("site", SITES, ids=lambda s: f"{s.width_ft}x{s.depth_ft}")
+def test_layouts_follow_engine(site):
+    layouts, _ = _enumerate_layouts(site, code_tables())
+    assert layouts
+    for spacing, num_posts, ply in layouts:
+        structure = generate_structure(site, joist_spacing_in=spacing, num_posts=num_posts, beam_ply=ply)
+        assert structure.joist_size == select_joist_size(joist_span(site)[1], spacing)
+        assert structure.beam_ply == ply
+
+
+def test_workers_match_serial():
+    site = SITES[1]
+    serial = optimize_structure(site)
+    pooled = optimize_structure(site, max_workers=2)
+    assert pooled.best_quote.total == serial.best_quote.total
+    assert [c.total for c in pooled.alternatives] == [c.total for c in serial.alternatives]
@@ -0,0 +1,90 @@
+"""DesignSession updates give the same quote as designing and pricing from scratch"""
+
+import pytest
+
+from domain.code_engine import generate_structure
+from domain.models import DeckingType, RailingType, SiteInput
+from services import design_session
+from services.cut_list import optimize_cut_list
+from services.design_session import CUT_LIST_STAGE, STRUCTURE_STAGE, TOTALS_STAGE, DesignSession
+from services.pricing import calculate_quote, price_book
+
+
+START = SiteInput(width_ft=16, depth_ft=12, height_ft=6)
+
+UPDATES = [
+    {"railing_type": "cable", "railing_lf": 40},
+    {"decking_type": DeckingType.CEDAR},
+    {"stair_count": 4},
+    {"customer_name": "Ng", "site_address": "1 Pine St"},
+    {"width_ft": 22.5},
+    {"railing_lf": 52.5},
+    {"height_ft": 9, "decking_type": "pt_wood"},
+    {"ledger_attachment": "freestanding"},
+    {"railing_type": RailingType.NONE, "stair_count": 0},
+    {"depth_ft": 14},
+]
+
+
+def _expected(site: SiteInput, optimize_cuts: bool = False, book=None):
+    structure = generate_structure(site)
+    cut_list = optimize_cut_list(structure) if optimize_cuts else None
+    return calculate_quote(structure, book, cut_list=cut_list)
+
+
+def _assert_same(quote, expected):
+    assert [(li.category, li.description, li.quantity) for li in quote.line_items] == \
+        [(li.category, li.description, li.quantity) for li in expected.line_items]
+    for item, fresh in zip(quote.line_items, expected.line_items):
+        assert item.material_cost == pytest.approx(fresh.material_cost, abs=1e-9), item.category
+        assert item.labor_cost == pytest.approx(fresh.labor_cost, abs=1e-9), item.category
+    for name in ("materials_subtotal", "labor_subtotal", "permit_fees", "total", "price_per_sqft"):
+        assert getattr(quote, name) == pytest.approx(getattr(expected, name), abs=1e-9), name
+
+
+@pytest.mark.parametrize("optimize_cuts", [False, True])
+@pytest.mark.parametrize("lazy", [True, False])
+def test_updates_match_full_recompute(lazy, optimize_cuts):
+    session = DesignSession(START, lazy=lazy, optimize_cuts=optimize_cuts)
+    _assert_same(session.quote, _expected(START, optimize_cuts))
+    for changes in UPDATES:
+        session.update(**changes)
+        _assert_same(session.quote, _expected(session.site, optimize_cuts))
+
+
+def test_stages():
+    session = DesignSession(START, optimize_cuts=True)
+    assert session.update(railing_type="cable", railing_lf=40) == {
+        "pricing.railing", "pricing.permits_and_totals",
+    }
+    assert session.update(customer_name="Ng") == set()
+    assert session.update(railing_lf=40) == set()
+    stages = session.update(width_ft=20)
+    assert {STRUCTURE_STAGE, CUT_LIST_STAGE, TOTALS_STAGE, "pricing.joists"} <= stages
+    assert session.update(stair_count=2) == {"pricing.stairs", TOTALS_STAGE}
+
+
+def test_project_info_keeps_quote():
+    session = DesignSession(START)
+    quote, structure = session.quote, session.structure
+    session.update(customer_name="Ng", site_address="1 Pine St")
+    assert session.quote is quote and session.structure is structure
+    assert session.structure.input.customer_name == "Ng"
+
+
+def test_unknown_field():
+    session = DesignSession(START)
+    with pytest.raises(ValueError):
+        session.update(colour="red")
+
+
+def test_price_book_reload_reprices(monkeypatch):
+    session = DesignSession(START)
+    session.update(railing_type="glass", railing_lf=30)
+    new = price_book().with_changes({"glass_rail_lf": 150.0, "2x8_pt_lf": 1.9}, {"framing_sqft": 15.0})
+    monkeypatch.setattr(design_session, "price_book", lambda: new)
+    assert session.refresh()
+    _assert_same(session.quote, _expected(session.site, book=new))
+    assert session.refresh() == set()
+    session.update(stair_count=3)
+    _assert_same(session.quote, _expected(session.site, book=new))
@@ -0,0 +1,64 @@
+"""Pooled permit rendering matches the serial renderer and survives failing jobs"""
+
+from dataclasses import replace
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+from domain.code_engine import generate_structure
+from domain.models import LedgerAttachment, SiteInput
+from services.permit_batch import generate_permit_pdfs
+from services.permit_pdf import render_permit_pdf
+
+
+SITES = [
+    SiteInput(width_ft=16, depth_ft=12, height_ft=6, customer_name="Ng"),
+    SiteInput(width_ft=30, depth_ft=10, height_ft=3, ledger_attachment=LedgerAttachment.FREESTANDING),
+    SiteInput(width_ft=12, depth_ft=8, height_ft=2, site_address="9 Elm St"),
+]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_output_matches_serial_render(tmp_path, max_workers):
+    structures = [generate_structure(site) for site in SITES]
+    jobs = [(s, tmp_path / f"permit-{i}.pdf") for i, s in enumerate(structures)]
+    report = generate_permit_pdfs(jobs, max_workers=max_workers, invariant=True)
+    assert [r.index for r in report.results] == [0, 1, 2]
+    assert not report.failed
+    for structure, result in zip(structures, report.results):
+        assert result.output_path.read_bytes() == render_permit_pdf(structure, invariant=True)
+
+
+def test_in_flight_bound_holds(tmp_path):
+    structures = [generate_structure(SITES[i % len(SITES)]) for i in range(8)]
+    finished = []
+    pulled = []
+
+    def jobs():
+        for i, structure in enumerate(structures):
+            # Job i is pulled before it is submitted: at most max_in_flight are unfinished
+            pulled.append(i - len(finished))
+            yield structure, tmp_path / f"permit-{i}.pdf"
+
+    report = generate_permit_pdfs(jobs(), max_workers=2, max_in_flight=2, on_result=finished.append)
+    assert len(report.succeeded) == len(structures)
+    assert max(pulled) <= 2
+    assert sorted(r.index for r in finished) == list(range(len(structures)))
+
+
+def test_failing_structure_is_reported(tmp_path):
+    good = generate_structure(SITES[0])
+    broken = replace(good, beams=[None])   # Fails while drawing the framing plan
+    jobs = [(good, tmp_path / "a.pdf"), (broken, tmp_path / "b.pdf"), (good, tmp_path / "c.pdf")]
+    report = generate_permit_pdfs(jobs, max_workers=2, invariant=True)
+    assert [r.index for r in report.failed] == [1]
+    assert report.failed[0].error.startswith("AttributeError")
+    assert [r.index for r in report.succeeded] == [0, 2]
+    expected = render_permit_pdf(good, invariant=True)
+    assert (tmp_path / "a.pdf").read_bytes() == (tmp_path / "c.pdf").read_bytes() == expected
+
+
+def test_rejects_empty_in_flight_bound(tmp_path):
+    with pytest.raises(ValueError):
+        generate_permit_pdfs([], max_workers=2, max_in_flight=-1)
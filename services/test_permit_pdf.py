@@ -0,0 +1,106 @@
+"""Permit PDFs are byte-identical across member stores and output paths"""
+
+import io
+import re
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+from domain.code_engine import generate_structure
+from domain.instrumentation import PhaseRecorder, register_sink, unregister_sink
+from domain.models import LedgerAttachment, SiteInput
+from services.permit_pdf import (
+    PermitPDFGenerator, _new_canvas, generate_permit_binder, generate_permit_pdf, render_permit_pdf,
+    stream_permit_pdf,
+)
+
+
+SITES = [
+    SiteInput(width_ft=16, depth_ft=12, height_ft=6, customer_name="Ng", site_address="1 Pine St"),
+    SiteInput(width_ft=30, depth_ft=10, height_ft=3, ledger_attachment=LedgerAttachment.FREESTANDING),
+]
+
+
+@pytest.mark.parametrize("site", SITES, ids=lambda s: f"{s.width_ft}x{s.depth_ft}")
+def test_member_stores_render_identically(site):
+    eager = render_permit_pdf(generate_structure(site), invariant=True)
+    assert eager.startswith(b"%PDF")
+    assert render_permit_pdf(generate_structure(site), invariant=True) == eager
+    assert render_permit_pdf(generate_structure(site, lazy=True), invariant=True) == eager
+    assert render_permit_pdf(generate_structure(site, compact=True), invariant=True) == eager
+
+
+def test_lazy_render_does_not_materialize():
+    structure = generate_structure(SITES[0], lazy=True)
+    render_permit_pdf(structure, invariant=True)
+    assert not structure.joists.materialized
+
+
+def test_output_paths_agree(tmp_path):
+    structure = generate_structure(SITES[0])
+    data = render_permit_pdf(structure, invariant=True)
+    path = generate_permit_pdf(structure, tmp_path / "permit.pdf", invariant=True)
+    assert path.read_bytes() == data
+    assert b"".join(stream_permit_pdf(structure, chunk_size=1000, invariant=True)) == data
+    stream = io.BytesIO()
+    assert PermitPDFGenerator(structure, invariant=True).write_to(stream) == len(data)
+    assert stream.getvalue() == data
+
+
+def test_generate_needs_output_path():
+    with pytest.raises(ValueError):
+        PermitPDFGenerator(generate_structure(SITES[0])).generate()
+
+
+def test_binder_shares_static_layers(tmp_path):
+    structures = [generate_structure(site) for site in SITES]
+    binder = generate_permit_binder(structures, tmp_path / "binder.pdf", invariant=True).read_bytes()
+    singles = sum(len(render_permit_pdf(s, invariant=True)) for s in structures)
+    assert len(re.findall(rb"/Type /Page\b(?!s)", binder)) == 4
+    assert len(binder) < singles
+
+
+def _isolated_ops(structure, draw) -> int:
+    """Ops draw(generator) emits onto a fresh page"""
+    generator = PermitPDFGenerator(structure, invariant=True)
+    generator.c = _new_canvas(None, True)
+    draw(generator)
+    return len(generator.c._code)
+
+
+def test_canvas_ops_are_counted_once():
+    structure = generate_structure(SITES[0])
+    generator = PermitPDFGenerator(structure, invariant=True)
+    c = _new_canvas(None, True)
+    page_ops = []
+    show_page = c.showPage
+
+    def counting_show_page():
+        page_ops.append(len(c._code))
+        show_page()
+
+    c.showPage = counting_show_page
+    recorder = register_sink(PhaseRecorder())
+    try:
+        generator.draw_package(c)
+    finally:
+        unregister_sink(recorder)
+    summary = recorder.summary()
+    counts = {name: totals.counts.get("canvas_ops", 0) for name, totals in summary.items()}
+    form_ops = {name: totals.counts.get("form_ops", 0) for name, totals in summary.items()}
+    assert sum(counts.values()) == sum(page_ops)
+
+    # Each phase's own share, from its pieces drawn in isolation
+    title_ops = _isolated_ops(structure, lambda g: g._draw_title_block())
+    frame_page_ops = 1 + title_ops   # doForm + title block fields, on each sheet
+    assert counts["pdf.sheet_frame"] == 2 * frame_page_ops
+    assert counts["pdf.general_notes"] == 1   # doForm
+    assert counts["pdf.framing_plan"] == page_ops[0] - frame_page_ops
+    assert counts["pdf.section_and_details"] == page_ops[1] - frame_page_ops - 1
+
+    # Form streams are counted once, under the phase that defines them
+    assert {name: n for name, n in form_ops.items() if n} == {
+        "pdf.sheet_frame": _isolated_ops(structure, lambda g: g._draw_sheet_frame_static()),
+        "pdf.general_notes": _isolated_ops(structure, lambda g: g._draw_general_notes_static()),
+    }
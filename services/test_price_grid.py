@@ -0,0 +1,103 @@
+"""InstantQuoteGrid answers match the engine on grid points and interpolate between them"""
+
+import itertools
+from dataclasses import replace
+
+import pytest
+
+from domain.code_engine import generate_structure
+from domain.models import DeckingType, RailingType
+from services import price_grid
+from services.price_grid import InstantQuoteGrid, build_price_grid, grid_site_input
+from services.pricing import calculate_quote, price_book
+
+
+WIDTHS, DEPTHS, HEIGHTS = [10.0, 16.0, 22.0, 24.0], [8.0, 12.0, 14.0], [3.0, 6.0, 8.0]
+DECKING = (DeckingType.COMPOSITE_TREX, DeckingType.CEDAR)
+RAILING = (RailingType.NONE, RailingType.CABLE)
+
+
+@pytest.fixture(scope="module")
+def grid(tmp_path_factory):
+    path = tmp_path_factory.mktemp("grid") / "prices.grid"
+    return InstantQuoteGrid(build_price_grid(path, WIDTHS, DEPTHS, HEIGHTS, DECKING, RAILING))
+
+
+def _engine(w, d, h, decking=DeckingType.COMPOSITE_TREX, railing=RailingType.NONE):
+    structure = generate_structure(grid_site_input(w, d, h, decking, railing))
+    return calculate_quote(structure).total, structure.compliant
+
+
+def test_grid_points_match_engine(grid):
+    for w, d, h, decking, railing in itertools.product(WIDTHS, DEPTHS, HEIGHTS, DECKING, RAILING):
+        total, compliant = _engine(w, d, h, decking, railing)
+        estimate = grid.estimate(w, d, h, decking, railing)
+        assert estimate.compliant == compliant
+        if compliant:
+            # An exact grid point never depends on its neighbours' compliance
+            assert estimate.source == "grid"
+            assert estimate.total == pytest.approx(total, abs=1e-6)
+
+
+def test_grid_point_next_to_non_compliant_neighbour(grid):
+    assert _engine(24, 12, 6)[1] and not _engine(24, 14, 6)[1]
+    estimate = grid.estimate(24, 12, 6)
+    assert estimate.source == "grid"
+    assert estimate.total == pytest.approx(_engine(24, 12, 6)[0])
+
+
+def test_interior_interpolates_engine_totals(grid):
+    w, d, h = 13.0, 10.0, 4.0
+    fw, fd, fh = 0.5, 0.5, 1 / 3
+    corners = {
+        (a, b, c): _engine(a, b, c)
+        for a, b, c in itertools.product((10.0, 16.0), (8.0, 12.0), (3.0, 6.0))
+    }
+    assert all(compliant for _, compliant in corners.values())
+    expected = sum(
+        total
+        * (fw if a == 16 else 1 - fw) * (fd if b == 12 else 1 - fd) * (fh if c == 6 else 1 - fh)
+        for (a, b, c), (total, _) in corners.items()
+    )
+    estimate = grid.estimate(w, d, h)
+    assert estimate.source == "grid"
+    assert estimate.total == pytest.approx(expected)
+
+
+def test_edge_interpolates_on_one_axis(grid):
+    estimate = grid.estimate(13.0, 8.0, 3.0)
+    expected = (_engine(10, 8, 3)[0] + _engine(16, 8, 3)[0]) / 2
+    assert estimate.source == "grid"
+    assert estimate.total == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("query", [
+    (9.0, 8.0, 3.0), (25.0, 8.0, 3.0), (16.0, 16.0, 3.0), (16.0, 8.0, 0.5),
+    (16.0, 8.0, 3.0, DeckingType.PRESSURE_TREATED), (16.0, 8.0, 3.0, DeckingType.CEDAR, RailingType.GLASS),
+])
+def test_off_grid_falls_back_to_engine(grid, query):
+    estimate = grid.estimate(*query)
+    assert estimate.source == "engine"
+    assert (estimate.total, estimate.compliant) == pytest.approx(_engine(*query))
+
+
+def test_stale_price_book_falls_back_to_engine(grid, monkeypatch):
+    assert grid.is_current()
+    stale = replace(price_book(), version="next")
+    monkeypatch.setattr(price_grid, "price_book", lambda: stale)
+    assert not grid.is_current()
+    assert grid.estimate(16.0, 8.0, 3.0).source == "engine"
+
+
+def test_single_point_axis(tmp_path):
+    grid = InstantQuoteGrid(build_price_grid(tmp_path / "one.grid", [10.0, 16.0], [8.0], [6.0]))
+    estimate = grid.estimate(13.0, 8.0, 6.0)
+    assert estimate.source == "grid"
+    assert estimate.total == pytest.approx((_engine(10, 8, 6)[0] + _engine(16, 8, 6)[0]) / 2)
+    assert grid.estimate(13.0, 9.0, 6.0).source == "engine"
+    assert grid.estimate(13.0, 8.0, 6.5).source == "engine"
+
+
+def test_rejects_unsorted_axis(tmp_path):
+    with pytest.raises(ValueError, match="widths"):
+        build_price_grid(tmp_path / "bad.grid", [16.0, 10.0], [8.0], [6.0])
@@ -0,0 +1,55 @@
+"""Footing concrete is priced from volume in every footing sizing mode"""
+
+import itertools
+import math
+
+import pytest
+
+from domain.code_engine import generate_structure
+from domain.models import LedgerAttachment, SiteInput
+from services.pricing import CONCRETE_BAG_CUFT, _concrete_bags, calculate_quote, footing_volume_cuft
+
+
+SITES = [
+    SiteInput(width_ft=w, depth_ft=d, height_ft=6, ledger_attachment=ledger, frost_depth_in=frost)
+    for (w, d, ledger), frost in zip(
+        itertools.product((8, 16, 40, 100), (6, 12, 16), LedgerAttachment), itertools.cycle((12, 18, 24.5))
+    )
+]
+
+
+def _compliant(site, **kwargs):
+    structure = generate_structure(site, **kwargs)
+    return structure if structure.compliant else None
+
+
+def test_bags_cover_each_footing_volume():
+    for site in SITES:
+        for mode, lazy in itertools.product(("uniform", "tributary"), (False, True)):
+            structure = _compliant(site, footing_sizing=mode, lazy=lazy)
+            if structure is None:
+                continue
+            expected = sum(
+                math.ceil(footing_volume_cuft(f.diameter_in, f.depth_in) / CONCRETE_BAG_CUFT)
+                for f in structure.footings
+            )
+            assert _concrete_bags(structure) == expected
+
+
+def test_tributary_sizing_never_buys_more_concrete():
+    compared = 0
+    for site in SITES:
+        uniform, tributary = _compliant(site), _compliant(site, footing_sizing="tributary")
+        if uniform is None:
+            continue
+        assert _concrete_bags(tributary) <= _concrete_bags(uniform)
+        footings = {li.category: li for li in calculate_quote(uniform).line_items}["Footings"]
+        smaller = {li.category: li for li in calculate_quote(tributary).line_items}["Footings"]
+        assert smaller.material_cost <= footings.material_cost
+        compared += 1
+    assert compared > 10
+
+
+def test_footing_volume():
+    assert footing_volume_cuft(12, 12) == pytest.approx(math.pi / 4)
+    assert footing_volume_cuft(24, 18) == pytest.approx(math.pi * 1.5)
@@ -0,0 +1,156 @@
+"""Incremental repricing gives the same quote as pricing from scratch"""
+
+import json
+
+import pytest
+
+from domain.code_engine import generate_structure
+from domain.models import RailingType, SiteInput
+from services.cut_list import optimize_cut_list
+from services.pricing import (
+    PRICE_BOOK_PATH, RepricingIndex, calculate_quote, compile_price_book, price_book, reprice_quote,
+)
+
+
+SITES = [
+    SiteInput(width_ft=16, depth_ft=12, height_ft=6),
+    SiteInput(width_ft=30, depth_ft=14, height_ft=3, railing_type=RailingType.CABLE, railing_lf=40),
+    SiteInput(width_ft=12, depth_ft=10, height_ft=8, stair_count=5),
+]
+
+
+def _assert_same(quote, expected):
+    assert [li.category for li in quote.line_items] == [li.category for li in expected.line_items]
+    for item, fresh in zip(quote.line_items, expected.line_items):
+        assert item.material_cost == pytest.approx(fresh.material_cost, abs=1e-9), item.category
+        assert item.labor_cost == pytest.approx(fresh.labor_cost, abs=1e-9), item.category
+    assert quote.total == pytest.approx(expected.total, abs=1e-9)
+    assert quote.permit_fees == pytest.approx(expected.permit_fees, abs=1e-9)
+
+
+@pytest.fixture(params=SITES, ids=lambda s: f"{s.width_ft}x{s.depth_ft}")
+def structure(request):
+    return generate_structure(request.param)
+
+
+@pytest.mark.parametrize("material, labor", [
+    ({"2x10_pt_lf": 3.1}, None),
+    ({"concrete_60lb_bag": 9.0, "cable_rail_lf": 50.0}, None),
+    (None, {"framing_sqft": 16.0}),
+    (None, {"permit_filing": 300.0}),
+])
+def test_reprice_quote_matches_fresh(structure, material, labor):
+    book = price_book()
+    quote = calculate_quote(structure, book)
+    reprice_quote(quote, material, labor)
+    _assert_same(quote, calculate_quote(structure, book.with_changes(material, labor)))
+
+
+def test_successive_changes_accumulate(structure):
+    book = price_book()
+    quote = calculate_quote(structure, book)
+    reprice_quote(quote, {"2x10_pt_lf": 3.1, "2x12_pt_lf": 3.5})
+    reprice_quote(quote, {"concrete_60lb_bag": 9.0})
+    reprice_quote(quote, labor_rates={"framing_sqft": 16.0})
+    expected = book.with_changes(
+        {"2x10_pt_lf": 3.1, "2x12_pt_lf": 3.5, "concrete_60lb_bag": 9.0}, {"framing_sqft": 16.0},
+    )
+    _assert_same(quote, calculate_quote(structure, expected))
+
+
+def test_unused_key_leaves_quote_alone(structure):
+    quote = calculate_quote(structure)
+    total = quote.total
+    assert not reprice_quote(quote, {"glass_rail_lf": 500.0})
+    assert quote.total == total
+
+
+def test_cut_list_quote(structure):
+    book = price_book()
+    cut_list = optimize_cut_list(structure)
+    quote = calculate_quote(structure, book, cut_list=cut_list)
+    reprice_quote(quote, {"2x8_pt_lf": 2.0, "2x10_pt_lf": 3.1, "post_cap_bc4": 15.0})
+    expected = book.with_changes({"2x8_pt_lf": 2.0, "2x10_pt_lf": 3.1, "post_cap_bc4": 15.0})
+    _assert_same(quote, calculate_quote(structure, expected, cut_list=cut_list))
+
+
+def test_index_matches_reprice_quote():
+    structures = [generate_structure(site) for site in SITES]
+    indexed = [calculate_quote(s) for s in structures]
+    index = RepricingIndex(indexed)
+    changes = [({"cable_rail_lf": 50.0}, None), ({"2x10_pt_lf": 3.1}, {"framing_sqft": 16.0})]
+    for material, labor in changes:
+        index.reprice(material, labor)
+    for structure, quote in zip(structures, indexed):
+        expected = calculate_quote(structure)
+        for material, labor in changes:
+            reprice_quote(expected, material, labor)
+        _assert_same(quote, expected)
+
+
+def test_index_only_touches_affected_quotes():
+    quotes = [calculate_quote(generate_structure(site)) for site in SITES]
+    index = RepricingIndex(quotes)
+    assert index.reprice({"cable_rail_lf": 50.0}) == [quotes[1]]
+    index.remove(quotes[1])
+    assert index.reprice({"cable_rail_lf": 60.0}) == []
+    assert len(index) == 2
+
+
+# ===== PRICE BOOK CHANGES =====
+
+def _book_data(**changes) -> dict:
+    with open(PRICE_BOOK_PATH) as f:
+        data = json.load(f)
+    for table, values in changes.items():
+        if table == "version":
+            data["version"] = values
+        else:
+            data[table].update(values)
+    return data
+
+
+def test_changes_from_reports_every_table():
+    old = price_book()
+    new = compile_price_book(_book_data(
+        version="next", material_prices={"2x10_pt_lf": 3.1}, labor_rates={"footing_each": 190.0},
+        permit_fees={"sdci_base": 250.0},
+    ))
+    assert new.changes_from(old) == ({"2x10_pt_lf": 3.1}, {"footing_each": 190.0}, {"sdci_base": 250.0})
+    assert old.changes_from(old) == ({}, {}, {})
+
+
+def test_permit_fee_change_reprices_every_quote():
+    structures = [generate_structure(site) for site in SITES]
+    quotes = [calculate_quote(s) for s in structures]
+    index = RepricingIndex(quotes)
+    assert len(index.reprice(permit_fees={"sdci_per_1000_valuation": 20.0})) == len(quotes)
+    book = price_book().with_changes(permit_fees={"sdci_per_1000_valuation": 20.0})
+    for structure, quote in zip(structures, quotes):
+        _assert_same(quote, calculate_quote(structure, book))
+
+
+def test_reprice_all_moves_quotes_to_new_book():
+    new = compile_price_book(_book_data(
+        version="next", material_prices={"2x10_pt_lf": 3.1, "cable_rail_lf": 40.0},
+        permit_fees={"plan_review_multiplier": 0.7},
+    ))
+    structures = [generate_structure(site) for site in SITES]
+    quotes = [calculate_quote(s) for s in structures]
+    index = RepricingIndex(quotes)
+    index.reprice({"cable_rail_lf": 55.0})   # Ad-hoc change first; the new book replaces it
+    assert len(index.reprice_all(new)) == len(quotes)
+    for structure, quote in zip(structures, quotes):
+        _assert_same(quote, calculate_quote(structure, new))
+        assert quote.price_book_version == "next"
+        assert quote.price_book is new
+    assert index.reprice_all(new) == []
+
+
+def test_ad_hoc_changes_keep_version():
+    book = price_book()
+    quote = calculate_quote(generate_structure(SITES[0]), book)
+    reprice_quote(quote, {"2x10_pt_lf": 3.1}, permit_fees={"sdci_base": 250.0})
+    RepricingIndex([quote]).reprice(labor_rates={"framing_sqft": 16.0})
+    assert quote.price_book_version == book.version
+    assert quote.price_book.version == ""
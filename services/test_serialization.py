@@ -0,0 +1,77 @@
+"""Binary encoding round-trips structures and quotes unchanged"""
+
+import pickle
+
+import pytest
+
+from domain.code_engine import generate_structure
+from domain.models import DeckingType, LedgerAttachment, RailingType, SiteInput
+from services.pricing import calculate_quote, reprice_quote
+from services.serialization import (
+    FORMAT_VERSION, MAGIC, decode_quote, decode_structure, encode_quote, encode_structure,
+)
+
+
+SITES = [
+    SiteInput(width_ft=16, depth_ft=12, height_ft=6, customer_name="Ng", site_address="1 Pine St"),
+    SiteInput(width_ft=30, depth_ft=14, height_ft=3, ledger_attachment=LedgerAttachment.FREESTANDING,
+              decking_type=DeckingType.CEDAR, railing_type=RailingType.GLASS, railing_lf=44.5,
+              stair_count=6, soil_bearing_psf=2000, frost_depth_in=24, slope_percent=4.5),
+    SiteInput(width_ft=12.25, depth_ft=9.75, height_ft=10, soil_bearing_psf=1500.5, frost_depth_in=18.5),
+    SiteInput(width_ft=40, depth_ft=30, height_ft=6),   # Non-compliant: no joist spans 30'
+]
+MODES = [{}, {"lazy": True}, {"compact": True}, {"footing_sizing": "tributary"}]
+
+
+@pytest.mark.parametrize("site", SITES, ids=lambda s: f"{s.width_ft}x{s.depth_ft}")
+@pytest.mark.parametrize("mode", MODES, ids=lambda m: ",".join(m) or "eager")
+def test_structure_round_trip(site, mode):
+    structure = generate_structure(site, **mode)
+    expected = generate_structure(site, footing_sizing=mode.get("footing_sizing", "uniform"))
+    decoded = decode_structure(encode_structure(structure))
+    assert decoded == expected
+    assert decoded.input == site
+    assert decoded.errors == expected.errors and decoded.notes == expected.notes
+
+
+def test_encoding_is_smaller_than_pickle():
+    structure = generate_structure(SITES[0])
+    assert len(encode_structure(structure)) < len(pickle.dumps(structure))
+
+
+def test_site_value_types_survive():
+    decoded = decode_structure(encode_structure(generate_structure(SITES[2]))).input
+    assert decoded.soil_bearing_psf == 1500.5
+    assert decoded.frost_depth_in == 18.5
+    decoded = decode_structure(encode_structure(generate_structure(SITES[0]))).input
+    assert type(decoded.soil_bearing_psf) is int and type(decoded.frost_depth_in) is int
+    assert type(decoded.stair_count) is int
+
+
+@pytest.mark.parametrize("site", SITES[:3], ids=lambda s: f"{s.width_ft}x{s.depth_ft}")
+def test_quote_round_trip(site):
+    quote = calculate_quote(generate_structure(site))
+    decoded = decode_quote(encode_quote(quote))
+    assert decoded == quote
+    assert decoded.price_book is None
+
+
+def test_decoded_quote_reprices():
+    structure = generate_structure(SITES[0])
+    quote = calculate_quote(structure)
+    decoded = decode_quote(encode_quote(quote))
+    reprice_quote(quote, {"2x10_pt_lf": 3.1})
+    reprice_quote(decoded, {"2x10_pt_lf": 3.1})
+    assert decoded.total == pytest.approx(quote.total, abs=1e-9)
+
+
+def test_header_is_checked():
+    data = encode_structure(generate_structure(SITES[0]))
+    with pytest.raises(ValueError, match="kind"):
+        decode_quote(data)
+    with pytest.raises(ValueError, match="version"):
+        decode_structure(data[:len(MAGIC)] + bytes([FORMAT_VERSION + 1]) + data[len(MAGIC) + 1:])
+    with pytest.raises(ValueError):
+        decode_structure(b"XYZ" + data[3:])
+    with pytest.raises(ValueError):
+        decode_structure(data[:2])